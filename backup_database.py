@@ -5,7 +5,6 @@ Bu script'i cron job veya zamanlayıcı ile çalıştırabilirsiniz.
 """
 
 import os
-import shutil
 import sqlite3
 from datetime import datetime
 
@@ -25,8 +24,15 @@ def backup_database(db_file='student_tracker.db', backup_dir='backups'):
     backup_file = os.path.join(backup_dir, f'student_tracker_{timestamp}.db')
     
     try:
-        # Dosyayı kopyala
-        shutil.copy2(db_file, backup_file)
+        # SQLite backup API ile kopyala - WAL modunda henüz ana dosyaya yazılmamış
+        # (-wal dosyasındaki) değişiklikler de yedeğe dahil olur
+        source = sqlite3.connect(db_file)
+        target = sqlite3.connect(backup_file)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
         
         # Eski yedekleri temizle (30 günden eski)
         cleanup_old_backups(backup_dir, days=30)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Hazırlanmış ifade (PREPARE / EXECUTE) benchmark'ı - sadece PostgreSQL
+Sık çalışan okuma sorgularını aynı bağlantı üzerinde önce normal şekilde, sonra
+PREPARE edilmiş haliyle çalıştırıp istek başına süre farkını gösterir.
+
+Kullanım:
+    python benchmark_prepared.py [tekrar_sayısı]
+"""
+
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database import (USE_SUPABASE, SUPABASE_DB_URL, get_connection_class,
+                      prepare_statements, behind_transaction_pooler)
+from sql_helper import days_ago, execute_query, get_query
+import queries  # noqa: F401 - sorguları kayıt defterine ekler
+import rollups  # noqa: F401
+import dashboard_data  # noqa: F401
+
+
+def _timed(run, iterations):
+    """Ortalama süre (ms)"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        run()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main(iterations):
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+
+    conn = psycopg2.connect(SUPABASE_DB_URL, connection_factory=get_connection_class())
+    c = conn.cursor(cursor_factory=RealDictCursor)
+
+    c.execute("SELECT id, username FROM students ORDER BY id LIMIT 1")
+    student = c.fetchone()
+    if not student:
+        print("❌ Veritabanında öğrenci yok")
+        return 1
+    conn.rollback()
+
+    since = days_ago(30)
+    today = days_ago(0)
+    cases = [
+        ('student.by_username', (student['username'],)),
+        ('stats.day', (student['id'], since, today, student['id'], '0001-01-01', '9999-12-31')),
+        ('stats.week', (student['id'], since, today, student['id'], since, today)),
+        ('dashboard.load', {'student_id': student['id'], 'since': since}),
+    ]
+
+    prepare_statements(conn, [name for name, _ in cases])
+
+    print(f"{'Sorgu':<26} {'Normal (ms)':>12} {'Prepared (ms)':>14} {'Fark (ms)':>10} {'Fark':>7}")
+    print("-" * 73)
+
+    total_plain = total_prepared = 0.0
+    for name, params in cases:
+        query = get_query(name)
+
+        def plain():
+            c.execute(query, params)
+            c.fetchall()
+
+        def prepared():
+            execute_query(c, query, params)
+            c.fetchall()
+
+        # Isınma (bağlantı ve sunucu önbellekleri)
+        plain()
+        prepared()
+
+        plain_ms = _timed(plain, iterations)
+        prepared_ms = _timed(prepared, iterations)
+        conn.rollback()
+
+        total_plain += plain_ms
+        total_prepared += prepared_ms
+        saved = plain_ms - prepared_ms
+        percent = saved / plain_ms * 100 if plain_ms else 0
+        print(f"{name:<26} {plain_ms:>12.3f} {prepared_ms:>14.3f} {saved:>10.3f} {percent:>6.1f}%")
+
+    print("-" * 73)
+    saved = total_plain - total_prepared
+    percent = saved / total_plain * 100 if total_plain else 0
+    print(f"{'Toplam (istek başına)':<26} {total_plain:>12.3f} {total_prepared:>14.3f} {saved:>10.3f} {percent:>6.1f}%")
+
+    conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("⏱️  Hazırlanmış ifade benchmark'ı")
+    print("=" * 60)
+
+    if not USE_SUPABASE:
+        print("❌ Bu benchmark PostgreSQL (Supabase) gerektirir - SQLite'ta PREPARE yok")
+        sys.exit(1)
+    if behind_transaction_pooler():
+        print("⚠️  Transaction modunda pooler algılandı - PREPARE burada güvenilir değil,")
+        print("   session modu (port 5432) bağlantısıyla çalıştırın")
+        sys.exit(1)
+
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"🔁 Tekrar sayısı: {iterations}")
+    sys.exit(main(iterations))
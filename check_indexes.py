@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Route sorgularının index kullanımını EXPLAIN ile kontrol et
+
+Kayıtlı sorguların (sql_helper.register_query) ve route'ların parametreye göre kurduğu
+sorguların (route_query_variants: admin listesi, IN listeleri, dışa aktarım filtreleri)
+planlarında tablo taraması olmamalı; her tablo bir index (veya birincil anahtar) üzerinden
+okunmalı. Bilerek tüm tabloyu okuyan sorgular FULL_SCAN_OK'te nedeniyle listelenir.
+- SQLite: EXPLAIN QUERY PLAN - "SCAN <tablo>" satırları hata
+- PostgreSQL: enable_seqscan kapalı, genel plan (plan_cache_mode = force_generic_plan)
+  ile EXPLAIN EXECUTE - "Seq Scan" düğümleri hata. Küçük tablolarda planlayıcı taramayı
+  seçebileceği için seq scan kapatılır; yine de tarama varsa kullanılabilir index yoktur.
+
+Index'ler uygulama açılışında migration'larla oluşturulur (migrations.py); script
+veritabanını değiştirmez. Sorun varsa çıkış kodu 1'dir (CI / deploy sonrası kontrol için).
+
+Kullanım:
+    python check_indexes.py
+"""
+
+import itertools
+import re
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database import USE_SUPABASE, SUPABASE_DB_URL, get_connection_class, get_sqlite_connection, prepare_statements
+from sql_helper import prepared_statement, registered_queries
+import queries  # noqa: F401 - sorguları kayıt defterine ekler
+import rollups  # noqa: F401
+import streaks  # noqa: F401
+import dashboard_data  # noqa: F401
+import http_cache  # noqa: F401
+import student_history  # noqa: F401
+import schedule_sync
+import leaderboard_engine  # noqa: F401
+from exports import EXPORT_KINDS, build_export_query
+from queries import ADMIN_SORT_COLUMNS, admin_student_list_queries, completion_owned_items_query
+
+# Sadece bir veritabanında çalışan sorgular
+POSTGRES_ONLY = {'dashboard.load', 'streak.apply_pg'}
+SQLITE_ONLY = {'dashboard.sqlite_daily', 'dashboard.sqlite_recent', 'dashboard.sqlite_exams'}
+
+# Bilerek tüm tabloyu okuyan sorgular: ad (veya ad öneki) -> (taranabilecek tablo, None = hepsi; neden)
+FULL_SCAN_OK = {
+    'streak.recompute_all': (None, 'tüm öğrencilerin streak değerleri yeniden hesaplanır'),
+    'streak.expire': (None, 'günlük süpürme, aktif streak\'i olan tüm öğrencilere bakar'),
+    'leaderboard.engine_load': ('students', 'sıralama motoru tüm öğrencileri belleğe alır'),
+    'admin.student_': ('students', 'admin listesi tüm öğrencileri sayar, hesaplanan kolonlara göre sıralar'),
+    'export.sessions.all': ('study_sessions', 'filtresiz dışa aktarım tüm tabloyu okur'),
+    'export.sessions.subject': ('study_sessions', 'öğrencisiz ders filtresi tüm tabloyu okur'),
+    'export.exams.all': ('exam_results', 'filtresiz dışa aktarım tüm tabloyu okur'),
+}
+
+
+def _scan_allowed(name, table):
+    for prefix, (allowed_table, _) in FULL_SCAN_OK.items():
+        if name.startswith(prefix) and allowed_table in (None, table):
+            return True
+    return False
+
+_TABLE_RE = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_NOT_ALIAS = {'where', 'set', 'join', 'left', 'inner', 'on', 'order', 'group', 'limit', 'values', 'select', 'using'}
+
+
+def route_query_variants():
+    """
+    Route'ların parametreye göre kurduğu (kayıt defterinde olmayan) sorgular: {ad: sql}
+    Her biçimden bir örnek: sıralama / arama, IN listesi, dışa aktarım filtreleri
+    """
+    variants = {}
+    for sort in ADMIN_SORT_COLUMNS:
+        for order in ('asc', 'desc'):
+            for search in ('', 'x'):
+                count_query, page_query = admin_student_list_queries(sort, order, search)
+                suffix = '.search' if search else ''
+                variants[f'admin.student_count{suffix}'] = count_query
+                variants[f'admin.student_page.{sort}.{order}{suffix}'] = page_query
+
+    variants['completion.owned_items'] = completion_owned_items_query(3)
+    variants['schedule.sync_delete'] = schedule_sync.delete_items_query(3)
+
+    for kind in EXPORT_KINDS:
+        for student_id in (None, 1):
+            for date_range in (False, True):
+                for subject in ((None, 'x') if kind == 'sessions' else (None,)):
+                    filters = {'kind': kind, 'student_id': student_id, 'subject': subject,
+                               'from': '2024-01-01' if date_range else None,
+                               'to': '2024-12-31' if date_range else None}
+                    parts = [p for p, on in (('student', student_id), ('dates', date_range), ('subject', subject)) if on]
+                    variants[f"export.{kind}.{'_'.join(parts) or 'all'}"] = build_export_query(filters)[0]
+    return variants
+
+
+def checked_queries():
+    """Kontrol edilen tüm sorgular: kayıtlı sorgular + route varyantları"""
+    queries = registered_queries()
+    queries.update(route_query_variants())
+    return queries
+
+
+def _table_names(query, tables):
+    """Sorgudaki gerçek tabloların adları ve takma adları -> tablo (SQLite planı takma adı gösterir)"""
+    names = {}
+    for table, alias in _TABLE_RE.findall(query):
+        if table.lower() in tables:
+            names[table.lower()] = table.lower()
+            if alias and alias.lower() not in _NOT_ALIAS:
+                names[alias.lower()] = table.lower()
+    return names
+
+
+def check_sqlite():
+    """Returns: [(sorgu adı, sorun)], [(sorgu adı, not)]"""
+    conn = get_sqlite_connection()
+    c = conn.cursor()
+    c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0].lower() for row in c.fetchall()}
+
+    problems, notes = [], []
+    for name, query in sorted(checked_queries().items()):
+        if name in POSTGRES_ONLY:
+            continue
+        names = _table_names(query, tables)
+        params = {key: None for key in re.findall(r':(\w+)', query)} or [None] * query.count('?')
+        c.execute('EXPLAIN QUERY PLAN ' + query, params)
+        for row in c.fetchall():
+            detail = row[3]
+            match = re.match(r'SCAN (\w+)', detail)
+            if match and match.group(1).lower() in names:
+                if not _scan_allowed(name, names[match.group(1).lower()]):
+                    problems.append((name, detail))
+            elif 'TEMP B-TREE' in detail:
+                notes.append((name, detail))
+    return problems, notes
+
+
+def _walk(plan):
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from _walk(child)
+
+
+def check_postgres():
+    """Returns: [(sorgu adı, sorun)], [(sorgu adı, not)]"""
+    import psycopg2
+
+    conn = psycopg2.connect(SUPABASE_DB_URL, connection_factory=get_connection_class())
+    names = sorted(name for name in registered_queries() if name not in SQLITE_ONLY)
+    prepare_statements(conn, names)
+
+    c = conn.cursor()
+    c.execute('SET enable_seqscan = off')
+    c.execute('SET plan_cache_mode = force_generic_plan')
+
+    problems, notes = [], []
+    executes = {}
+    for name in names:
+        if name not in conn.prepared:
+            problems.append((name, 'PREPARE edilemedi'))
+            continue
+        executes[name] = prepared_statement(name).execute_sql
+
+    # Route varyantları kayıt defterinde olmadığı için burada PREPARE edilir
+    for number, (name, query) in enumerate(sorted(route_query_variants().items())):
+        statement = f'check_route_{number}'
+        positions = itertools.count(1)
+        c.execute(f"PREPARE {statement} AS " + re.sub(r'%s', lambda _: f'${next(positions)}', query))
+        count = query.count('%s')
+        executes[name] = f"EXECUTE {statement}" + (f" ({', '.join(['%s'] * count)})" if count else '')
+
+    for name, execute_sql in sorted(executes.items()):
+        params = {key: None for key in re.findall(r'%\((\w+)\)s', execute_sql)} \
+            or [None] * execute_sql.count('%s')
+        c.execute('EXPLAIN (FORMAT JSON) ' + execute_sql, params)
+        plan = c.fetchone()[0][0]['Plan']
+        for node in _walk(plan):
+            if node['Node Type'] == 'Seq Scan':
+                if not _scan_allowed(name, node['Relation Name']):
+                    problems.append((name, f"Seq Scan on {node['Relation Name']}"))
+            elif node['Node Type'] == 'Sort':
+                notes.append((name, f"Sort ({', '.join(node.get('Sort Key', []))})"))
+    conn.rollback()
+    conn.close()
+    return problems, notes
+
+
+def main():
+    print(f"🔍 Index kontrolü ({'PostgreSQL' if USE_SUPABASE else 'SQLite'})")
+    problems, notes = check_postgres() if USE_SUPABASE else check_sqlite()
+
+    for name, note in notes:
+        print(f"ℹ️  {name}: {note}")
+    for name, (table, reason) in FULL_SCAN_OK.items():
+        print(f"⏭️  {name}: {table or 'tüm tablolar'} tam tarama kabul ({reason})")
+    for name, problem in problems:
+        print(f"❌ {name}: {problem}")
+
+    if problems:
+        print(f"❌ {len(problems)} sorguda index kullanılmıyor")
+        return 1
+    print(f"✅ Kontrol edilen tüm sorgular index kullanıyor ({len(registered_queries())} kayıtlı sorgu, "
+          f"{len(route_query_variants())} route varyantı)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
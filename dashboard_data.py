@@ -0,0 +1,168 @@
+"""
+Dashboard veri yükleyici - tek round trip'te tüm dashboard verileri
+PostgreSQL'de tek bir CTE sorgusu, SQLite'da tek bağlantı üzerinde toplu okuma
+Günlük istatistikler student_daily_stats özet tablosundan, toplamlar students
+satırındaki sayaçlardan okunur
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from database import USE_SUPABASE
+from db_utils import get_cursor
+from sql_helper import days_ago, execute_query, register_query
+
+# Günlük istatistik penceresi (gün)
+DAILY_STATS_DAYS = 30
+
+
+@dataclass
+class DashboardData:
+    """Dashboard sayfasının ihtiyaç duyduğu tüm veriler"""
+    daily_stats: list = field(default_factory=list)
+    stats: dict = field(default_factory=dict)
+    recent_sessions: list = field(default_factory=list)
+    exams: list = field(default_factory=list)
+    avg_percentage: float = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_study_date: Optional[Any] = None
+
+
+# PostgreSQL: altı sorgu tek ifadede, sonuçlar JSON olarak tek satırda döner
+_PG_DASHBOARD_QUERY = register_query('dashboard.load', '''
+    WITH daily AS (
+        SELECT date, total_hours, efficiency_sum * 1.0 / session_count AS avg_efficiency
+        FROM student_daily_stats
+        WHERE student_id = %(student_id)s AND date >= %(since)s
+    ),
+    recent AS (
+        SELECT * FROM study_sessions
+        WHERE student_id = %(student_id)s
+        ORDER BY date DESC, created_at DESC
+        LIMIT 10
+    ),
+    exams AS (
+        SELECT * FROM exam_results
+        WHERE student_id = %(student_id)s
+    )
+    SELECT
+        (SELECT COALESCE(json_agg(d ORDER BY d.date DESC), '[]'::json) FROM daily d) AS daily_stats,
+        (SELECT COALESCE(json_agg(r ORDER BY r.date DESC, r.created_at DESC), '[]'::json) FROM recent r) AS recent_sessions,
+        (SELECT COALESCE(json_agg(e ORDER BY e.exam_date DESC, e.created_at DESC), '[]'::json) FROM exams e) AS exams,
+        (SELECT AVG(score * 100.0 / max_score) FROM exams) AS avg_percentage,
+        s.total_sessions,
+        s.total_hours,
+        s.efficiency_sum,
+        s.study_days,
+        s.current_streak,
+        s.longest_streak,
+        s.last_study_date
+    FROM students s
+    WHERE s.id = %(student_id)s
+''')
+
+
+# SQLite - ayrı sorgular (aynı süreçte, round trip maliyeti yok)
+_SQLITE_DAILY_STATS_QUERY = register_query('dashboard.sqlite_daily', '''
+    SELECT date, total_hours, efficiency_sum * 1.0 / session_count as avg_efficiency
+    FROM student_daily_stats
+    WHERE student_id = ? AND date >= ?
+    ORDER BY date DESC
+''')
+
+_SQLITE_RECENT_SESSIONS_QUERY = register_query('dashboard.sqlite_recent', '''
+    SELECT * FROM study_sessions
+    WHERE student_id = ?
+    ORDER BY date DESC, created_at DESC
+    LIMIT 10
+''')
+
+_SQLITE_EXAMS_QUERY = register_query('dashboard.sqlite_exams', '''
+    SELECT * FROM exam_results
+    WHERE student_id = ?
+    ORDER BY exam_date DESC, created_at DESC
+''')
+
+
+def _totals_from_student(row):
+    """students satırındaki sayaçlardan toplam istatistikleri oluştur"""
+    total_sessions = row['total_sessions'] or 0
+    return {
+        'total_sessions': total_sessions,
+        'total_hours': row['total_hours'] or 0,
+        'avg_efficiency': (row['efficiency_sum'] or 0) / total_sessions if total_sessions else None,
+        'study_days': row['study_days'] or 0
+    }
+
+
+def load_dashboard_data(conn, student_id):
+    """
+    Öğrencinin dashboard verilerini tek seferde yükle
+
+    Returns:
+        DashboardData
+    """
+    if USE_SUPABASE:
+        return _load_postgres(conn, student_id)
+    return _load_sqlite(conn, student_id)
+
+
+def _load_postgres(conn, student_id):
+    """PostgreSQL - tek round trip"""
+    c = get_cursor(conn)
+    execute_query(c, _PG_DASHBOARD_QUERY, {'student_id': student_id, 'since': days_ago(DAILY_STATS_DAYS)})
+    row = c.fetchone()
+
+    if not row:
+        return DashboardData()
+
+    return DashboardData(
+        daily_stats=row['daily_stats'] or [],
+        stats=_totals_from_student(row),
+        recent_sessions=row['recent_sessions'] or [],
+        exams=row['exams'] or [],
+        avg_percentage=float(row['avg_percentage']) if row['avg_percentage'] else 0,
+        current_streak=row['current_streak'] or 0,
+        longest_streak=row['longest_streak'] or 0,
+        last_study_date=row['last_study_date']
+    )
+
+
+def _load_sqlite(conn, student_id):
+    """SQLite - aynı bağlantı üzerinde toplu okuma (ağ gecikmesi yok)"""
+    c = get_cursor(conn)
+
+    c.execute(_SQLITE_DAILY_STATS_QUERY, (student_id, days_ago(DAILY_STATS_DAYS)))
+    daily_stats = [dict(row) for row in c.fetchall()]
+
+    c.execute(_SQLITE_RECENT_SESSIONS_QUERY, (student_id,))
+    recent_sessions = [dict(row) for row in c.fetchall()]
+
+    c.execute(_SQLITE_EXAMS_QUERY, (student_id,))
+    exams = [dict(row) for row in c.fetchall()]
+
+    # Sınav ortalaması Python'da - ayrı sorguya gerek yok
+    percentages = [exam['score'] * 100.0 / exam['max_score'] for exam in exams if exam['max_score']]
+    avg_percentage = sum(percentages) / len(percentages) if percentages else 0
+
+    c.execute('''
+        SELECT total_sessions, total_hours, efficiency_sum, study_days,
+               current_streak, longest_streak, last_study_date
+        FROM students
+        WHERE id = ?
+    ''', (student_id,))
+    student_row = c.fetchone()
+
+    data = DashboardData(
+        daily_stats=daily_stats,
+        recent_sessions=recent_sessions,
+        exams=exams,
+        avg_percentage=avg_percentage
+    )
+    if student_row:
+        data.stats = _totals_from_student(student_row)
+        data.current_streak = student_row['current_streak'] or 0
+        data.longest_streak = student_row['longest_streak'] or 0
+        data.last_study_date = student_row['last_study_date']
+    return data
@@ -4,8 +4,12 @@ SQLite ve PostgreSQL uyumluluğu
 """
 
 import os
+import threading
+import time
 from contextlib import contextmanager
 
+import metrics
+
 # Supabase bağlantı bilgileri
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '').strip()
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '').strip()
@@ -27,39 +31,171 @@ if not USE_SUPABASE and os.environ.get('RAILWAY_ENVIRONMENT') or os.environ.get(
     print("📋 SUPABASE_URL, SUPABASE_KEY, SUPABASE_DB_URL ekleyin")
     print("=" * 60)
 
+# Connection pool ayarları (PostgreSQL için)
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))            # boş bağlantı bekleme (sn)
+DB_POOL_MAX_LIFETIME = float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800))  # bağlantı ömrü (sn)
+DB_POOL_PRE_PING_IDLE = float(os.environ.get('DB_POOL_PRE_PING_IDLE', 30))  # bu kadar boşta kalan bağlantı kontrol edilir (sn)
+
+# Sık çalışan sorguları bağlantı başına PREPARE et (PostgreSQL)
+# Transaction modundaki pooler'da (Supabase pgbouncer, port 6543) her transaction farklı
+# sunucu oturumuna gidebildiği için hazırlanmış ifadeler kullanılamaz - otomatik kapatılır
+DB_PREPARE_STATEMENTS = os.environ.get('DB_PREPARE_STATEMENTS', 'False').lower() == 'true'
+DB_POOLER_MODE = os.environ.get('DB_POOLER_MODE', '').strip().lower()   # 'transaction' / 'session'
+
+def behind_transaction_pooler():
+    """Bağlantı transaction modundaki bir pooler üzerinden mi?"""
+    if DB_POOLER_MODE:
+        return DB_POOLER_MODE == 'transaction'
+    from urllib.parse import urlparse
+    try:
+        return urlparse(SUPABASE_DB_URL).port == 6543
+    except ValueError:
+        return False
+
+PREPARED_STATEMENTS = USE_SUPABASE and DB_PREPARE_STATEMENTS and not behind_transaction_pooler()
+if USE_SUPABASE and DB_PREPARE_STATEMENTS and not PREPARED_STATEMENTS:
+    print("⚠️  DB_PREPARE_STATEMENTS kapatıldı: transaction modunda pooler kullanılıyor")
+
+# SQLite ayarları (local development) - her thread kendi kalıcı bağlantısını kullanır
+SQLITE_DB_FILE = os.path.join(os.path.dirname(__file__), 'student_tracker.db')
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))    # kilitli veritabanında bekleme (ms)
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL').upper()      # WAL ile NORMAL güvenli
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))           # bayt (0 = kapalı)
+SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -20000))            # negatif = KiB
+
+_sqlite_local = threading.local()
+
 # Connection pool (PostgreSQL için)
 _pool = None
+_pool_lock = threading.Lock()
+_connection_class = None
+_unpreparable = set()   # PREPARE edilemeyen sorgu adları (tekrar denenmez)
+
+def get_connection_class():
+    """Hazırlanmış ifadeleri takip eden psycopg2 bağlantı sınıfı"""
+    global _connection_class
+    if _connection_class is None:
+        import psycopg2.extensions
+        
+        class PreparingConnection(psycopg2.extensions.connection):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.prepared = set()   # bu oturumda PREPARE edilmiş sorgu adları
+        
+        _connection_class = PreparingConnection
+    return _connection_class
+
+def prepare_statements(conn, names=None):
+    """
+    Kayıtlı sorguları bu bağlantıda PREPARE et (daha önce hazırlananlar atlanır)
+    
+    Args:
+        names: Sadece bu adlar (None = tüm kayıtlı sorgular)
+    """
+    from sql_helper import prepared_statement, registered_queries
+    
+    prepared = getattr(conn, 'prepared', None)
+    if prepared is None:
+        return
+    
+    for name in (names or registered_queries()):
+        if name in prepared or name in _unpreparable:
+            continue
+        cur = conn.cursor()
+        try:
+            cur.execute(prepared_statement(name).prepare_sql)
+            conn.commit()
+            prepared.add(name)
+        except Exception as e:
+            conn.rollback()
+            _unpreparable.add(name)
+            print(f"⚠️  Sorgu hazırlanamadı ({name}): {e}")
+        finally:
+            cur.close()
 
 def get_db_pool():
-    """PostgreSQL connection pool oluştur"""
+    """PostgreSQL connection pool oluştur (thread-safe, bloklayan)"""
     global _pool
     
     if not USE_SUPABASE:
         return None
     
     if _pool is None:
-        try:
-            from psycopg2.pool import SimpleConnectionPool
-            _pool = SimpleConnectionPool(
-                minconn=1,
-                maxconn=10,
-                dsn=SUPABASE_DB_URL
-            )
-        except ImportError:
-            raise ImportError("psycopg2-binary paketi gerekli! pip install psycopg2-binary")
+        with _pool_lock:
+            if _pool is None:
+                try:
+                    import psycopg2
+                except ImportError:
+                    raise ImportError("psycopg2-binary paketi gerekli! pip install psycopg2-binary")
+                
+                from db_pool import ConnectionPool
+                _pool = ConnectionPool(
+                    lambda: psycopg2.connect(SUPABASE_DB_URL, connection_factory=get_connection_class()),
+                    minconn=DB_POOL_MIN,
+                    maxconn=DB_POOL_MAX,
+                    timeout=DB_POOL_TIMEOUT,
+                    max_lifetime=DB_POOL_MAX_LIFETIME,
+                    pre_ping_idle=DB_POOL_PRE_PING_IDLE
+                )
     
     return _pool
 
+def _open_sqlite_connection():
+    """WAL modu ve ayarlı pragma'larla yeni SQLite bağlantısı aç"""
+    import sqlite3
+    
+    if SQLITE_SYNCHRONOUS not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+        raise ValueError(f"Geçersiz SQLITE_SYNCHRONOUS değeri: {SQLITE_SYNCHRONOUS}")
+    
+    conn = sqlite3.connect(SQLITE_DB_FILE, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(f'PRAGMA synchronous={SQLITE_SYNCHRONOUS}')
+    conn.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+    conn.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+    conn.execute(f'PRAGMA cache_size={SQLITE_CACHE_SIZE}')
+    # ON DELETE CASCADE'in çalışması için gerekli (SQLite'ta varsayılan kapalı)
+    conn.execute('PRAGMA foreign_keys=ON')
+    return conn
+
+def get_sqlite_connection():
+    """
+    Bu thread'e ait kalıcı SQLite bağlantısını döndür (yoksa aç)
+    Fork sonrası (gunicorn worker) üst süreçten kalan bağlantı kullanılmaz.
+    """
+    conn = getattr(_sqlite_local, 'conn', None)
+    if conn is None or _sqlite_local.pid != os.getpid():
+        conn = _open_sqlite_connection()
+        _sqlite_local.conn = conn
+        _sqlite_local.pid = os.getpid()
+    return conn
+
+def close_sqlite_connection():
+    """Bu thread'in SQLite bağlantısını kapat (scriptler ve testler için)"""
+    conn = getattr(_sqlite_local, 'conn', None)
+    if conn is not None and _sqlite_local.pid == os.getpid():
+        conn.close()
+    _sqlite_local.conn = None
+
 @contextmanager
 def get_db():
     """Veritabanı bağlantısı context manager - hem SQLite hem PostgreSQL"""
     if USE_SUPABASE:
         # PostgreSQL (Supabase)
         pool = get_db_pool()
+        wait_started = time.perf_counter()
         conn = pool.getconn()
+        checked_out = time.perf_counter()
+        metrics.db_checkout_wait_ms.observe((checked_out - wait_started) * 1000)
+        metrics.db_checkouts.inc()
+        broken = False
         
         try:
             conn.set_session(autocommit=False)
+            if PREPARED_STATEMENTS:
+                prepare_statements(conn)
             # RealDictCursor için cursor factory ayarla
             from psycopg2.extras import RealDictCursor
             # Connection'ı RealDictCursor kullanacak şekilde işaretle
@@ -67,16 +203,21 @@ def get_db():
             yield conn
             conn.commit()
         except Exception as e:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except Exception:
+                # Bağlantı kopmuş (örn. Supabase idle disconnect) - pool'a geri koyma
+                broken = True
             raise e
         finally:
-            pool.putconn(conn)
+            pool.putconn(conn, close=broken or bool(conn.closed))
+            metrics.db_checkout_hold_ms.observe(metrics.current_route(),
+                                                (time.perf_counter() - checked_out) * 1000)
     else:
-        # SQLite (local development)
-        import sqlite3
-        DB_FILE = os.path.join(os.path.dirname(__file__), 'student_tracker.db')
-        conn = sqlite3.connect(DB_FILE)
-        conn.row_factory = sqlite3.Row
+        # SQLite (local development) - thread başına kalıcı bağlantı
+        conn = get_sqlite_connection()
+        checked_out = time.perf_counter()
+        metrics.db_checkouts.inc()
         
         try:
             yield conn
@@ -85,297 +226,56 @@ def get_db():
             conn.rollback()
             raise e
         finally:
-            conn.close()
+            metrics.db_checkout_hold_ms.observe(metrics.current_route(),
+                                                (time.perf_counter() - checked_out) * 1000)
+
+@contextmanager
+def get_direct_db():
+    """
+    Havuz dışı, tek kullanımlık bağlantı (açılış ve bakım işleri için)
+    
+    PostgreSQL'de havuz oluşturulmaz ve prepare_statements() çalışmaz: gunicorn master'ında
+    açılan bağlantı fork ile worker'lara geçmez, henüz migrate edilmemiş şemada PREPARE
+    denenip sorgular kalıcı olarak hazırlanamaz işaretlenmez. Bağlantı sonunda kapatılır.
+    SQLite'ta get_db() ile aynıdır.
+    """
+    if not USE_SUPABASE:
+        with get_db() as conn:
+            yield conn
+        return
+    
+    import psycopg2
+    conn = psycopg2.connect(SUPABASE_DB_URL)
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
 def get_placeholder():
     """Placeholder karakterini döndür"""
     return '%s' if USE_SUPABASE else '?'
 
-# init_db() çağrı sayacı - sadece bir kez çalışmasını sağlamak için
-_init_db_called = False
-
 def init_db():
     """
-    Veritabanı tablolarını oluştur - SADECE TABLO OLUŞTURUR, VERİ SİLMEZ
+    Veritabanı şemasını güncel versiyona getir - SADECE ŞEMA, VERİ SİLMEZ
+    
+    Tablolar, kolonlar ve index'ler migrations.py'deki sıralı migration'larla kurulur.
+    Şema günceldeyse sadece schema_version tablosundaki versiyon okunur (tek sorgu),
+    hiçbir CREATE / ALTER çalışmaz.
     
     ÖNEMLİ GÜVENLİK NOTLARI:
-    - Bu fonksiyon sadece CREATE TABLE IF NOT EXISTS kullanır
+    - Migration'lar IF NOT EXISTS / eksik kolon kontrolü ile idempotenttir
     - Mevcut tablolar ve veriler KORUNUR
-    - Hiçbir DELETE, DROP, TRUNCATE işlemi yapılmaz
-    - Sadece tablo yoksa oluşturur, varsa dokunmaz
+    - Sadece gereksiz kalan index'ler ve tekrarlı tamamlama kayıtları silinir
     """
-    global _init_db_called
-    
-    # Eğer daha önce çağrıldıysa ve tablolar varsa tekrar çalıştırma
-    # (Production'da gereksiz çağrıları önlemek için)
-    if _init_db_called:
-        try:
-            with get_db() as conn:
-                # Tabloların var olup olmadığını kontrol et
-                if USE_SUPABASE:
-                    from psycopg2.extras import RealDictCursor
-                    c = conn.cursor(cursor_factory=RealDictCursor)
-                    c.execute("SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'students')")
-                else:
-                    c = conn.cursor()
-                    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='students'")
-                result = c.fetchone()
-                if result:
-                    # Tablo varsa, init_db'yi tekrar çalıştırmaya gerek yok
-                    if USE_SUPABASE:
-                        table_exists = result[0] if isinstance(result, dict) else result[0]
-                    else:
-                        table_exists = result is not None
-                    if table_exists:
-                        return  # Tablolar zaten var, tekrar çalıştırmaya gerek yok
-        except:
-            pass  # Hata olursa devam et, init_db'yi çalıştır
-    
-    _init_db_called = True
-    
-    if USE_SUPABASE:
-        # PostgreSQL (Supabase)
-        with get_db() as conn:
-            cur = conn.cursor()
-            
-            # Öğrenciler tablosu
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS students (
-                    id SERIAL PRIMARY KEY,
-                    username VARCHAR(255) UNIQUE NOT NULL,
-                    password TEXT NOT NULL,
-                    full_name VARCHAR(255) NOT NULL,
-                    email VARCHAR(255),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_admin BOOLEAN DEFAULT FALSE
-                )
-            ''')
-            
-            # Çalışma kayıtları tablosu
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS study_sessions (
-                    id SERIAL PRIMARY KEY,
-                    student_id INTEGER NOT NULL,
-                    date DATE NOT NULL,
-                    subject VARCHAR(255) NOT NULL,
-                    hours REAL NOT NULL,
-                    efficiency INTEGER NOT NULL,
-                    notes TEXT,
-                    difficulties TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Sınav sonuçları tablosu
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS exam_results (
-                    id SERIAL PRIMARY KEY,
-                    student_id INTEGER NOT NULL,
-                    exam_name VARCHAR(255) NOT NULL,
-                    score REAL NOT NULL,
-                    max_score REAL DEFAULT 100,
-                    exam_date DATE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Ders programları tablosu
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS schedules (
-                    id SERIAL PRIMARY KEY,
-                    student_id INTEGER NOT NULL,
-                    name VARCHAR(255) NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Ders programı öğeleri tablosu
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS schedule_items (
-                    id SERIAL PRIMARY KEY,
-                    schedule_id INTEGER NOT NULL,
-                    day_of_week INTEGER NOT NULL CHECK (day_of_week >= 0 AND day_of_week <= 6),
-                    start_time TIME NOT NULL,
-                    end_time TIME NOT NULL,
-                    subject VARCHAR(255) NOT NULL,
-                    location VARCHAR(255),
-                    instructor VARCHAR(255),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (schedule_id) REFERENCES schedules (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Ders programı tamamlama durumları tablosu
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS schedule_completions (
-                    id SERIAL PRIMARY KEY,
-                    schedule_item_id INTEGER NOT NULL,
-                    completion_date DATE NOT NULL,
-                    is_completed BOOLEAN DEFAULT FALSE,
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (schedule_item_id) REFERENCES schedule_items (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Index'ler
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_study_sessions_student_id ON study_sessions(student_id)')
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_study_sessions_date ON study_sessions(date)')
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_exam_results_student_id ON exam_results(student_id)')
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_schedules_student_id ON schedules(student_id)')
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_schedule_items_schedule_id ON schedule_items(schedule_id)')
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_schedule_completions_item_id ON schedule_completions(schedule_item_id)')
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_schedule_completions_date ON schedule_completions(completion_date)')
-            
-            conn.commit()
-            
-            # Varsayılan admin kullanıcısı oluştur
-            create_default_admin(conn)
-    else:
-        # SQLite (local development)
-        import sqlite3
-        from werkzeug.security import generate_password_hash
-        
-        DB_FILE = os.path.join(os.path.dirname(__file__), 'student_tracker.db')
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                full_name TEXT NOT NULL,
-                email TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_admin INTEGER DEFAULT 0
-            )
-        ''')
-        
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS study_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                date DATE NOT NULL,
-                subject TEXT NOT NULL,
-                hours REAL NOT NULL,
-                efficiency INTEGER NOT NULL,
-                notes TEXT,
-                difficulties TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS exam_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                exam_name TEXT NOT NULL,
-                score REAL NOT NULL,
-                max_score REAL DEFAULT 100,
-                exam_date DATE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        # Ders programları tablosu
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS schedules (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        # Ders programı öğeleri tablosu
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS schedule_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                schedule_id INTEGER NOT NULL,
-                day_of_week INTEGER NOT NULL CHECK (day_of_week >= 0 AND day_of_week <= 6),
-                start_time TIME NOT NULL,
-                end_time TIME NOT NULL,
-                subject TEXT NOT NULL,
-                location TEXT,
-                instructor TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (schedule_id) REFERENCES schedules (id)
-            )
-        ''')
-        
-        # Ders programı tamamlama durumları tablosu
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS schedule_completions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                schedule_item_id INTEGER NOT NULL,
-                completion_date DATE NOT NULL,
-                is_completed INTEGER DEFAULT 0,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (schedule_item_id) REFERENCES schedule_items (id)
-            )
-        ''')
-        
-        # Index'ler
-        c.execute('CREATE INDEX IF NOT EXISTS idx_schedules_student_id ON schedules(student_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_schedule_items_schedule_id ON schedule_items(schedule_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_schedule_completions_item_id ON schedule_completions(schedule_item_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_schedule_completions_date ON schedule_completions(completion_date)')
-        
-        conn.commit()
-        conn.close()
-        
-        # Varsayılan admin oluştur
-        create_default_admin()
-
-def create_default_admin(conn=None):
-    """Varsayılan admin kullanıcısı oluştur"""
-    from werkzeug.security import generate_password_hash
-    
-    if USE_SUPABASE:
-        if conn is None:
-            with get_db() as conn:
-                _create_admin(conn)
-        else:
-            _create_admin(conn)
-    else:
-        import sqlite3
-        DB_FILE = os.path.join(os.path.dirname(__file__), 'student_tracker.db')
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        c.execute('SELECT id FROM students WHERE username = ?', ('admin',))
-        if not c.fetchone():
-            admin_password = generate_password_hash('admin123')
-            c.execute('''
-                INSERT INTO students (username, password, full_name, email, is_admin)
-                VALUES (?, ?, ?, ?, ?)
-            ''', ('admin', admin_password, 'Admin Kullanıcı', 'admin@example.com', 1))
-            conn.commit()
-            print("✅ Varsayılan admin kullanıcısı oluşturuldu (username: admin, password: admin123)")
-        conn.close()
-
-def _create_admin(conn):
-    """Admin kullanıcısı oluştur (PostgreSQL)"""
-    from werkzeug.security import generate_password_hash
+    from migrations import LATEST_VERSION, current_version, migrate
     
-    cur = conn.cursor()
-    cur.execute('SELECT id FROM students WHERE username = %s', ('admin',))
-    if not cur.fetchone():
-        admin_password = generate_password_hash('admin123')
-        cur.execute('''
-            INSERT INTO students (username, password, full_name, email, is_admin)
-            VALUES (%s, %s, %s, %s, %s)
-        ''', ('admin', admin_password, 'Admin Kullanıcı', 'admin@example.com', True))
-        conn.commit()
-        print("✅ Varsayılan admin kullanıcısı oluşturuldu (username: admin, password: admin123)")
+    # Havuz ve hazırlanmış ifadeler migration'dan sonra, worker'larda kurulur
+    with get_direct_db() as conn:
+        if current_version(conn) >= LATEST_VERSION:
+            return
+        migrate(conn)
@@ -0,0 +1,195 @@
+"""
+Thread-safe PostgreSQL connection pool
+psycopg2'nin SimpleConnectionPool'u thread-safe değil ve dolduğunda beklemek yerine
+PoolError fırlatır. Bu pool:
+- Boş bağlantı yoksa ve limit doluysa timeout'a kadar bekler
+- Uzun süre boşta kalan bağlantıyı vermeden önce SELECT 1 ile kontrol eder (pre-ping)
+- Maksimum ömrünü dolduran bağlantıları kapatıp yenisini açar (recycle)
+"""
+
+import threading
+import time
+
+
+class PoolTimeoutError(Exception):
+    """Timeout süresi içinde boş bağlantı bulunamadı"""
+    pass
+
+
+class ConnectionPool:
+    """
+    Bloklayan, thread-safe connection pool
+
+    Args:
+        connect: Yeni bağlantı açan fonksiyon (örn. lambda: psycopg2.connect(dsn))
+        minconn: Başlangıçta açılacak bağlantı sayısı
+        maxconn: Aynı anda açık olabilecek en fazla bağlantı
+        timeout: getconn() için varsayılan bekleme süresi (saniye)
+        max_lifetime: Bağlantının en uzun kullanım ömrü (saniye, 0 = sınırsız)
+        pre_ping_idle: Bu süreden uzun boşta kalan bağlantı verilmeden önce kontrol edilir
+                       (saniye, 0 = her seferinde kontrol et)
+    """
+
+    def __init__(self, connect, minconn=1, maxconn=10, timeout=30.0,
+                 max_lifetime=1800.0, pre_ping_idle=30.0):
+        if maxconn < 1 or minconn > maxconn:
+            raise ValueError("Geçersiz pool boyutu: minconn <= maxconn ve maxconn >= 1 olmalı")
+
+        self._connect = connect
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.pre_ping_idle = pre_ping_idle
+
+        self._cond = threading.Condition()
+        self._idle = []          # [(conn, last_used)] - son kullanılan en sonda (LIFO)
+        self._created = {}       # id(conn) -> açılış zamanı
+        self._in_use = set()     # id(conn)
+        self._total = 0          # açık + açılmakta olan bağlantı sayısı
+        self._closed = False
+        self._waits = 0          # pool dolu olduğu için beklemek zorunda kalan istekler
+        self._timeouts = 0       # bekleyip bağlantı alamayan istekler (tükenme)
+
+        for _ in range(minconn):
+            self._total += 1
+            conn = self._open()
+            self._idle.append((conn, time.monotonic()))
+
+    # Bağlantı yaşam döngüsü
+
+    def _open(self):
+        """Yeni bağlantı aç (çağıran _total içinde yer ayırmış olmalı)"""
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        self._created[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        """Bağlantıyı kapat ve sayaçtan düş"""
+        self._created.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def _expired(self, conn):
+        if not self.max_lifetime:
+            return False
+        created = self._created.get(id(conn), 0)
+        return time.monotonic() - created >= self.max_lifetime
+
+    @staticmethod
+    def _is_closed(conn):
+        return bool(getattr(conn, 'closed', False))
+
+    def _ping(self, conn):
+        """Bağlantının hâlâ canlı olduğunu kontrol et"""
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT 1')
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    # Public API (SimpleConnectionPool ile uyumlu)
+
+    def getconn(self, timeout=None):
+        """
+        Pool'dan bağlantı al - gerekirse boş bağlantı için bekler
+
+        Raises:
+            PoolTimeoutError: timeout süresi içinde bağlantı alınamazsa
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        waited = False
+
+        while True:
+            conn = None
+            last_used = None
+            open_new = False
+
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeoutError("Connection pool kapatıldı")
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._total < self.maxconn:
+                        # Yeri kilit altında ayır, bağlantıyı kilit dışında aç
+                        self._total += 1
+                        open_new = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"{timeout:.1f} saniye içinde boş veritabanı bağlantısı bulunamadı "
+                            f"(maxconn={self.maxconn})"
+                        )
+                    if not waited:
+                        waited = True
+                        self._waits += 1
+                    self._cond.wait(remaining)
+
+            if open_new:
+                conn = self._open()
+            else:
+                # Kapanmış, ömrü dolmuş veya uzun süre boşta kalıp yanıt vermeyen bağlantıyı yenile
+                idle_for = time.monotonic() - last_used
+                if (self._is_closed(conn) or self._expired(conn)
+                        or (idle_for >= self.pre_ping_idle and not self._ping(conn))):
+                    self._discard(conn)
+                    continue
+
+            with self._cond:
+                self._in_use.add(id(conn))
+            return conn
+
+    def putconn(self, conn, close=False):
+        """Bağlantıyı pool'a geri ver (close=True ise kapat)"""
+        with self._cond:
+            self._in_use.discard(id(conn))
+
+        if close or self._closed or self._is_closed(conn) or self._expired(conn):
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        """Tüm boştaki bağlantıları kapat, kullanımdakiler geri verildiğinde kapanır"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle = []
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Anlık pool durumu"""
+        with self._cond:
+            return {
+                'total': self._total,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'maxconn': self.maxconn,
+                'waits': self._waits,
+                'timeouts': self._timeouts
+            }
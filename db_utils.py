@@ -12,6 +12,53 @@ def get_cursor(conn):
     else:
         return conn.cursor()
 
+# Toplu yazmada bir round trip'te gönderilen en fazla satır sayısı (PostgreSQL)
+BULK_INSERT_PAGE_SIZE = 500
 
+def insert_many(c, table, columns, rows):
+    """
+    Satırları tek seferde ekle (döngüde satır başına execute yerine)
+    
+    PostgreSQL: execute_values ile çok satırlı VALUES (BULK_INSERT_PAGE_SIZE satırda bir round trip)
+    SQLite: executemany (aynı hazırlanmış ifade tekrar kullanılır)
+    
+    Args:
+        c: Cursor
+        table: Tablo adı (sabit, kullanıcı girdisi olmamalı)
+        columns: Kolon adları
+        rows: Kolon sırasına göre değer tuple'ları
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    
+    column_list = ', '.join(columns)
+    if USE_SUPABASE:
+        from psycopg2.extras import execute_values
+        execute_values(c, f'INSERT INTO {table} ({column_list}) VALUES %s', rows,
+                       page_size=BULK_INSERT_PAGE_SIZE)
+    else:
+        placeholders = ', '.join('?' * len(columns))
+        c.executemany(f'INSERT INTO {table} ({column_list}) VALUES ({placeholders})', rows)
+    return len(rows)
 
-
+def execute_many(c, query, rows):
+    """
+    Aynı sorguyu birden fazla parametre seti ile çalıştır (toplu UPDATE / DELETE)
+    
+    PostgreSQL: execute_batch (BULK_INSERT_PAGE_SIZE ifade bir round trip'te)
+    SQLite: executemany
+    
+    Args:
+        query: adapt_query() ile adapte edilmiş sorgu
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    
+    if USE_SUPABASE:
+        from psycopg2.extras import execute_batch
+        execute_batch(c, query, rows, page_size=BULK_INSERT_PAGE_SIZE)
+    else:
+        c.executemany(query, rows)
+    return len(rows)
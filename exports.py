@@ -0,0 +1,191 @@
+"""
+Çalışma kayıtları ve sınav sonuçlarının dışa aktarımı (CSV / NDJSON)
+
+Satırlar parça parça okunup generator ile yazılır, bellek kullanımı satır sayısından
+bağımsızdır:
+- PostgreSQL: isimli (server-side) cursor, EXPORT_BATCH_SIZE satırlık parçalar
+- SQLite: cursor.fetchmany() (SQLite cursor'ı satırları zaten tembel üretir)
+
+Bağlantı indirme bitene kadar tutulur; route'lar generator'ı stream_with_context ile
+döndürmelidir.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime
+
+from database import get_db, USE_SUPABASE
+from db_utils import get_cursor
+from sql_helper import adapt_query
+
+# Veritabanından tek seferde okunan satır sayısı
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+# kind -> (tablo, tarih kolonu, dışa aktarılan kolonlar)
+EXPORT_KINDS = {
+    'sessions': ('study_sessions', 'date',
+                 ('id', 'student_id', 'username', 'date', 'subject', 'hours', 'efficiency',
+                  'notes', 'difficulties', 'created_at')),
+    'exams': ('exam_results', 'exam_date',
+              ('id', 'student_id', 'username', 'exam_name', 'score', 'max_score',
+               'exam_date', 'created_at')),
+}
+
+
+def parse_export_args(args, student_id=None):
+    """
+    İstek parametrelerinden dışa aktarım filtreleri
+
+    Args:
+        args: request.args (kind, format, from, to, subject, student_id)
+        student_id: Verilirse sadece bu öğrencinin kayıtları (öğrenci export'u)
+
+    Returns:
+        dict: kind, format, student_id, from, to, subject
+
+    Raises:
+        ValueError: Geçersiz parametre
+    """
+    kind = args.get('kind', 'sessions')
+    if kind not in EXPORT_KINDS:
+        raise ValueError('kind sessions veya exams olmalı')
+
+    export_format = args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError('format csv veya ndjson olmalı')
+
+    if student_id is None and args.get('student_id'):
+        try:
+            student_id = int(args['student_id'])
+        except ValueError:
+            raise ValueError('student_id sayı olmalı') from None
+
+    dates = {}
+    for name in ('from', 'to'):
+        value = args.get(name)
+        if value:
+            try:
+                dates[name] = datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+            except ValueError:
+                raise ValueError('Tarihler YYYY-AA-GG formatında olmalı') from None
+    if 'from' in dates and 'to' in dates and dates['from'] > dates['to']:
+        raise ValueError('from tarihi to tarihinden sonra olamaz')
+
+    subject = args.get('subject') or None
+    if subject and kind != 'sessions':
+        raise ValueError('subject filtresi sadece çalışma kayıtları için kullanılabilir')
+
+    return {
+        'kind': kind,
+        'format': export_format,
+        'student_id': student_id,
+        'from': dates.get('from'),
+        'to': dates.get('to'),
+        'subject': subject,
+    }
+
+
+def build_export_query(filters):
+    """Filtrelere göre (sorgu, parametreler)"""
+    table, date_column, columns = EXPORT_KINDS[filters['kind']]
+    select = ', '.join('st.username' if column == 'username' else f't.{column}' for column in columns)
+
+    conditions = []
+    params = []
+    if filters['student_id'] is not None:
+        conditions.append('t.student_id = ?')
+        params.append(filters['student_id'])
+    if filters['from']:
+        conditions.append(f't.{date_column} >= ?')
+        params.append(filters['from'])
+    if filters['to']:
+        conditions.append(f't.{date_column} <= ?')
+        params.append(filters['to'])
+    if filters['subject']:
+        conditions.append('t.subject = ?')
+        params.append(filters['subject'])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    query = adapt_query(f'''
+        SELECT {select}
+        FROM {table} t
+        JOIN students st ON st.id = t.student_id
+        {where}
+        ORDER BY t.student_id, t.{date_column}, t.id
+    ''')
+    return query, params
+
+
+def iter_export_rows(filters):
+    """Kayıtları EXPORT_BATCH_SIZE'lık parçalar halinde üret (her parça bir liste)"""
+    query, params = build_export_query(filters)
+
+    with get_db() as conn:
+        if USE_SUPABASE:
+            from psycopg2.extras import RealDictCursor
+            # İsimli cursor: sonuç sunucuda kalır, parça parça çekilir
+            c = conn.cursor(name='export_rows', cursor_factory=RealDictCursor)
+            c.itersize = EXPORT_BATCH_SIZE
+        else:
+            c = get_cursor(conn)
+
+        try:
+            c.execute(query, params)
+            while True:
+                rows = c.fetchmany(EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            c.close()
+            # İstemci indirmeyi yarıda keserse generator GeneratorExit ile kapanır; get_db bunu
+            # yakalamadığı için bağlantı açık transaction ile havuza dönmesin (okuma, kayıp yok)
+            conn.rollback()
+
+
+def _value(value):
+    """Tarih/zaman değerlerini metne çevir (CSV ve JSON için)"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def stream_export(filters):
+    """
+    Dışa aktarım içeriğini metin parçaları olarak üret
+
+    CSV Excel'in Türkçe karakterleri doğru açması için BOM ile başlar.
+    """
+    columns = EXPORT_KINDS[filters['kind']][2]
+
+    if filters['format'] == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield '\ufeff' + buffer.getvalue()
+
+        for rows in iter_export_rows(filters):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_value(row[column]) for column in columns] for row in rows)
+            yield buffer.getvalue()
+    else:
+        for rows in iter_export_rows(filters):
+            yield ''.join(
+                json.dumps({column: _value(row[column]) for column in columns}, ensure_ascii=False) + '\n'
+                for row in rows
+            )
+
+
+def export_filename(filters):
+    """İndirme dosya adı, ör. sessions_2024-05-01.csv"""
+    return f"{filters['kind']}_{datetime.now().strftime('%Y-%m-%d')}.{filters['format']}"
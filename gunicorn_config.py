@@ -20,9 +20,10 @@ def on_starting(server):
             print("📁 Veritabanı: Supabase PostgreSQL")
             # Veri kontrolü
             try:
-                from database import get_db
+                # Master'da havuz açılmasın (bağlantılar fork ile worker'lara geçer)
+                from database import get_direct_db
                 from psycopg2.extras import RealDictCursor
-                with get_db() as conn:
+                with get_direct_db() as conn:
                     c = conn.cursor(cursor_factory=RealDictCursor)
                     c.execute('SELECT COUNT(*) as count FROM students')
                     result = c.fetchone()
@@ -42,10 +43,30 @@ def on_starting(server):
     
     print("=" * 60)
 
+def post_fork(server, worker):
+    """Her worker fork edildikten sonra çalışır"""
+    # Thread'ler fork'tan sağ çıkmaz - arka plan işleri worker içinde başlatılmalı
+    from leaderboard import start_background_refresh
+    start_background_refresh()
+    
+    # Kapalıyken kaçırılan gün dönümü için süresi dolmuş streak'leri sıfırla,
+    # sonra her gece yarısı tekrar çalıştır
+    from streaks import ensure_daily_sweep
+    ensure_daily_sweep()
+    
+    # Sıralama motorunu worker başlangıcında veritabanından kur
+    try:
+        from leaderboard_engine import get_engine
+        get_engine()
+    except Exception as e:
+        print(f"⚠️  Leaderboard motoru kurulamadı: {e}")
+
 # Gunicorn ayarları
 bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
-workers = 2
-worker_class = "sync"
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+# Connection pool thread-safe olduğu için gthread worker'ları da kullanılabilir
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
 timeout = 120
 keepalive = 5
 
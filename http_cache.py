@@ -0,0 +1,107 @@
+"""
+HTTP önbellekleme (ETag / Last-Modified) - öğrenci veri sürümü ile
+
+Öğrencinin verisini değiştiren her route, aynı transaction içinde students.data_version
+değerini artırır (bump_data_version). JSON endpoint'leri ağır sorgulardan önce sadece bu
+sürümü okur (birincil anahtarla tek satır); istemcideki kopya güncelse 304 Not Modified
+döner, veri sorguları ve JSON serileştirme hiç çalışmaz.
+
+Kullanım (route içinde):
+    etag, last_modified = cache_validators(student_id, get_data_version(c, student_id), schedule_id)
+    cached = not_modified_response(etag, last_modified)
+    if cached:
+        return cached
+    ...
+    return with_validators(jsonify(...), etag, last_modified)
+"""
+
+from datetime import datetime, timezone
+
+from flask import current_app, request
+
+from sql_helper import execute_query, register_query
+
+DATA_VERSION_SELECT = register_query('student.data_version', '''
+    SELECT data_version, data_updated_at FROM students WHERE id = ?
+''')
+
+DATA_VERSION_BUMP = register_query('student.bump_data_version', '''
+    UPDATE students
+    SET data_version = COALESCE(data_version, 0) + 1, data_updated_at = ?
+    WHERE id = ?
+''')
+
+
+def bump_data_version(c, student_id):
+    """Öğrencinin veri sürümünü artır (yazma transaction'ı içinde, commit'ten önce)"""
+    now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    execute_query(c, DATA_VERSION_BUMP, (now, student_id))
+
+
+def get_data_version(c, student_id):
+    """Öğrencinin veri sürümü satırı (data_version, data_updated_at) veya None"""
+    execute_query(c, DATA_VERSION_SELECT, (student_id,))
+    return c.fetchone()
+
+
+def _as_utc(value):
+    """data_updated_at değerini (PostgreSQL: datetime, SQLite: metin) UTC datetime'a çevir"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def cache_validators(student_id, version, *variant):
+    """
+    Yanıt için (etag, last_modified)
+
+    Args:
+        student_id: Verinin sahibi - tarayıcı önbelleği URL bazlı olduğu için aynı tarayıcıda
+            oturum açan başka bir öğrenci eski ETag ile 304 almasın diye ETag'e girer
+        version: get_data_version() satırı (öğrenci yoksa None)
+        variant: Aynı sürümde yanıtı değiştiren diğer değerler (kayıt id'si, tarih aralığı...)
+    """
+    if version is None:
+        return None, None
+
+    parts = [str(student_id), str(version['data_version'] or 0)] + [str(value) for value in variant]
+    return '-'.join(parts), _as_utc(version['data_updated_at'])
+
+
+def not_modified_response(etag, last_modified):
+    """
+    İstemcinin kopyası güncelse 304 yanıtı, değilse None
+    If-None-Match varsa sadece ona bakılır (If-Modified-Since saniye hassasiyetinde)
+    """
+    if etag is None:
+        return None
+
+    if request.if_none_match:
+        fresh = request.if_none_match.contains(etag)
+    elif request.if_modified_since and last_modified:
+        fresh = last_modified.replace(microsecond=0) <= request.if_modified_since
+    else:
+        fresh = False
+
+    if not fresh:
+        return None
+    return with_validators(current_app.response_class(status=304), etag, last_modified)
+
+
+def with_validators(response, etag, last_modified):
+    """Yanıta ETag / Last-Modified ekle; tarayıcı her seferinde doğrulasın (no-cache)"""
+    if etag is None:
+        return response
+
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
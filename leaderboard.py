@@ -0,0 +1,175 @@
+"""
+Leaderboard snapshot'ları
+Üç sıralama (streak, toplam saat, çalışma sayısı) periyodik olarak hesaplanıp
+bellekte tutulur; her istek veritabanına gitmeden hazır listeyi okur.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+from database import get_db, USE_SUPABASE
+from db_utils import get_cursor
+
+# Snapshot'ın en fazla kaç saniye eski olabileceği (arka plan yenileme aralığı)
+LEADERBOARD_REFRESH_SECONDS = int(os.environ.get('LEADERBOARD_REFRESH_SECONDS', 60))
+# Yazma sonrası (dirty) yenilemeler arasındaki en kısa süre
+LEADERBOARD_MIN_REFRESH_SECONDS = int(os.environ.get('LEADERBOARD_MIN_REFRESH_SECONDS', 5))
+LEADERBOARD_LIMIT = 50
+
+_snapshot = None
+_snapshot_time = 0.0
+_dirty = False
+_refresh_lock = threading.Lock()
+_refresher_started = False
+
+
+def _admin_condition():
+    """Admin kontrolü için uyumlu koşul"""
+    return "is_admin = FALSE" if USE_SUPABASE else "is_admin = 0"
+
+
+def build_snapshot(conn):
+    """Üç leaderboard listesini veritabanından hesapla"""
+    c = get_cursor(conn)
+    admin_condition = _admin_condition()
+
+    # Streak leaderboard (current_streak'e göre)
+    c.execute(f'''
+        SELECT
+            id,
+            username,
+            full_name,
+            COALESCE(current_streak, 0) as current_streak,
+            COALESCE(longest_streak, 0) as longest_streak
+        FROM students
+        WHERE {admin_condition}
+        ORDER BY COALESCE(current_streak, 0) DESC, COALESCE(longest_streak, 0) DESC
+        LIMIT {LEADERBOARD_LIMIT}
+    ''')
+    streak_board = [dict(row) for row in c.fetchall()]
+
+    # Toplam saat leaderboard (students satırındaki sayaçlardan)
+    c.execute(f'''
+        SELECT
+            id,
+            username,
+            full_name,
+            COALESCE(total_hours, 0) as total_hours,
+            COALESCE(study_days, 0) as study_days
+        FROM students
+        WHERE {admin_condition}
+        ORDER BY COALESCE(total_hours, 0) DESC
+        LIMIT {LEADERBOARD_LIMIT}
+    ''')
+    hours_board = [dict(row) for row in c.fetchall()]
+
+    # Çalışma sayısı leaderboard (students satırındaki sayaçlardan)
+    c.execute(f'''
+        SELECT
+            id,
+            username,
+            full_name,
+            COALESCE(total_sessions, 0) as total_sessions,
+            COALESCE(efficiency_sum * 1.0 / NULLIF(total_sessions, 0), 0) as avg_efficiency
+        FROM students
+        WHERE {admin_condition}
+        ORDER BY COALESCE(total_sessions, 0) DESC
+        LIMIT {LEADERBOARD_LIMIT}
+    ''')
+    sessions_board = [dict(row) for row in c.fetchall()]
+
+    return {
+        'streak': streak_board,
+        'hours': hours_board,
+        'sessions': sessions_board,
+        'generated_at': datetime.now()
+    }
+
+
+def refresh_snapshot():
+    """
+    Snapshot'ı yeniden hesapla ve bellekteki kopyayı değiştir
+    _refresh_lock tutularak çağrılır
+    """
+    global _snapshot, _snapshot_time, _dirty
+
+    # Bayrak hesaplamadan önce temizlenir: hesaplama sırasında gelen mark_dirty()
+    # tekrar işaretler ve o yazma bir sonraki okumada snapshot'a girer
+    was_dirty, _dirty = _dirty, False
+    try:
+        with get_db() as conn:
+            snapshot = build_snapshot(conn)
+    except Exception:
+        _dirty = _dirty or was_dirty
+        raise
+
+    _snapshot = snapshot
+    _snapshot_time = time.monotonic()
+    return snapshot
+
+
+def mark_dirty():
+    """Yazma işlemlerinden sonra çağrılır - bir sonraki okumada snapshot yenilenir"""
+    global _dirty
+    _dirty = True
+
+
+def get_snapshot():
+    """
+    Güncel leaderboard snapshot'ını döndür
+
+    Snapshot eskimişse (veya yazma sonrası dirty ise) tek bir istek yeniler;
+    o sırada gelen diğer istekler mevcut snapshot'ı kullanmaya devam eder.
+    """
+    age = time.monotonic() - _snapshot_time
+    stale = _snapshot is None or age >= LEADERBOARD_REFRESH_SECONDS
+    if _dirty and age >= LEADERBOARD_MIN_REFRESH_SECONDS:
+        stale = True
+
+    if not stale:
+        return _snapshot
+
+    if _snapshot is None:
+        # İlk yükleme - herkes bekler
+        with _refresh_lock:
+            if _snapshot is None:
+                return refresh_snapshot()
+            return _snapshot
+
+    if _refresh_lock.acquire(blocking=False):
+        try:
+            return refresh_snapshot()
+        except Exception as e:
+            print(f"⚠️  Leaderboard yenileme hatası: {e}")
+            return _snapshot
+        finally:
+            _refresh_lock.release()
+
+    return _snapshot
+
+
+def _refresh_loop():
+    """Arka plan yenileme döngüsü"""
+    while True:
+        time.sleep(LEADERBOARD_REFRESH_SECONDS)
+        try:
+            with _refresh_lock:
+                refresh_snapshot()
+        except Exception as e:
+            print(f"⚠️  Leaderboard arka plan yenileme hatası: {e}")
+
+
+def start_background_refresh():
+    """
+    Snapshot'ı periyodik yenileyen daemon thread'i başlat
+    Gunicorn'da fork sonrası (post_fork) her worker için çağrılmalı
+    """
+    global _refresher_started
+    if _refresher_started:
+        return
+    _refresher_started = True
+
+    thread = threading.Thread(target=_refresh_loop, name='leaderboard-refresh', daemon=True)
+    thread.start()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Artımlı leaderboard motoru
+Toplam saat, çalışma sayısı ve streak için tüm öğrencilerin sıralamasını bellekte
+sıralı tutar. Yazma işlemleri fark (delta) olarak uygulanır, böylece hem ilk K
+listesi hem de bir öğrencinin sırası ("#137") tabloyu taramadan bulunur.
+
+Her worker başlangıçta veritabanından kurar ve belirli aralıklarla yeniden senkronize
+olur (diğer worker'ların yazdığı farklar bu şekilde yansır). Yeniden kurulum sırasında
+gelen farklar biriktirilir ve yeni sıralamaya tekrar uygulanır.
+
+Kullanım (çalışan bir worker'ın bellekteki sıralamasını veritabanıyla karşılaştır -
+/internal/leaderboard/check, admin oturumu veya METRICS_TOKEN ile):
+    python leaderboard_engine.py check [http://localhost:5002]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from bisect import bisect_left, insort
+
+from database import get_db, USE_SUPABASE
+from db_utils import get_cursor
+from sql_helper import execute_query, register_query
+
+# Diğer worker'ların yazdıklarını yakalamak için tam yeniden kurulum aralığı (saniye)
+LEADERBOARD_ENGINE_RESYNC_SECONDS = int(os.environ.get('LEADERBOARD_ENGINE_RESYNC_SECONDS', 300))
+# Saat toplamlarında kayan nokta farkı toleransı
+VALUE_TOLERANCE = 1e-6
+
+METRICS = ('hours', 'sessions', 'streak')
+
+# Tüm öğrencilerin sayaçları (admin hariç)
+_LOAD_QUERY = register_query('leaderboard.engine_load', f'''
+    SELECT
+        id,
+        COALESCE(total_hours, 0) as hours,
+        COALESCE(total_sessions, 0) as sessions,
+        COALESCE(current_streak, 0) as streak
+    FROM students
+    WHERE {"is_admin = FALSE" if USE_SUPABASE else "is_admin = 0"}
+''')
+
+
+class RankIndex:
+    """Tek bir metrik için sıralı (değer azalan, id artan) öğrenci listesi"""
+
+    def __init__(self):
+        self._values = {}
+        self._sorted = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, student_id):
+        return self._values.get(student_id)
+
+    def set(self, student_id, value):
+        """Öğrencinin değerini ayarla (yoksa ekle)"""
+        old = self._values.get(student_id)
+        if old is not None:
+            if old == value:
+                return
+            index = bisect_left(self._sorted, (-old, student_id))
+            del self._sorted[index]
+        self._values[student_id] = value
+        insort(self._sorted, (-value, student_id))
+
+    def add(self, student_id, delta):
+        """Öğrencinin değerine fark ekle"""
+        self.set(student_id, self._values.get(student_id, 0) + delta)
+
+    def remove(self, student_id):
+        old = self._values.pop(student_id, None)
+        if old is not None:
+            index = bisect_left(self._sorted, (-old, student_id))
+            del self._sorted[index]
+
+    def rank(self, student_id):
+        """1'den başlayan sıra - eşit değerler aynı sırayı paylaşır"""
+        value = self._values.get(student_id)
+        if value is None:
+            return None
+        return bisect_left(self._sorted, (-value,)) + 1
+
+    def top(self, k):
+        """İlk k öğrenci: [(student_id, value), ...]"""
+        return [(student_id, -neg_value) for neg_value, student_id in self._sorted[:k]]
+
+    def items(self):
+        return self._values.items()
+
+
+class LeaderboardEngine:
+    """Üç metrik için RankIndex'leri yöneten thread-safe motor"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._indexes = {metric: RankIndex() for metric in METRICS}
+        # Yeniden kurulum sürerken uygulanan farklar: [(fonksiyon, argümanlar)]
+        self._pending = None
+        self.built_at = None
+
+    @property
+    def is_built(self):
+        return self.built_at is not None
+
+    def _load(self, conn):
+        """Öğrenci sayaçlarını veritabanından oku"""
+        c = get_cursor(conn)
+        execute_query(c, _LOAD_QUERY)
+        return c.fetchall()
+
+    def rebuild(self, conn):
+        """
+        Tüm sıralamaları veritabanından yeniden kur
+        Okuma kilitsiz yapılır; bu sırada gelen farklar biriktirilip yeni sıralamaya
+        tekrar uygulanır (okumadan önce commit edilmiş bir fark iki kez sayılırsa
+        bir sonraki yeniden kurulum düzeltir)
+        """
+        with self._rebuild_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                rows = self._load(conn)
+
+                indexes = {}
+                for metric in METRICS:
+                    index = RankIndex()
+                    index._values = {row['id']: row[metric] for row in rows}
+                    index._sorted = sorted((-value, student_id) for student_id, value in index._values.items())
+                    indexes[metric] = index
+
+                with self._lock:
+                    for apply, args in self._pending:
+                        apply(indexes, *args)
+                    self._indexes = indexes
+                    self.built_at = time.monotonic()
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def _apply(self, apply, *args):
+        """Farkı uygula; yeniden kurulum sürüyorsa tekrar uygulamak için sakla"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((apply, args))
+            if self.is_built:
+                apply(self._indexes, *args)
+
+    @staticmethod
+    def _study_delta(indexes, student_id, hours_delta, sessions_delta):
+        indexes['hours'].add(student_id, hours_delta)
+        indexes['sessions'].add(student_id, sessions_delta)
+
+    @staticmethod
+    def _streak(indexes, student_id, value):
+        indexes['streak'].set(student_id, value)
+
+    @staticmethod
+    def _student_added(indexes, student_id):
+        for index in indexes.values():
+            if index.get(student_id) is None:
+                index.set(student_id, 0)
+
+    @staticmethod
+    def _student_removed(indexes, student_id):
+        for index in indexes.values():
+            index.remove(student_id)
+
+    def apply_study_delta(self, student_id, hours_delta, sessions_delta):
+        """Çalışma kaydı ekleme/güncelleme/silme farkını uygula"""
+        self._apply(self._study_delta, student_id, hours_delta, sessions_delta)
+
+    def set_streak(self, student_id, value):
+        """Streak güncellemesini uygula"""
+        self._apply(self._streak, student_id, value)
+
+    def add_student(self, student_id):
+        """Yeni kayıt olan öğrenciyi sıfır değerlerle ekle"""
+        self._apply(self._student_added, student_id)
+
+    def remove_student(self, student_id):
+        """Silinen öğrenciyi tüm sıralamalardan çıkar"""
+        self._apply(self._student_removed, student_id)
+
+    def rank(self, metric, student_id):
+        """
+        Öğrencinin sırasını döndür
+
+        Returns:
+            tuple: (rank, total) - öğrenci sıralamada yoksa (None, total)
+        """
+        with self._lock:
+            index = self._indexes[metric]
+            return index.rank(student_id), len(index)
+
+    def ranks_for(self, student_id):
+        """Öğrencinin üç metrikteki sırası: {'hours': (rank, total), ...}"""
+        with self._lock:
+            return {metric: self.rank(metric, student_id) for metric in METRICS}
+
+    def top(self, metric, k):
+        with self._lock:
+            return self._indexes[metric].top(k)
+
+    def sizes(self):
+        """Metrik başına sıralamadaki öğrenci sayısı"""
+        with self._lock:
+            return {metric: len(self._indexes[metric]) for metric in METRICS}
+
+    def check_consistency(self, conn):
+        """
+        Bellekteki değerleri veritabanıyla karşılaştır
+        Çalışan worker içinden çağrılmalıdır (/internal/leaderboard/check); yazma
+        sürerken commit ile farkın uygulanması arasındaki kısa anda geçici uyuşmazlık görülebilir
+
+        Returns:
+            list: Uyuşmazlıklar [{'metric', 'student_id', 'memory', 'database'}]
+        """
+        rows = self._load(conn)
+        mismatches = []
+
+        with self._lock:
+            seen = set()
+            for row in rows:
+                seen.add(row['id'])
+                for metric in METRICS:
+                    memory = self._indexes[metric].get(row['id'])
+                    database = row[metric]
+                    if memory is None or abs(memory - database) > VALUE_TOLERANCE:
+                        mismatches.append({'metric': metric, 'student_id': row['id'],
+                                           'memory': memory, 'database': database})
+
+            for metric in METRICS:
+                for student_id, memory in self._indexes[metric].items():
+                    if student_id not in seen:
+                        mismatches.append({'metric': metric, 'student_id': student_id,
+                                           'memory': memory, 'database': None})
+
+                # Sıralı liste ile değer sözlüğü birbirini tutmalı
+                index = self._indexes[metric]
+                if len(index._sorted) != len(index._values):
+                    mismatches.append({'metric': metric, 'student_id': None,
+                                       'memory': len(index._sorted), 'database': len(index._values)})
+
+        return mismatches
+
+
+_engine = LeaderboardEngine()
+
+
+def get_engine():
+    """Motoru döndür - kurulmamışsa veya yeniden senkron zamanı geldiyse veritabanından kur"""
+    if not _engine.is_built or time.monotonic() - _engine.built_at >= LEADERBOARD_ENGINE_RESYNC_SECONDS:
+        try:
+            with get_db() as conn:
+                _engine.rebuild(conn)
+        except Exception as e:
+            if not _engine.is_built:
+                raise
+            print(f"⚠️  Leaderboard motoru senkronizasyon hatası: {e}")
+    return _engine
+
+
+def record_study_delta(student_id, hours_delta, sessions_delta):
+    """Yazma route'larından commit sonrası çağrılır"""
+    _engine.apply_study_delta(student_id, hours_delta, sessions_delta)
+
+
+def record_streak(student_id, value):
+    """Streak güncellemesinden sonra çağrılır"""
+    _engine.set_streak(student_id, value)
+
+
+def record_student_added(student_id):
+    """Yeni öğrenci kaydından sonra çağrılır"""
+    _engine.add_student(student_id)
+
+
+def record_student_removed(student_id):
+    """Öğrenci silindikten sonra çağrılır"""
+    _engine.remove_student(student_id)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'check':
+        print("Kullanım: python leaderboard_engine.py check [http://localhost:5002]")
+        sys.exit(1)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    base_url = sys.argv[2] if len(sys.argv) > 2 else f"http://localhost:{os.environ.get('PORT', 5002)}"
+    url = base_url.rstrip('/') + '/internal/leaderboard/check'
+
+    print("=" * 60)
+    print("🔍 Leaderboard motoru tutarlılık kontrolü")
+    print(f"🌐 {url}")
+    print("=" * 60)
+
+    # Her istek tek bir worker'a düşer; tüm worker'lar için birkaç kez çalıştırın
+    request = urllib.request.Request(url, headers={'X-Metrics-Token': os.environ.get('METRICS_TOKEN', '')})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            result = json.load(response)
+    except Exception as e:
+        print(f"❌ Kontrol isteği başarısız: {e}")
+        sys.exit(1)
+
+    print(f"⚙️  Worker pid {result['pid']}, son kurulumdan beri {result['built_seconds_ago']} sn")
+    for metric in METRICS:
+        print(f"🏆 {metric}: {result['sizes'][metric]} öğrenci, ilk 3: {result['top'][metric]}")
+
+    mismatches = result['mismatches']
+    if mismatches:
+        for m in mismatches:
+            print(f"⚠️  {m}")
+        print(f"❌ {len(mismatches)} uyuşmazlık bulundu.")
+        sys.exit(1)
+
+    print("✅ Bellekteki sıralama veritabanıyla tutarlı.")
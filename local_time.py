@@ -0,0 +1,32 @@
+"""
+Uygulamanın gün sınırı (STREAK_TIMEZONE)
+
+Streak'ler, tamamlamalar, dashboard / istatistik pencereleri ve önbellek anahtarları
+"bugün"ü aynı saat diliminde hesaplar; sunucunun saat dilimi (date.today()) kullanılmaz.
+Başka modül import etmez (sql_helper ve streaks buradan alır, döngüsel import olmaz).
+"""
+
+import os
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Gün dönümünün hesaplandığı saat dilimi
+STREAK_TIMEZONE = os.environ.get('STREAK_TIMEZONE', 'Europe/Istanbul')
+
+try:
+    LOCAL_TIMEZONE = ZoneInfo(STREAK_TIMEZONE)
+except ZoneInfoNotFoundError:
+    # Saat dilimi verisi tzdata paketiyle gelir (requirements.txt); sistemde tzdata olmayan
+    # imajlarda paket kurulmamışsa gün sınırı kayar
+    print(f"⚠️  Saat dilimi bulunamadı: {STREAK_TIMEZONE} - UTC kullanılıyor (pip install -r requirements.txt)")
+    LOCAL_TIMEZONE = timezone.utc
+
+
+def local_now():
+    """STREAK_TIMEZONE'a göre şu an"""
+    return datetime.now(LOCAL_TIMEZONE)
+
+
+def local_today():
+    """STREAK_TIMEZONE'a göre bugünün tarihi"""
+    return local_now().date()
@@ -0,0 +1,146 @@
+"""
+Basit, bağımlılıksız metrik toplayıcı
+Veritabanı bağlantı pool'unun yük altındaki davranışını ölçmek için sayaçlar ve
+histogramlar (bağlantı bekleme süresi, route bazında bağlantı tutma süresi,
+pool doluluğu) ve öğrenci önbelleği sayaçları. /internal/metrics endpoint'i üzerinden okunur.
+"""
+
+import threading
+
+# Histogram kovaları (milisaniye)
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Counter:
+    """Thread-safe sayaç"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Kümülatif olmayan kovalarla thread-safe histogram"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self._lock = threading.Lock()
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+            else:
+                self.counts[-1] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f'<={bound}' for bound in self.buckets] + [f'>{self.buckets[-1]}']
+            return {
+                'count': self.count,
+                'sum': round(self.total, 3),
+                'avg': round(self.total / self.count, 3) if self.count else 0,
+                'max': round(self.max, 3),
+                'buckets': dict(zip(labels, self.counts))
+            }
+
+
+class LabeledHistogram:
+    """Etiket (örn. route adı) başına ayrı histogram"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self._histograms = {}
+
+    def labels(self, label):
+        with self._lock:
+            histogram = self._histograms.get(label)
+            if histogram is None:
+                histogram = self._histograms[label] = Histogram(self._buckets)
+            return histogram
+
+    def observe(self, label, value):
+        self.labels(label).observe(value)
+
+    def snapshot(self):
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {label: histogram.snapshot() for label, histogram in sorted(histograms.items())}
+
+
+# Veritabanı bağlantı metrikleri
+db_checkout_wait_ms = Histogram()          # pool.getconn() bekleme süresi
+db_checkout_hold_ms = LabeledHistogram()   # bağlantının route bazında tutulma süresi
+db_checkouts = Counter()                   # başarılı bağlantı alma sayısı
+
+# Öğrenci önbelleği metrikleri (bkz. student_cache.py)
+cache_hits = Counter()
+cache_misses = Counter()
+cache_evictions = Counter()                # kapasite dolduğu için silinen girdiler
+cache_expirations = Counter()              # TTL'i dolduğu için düşen girdiler
+cache_invalidations = Counter()            # yazma sonrası öğrenci bazlı silmeler
+
+# O anki isteğin route etiketi (Flask before_request'te ayarlanır)
+_context = threading.local()
+
+
+def set_route(label):
+    _context.route = label
+
+
+def clear_route():
+    _context.route = None
+
+
+def current_route():
+    return getattr(_context, 'route', None) or '-'
+
+
+def snapshot(pool=None, cache=None):
+    """
+    Tüm metrikleri JSON'a uygun sözlük olarak döndür
+
+    pool verilirse anlık total/idle/in_use değerleri ile bekleme (waits) ve
+    tükenme (timeouts) sayaçları da eklenir. cache verilirse önbellek backend'inin
+    anlık doluluğu da eklenir.
+    """
+    data = {
+        'db': {
+            'checkouts': db_checkouts.snapshot(),
+            'checkout_wait_ms': db_checkout_wait_ms.snapshot(),
+            'checkout_hold_ms': db_checkout_hold_ms.snapshot()
+        }
+    }
+    if pool is not None:
+        data['db']['pool'] = pool.stats()
+
+    hits, misses = cache_hits.snapshot(), cache_misses.snapshot()
+    data['cache'] = {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / (hits + misses), 3) if hits + misses else 0,
+        'evictions': cache_evictions.snapshot(),
+        'expirations': cache_expirations.snapshot(),
+        'invalidations': cache_invalidations.snapshot()
+    }
+    if cache is not None:
+        data['cache'].update(cache.stats())
+    return data
@@ -0,0 +1,581 @@
+"""
+Versiyonlu şema migration'ları (PostgreSQL ve SQLite)
+
+Şema değişiklikleri MIGRATIONS listesinde sıralı ve numaralıdır; uygulananlar
+schema_version tablosuna yazılır:
+- init_db() açılışta sadece en yüksek uygulanmış versiyonu okur (tek sorgu); şema
+  günceldeyse hiçbir DDL veya information_schema sorgusu çalışmaz
+- Bekleyen migration'lar sırayla, her biri kendi transaction'ında uygulanır
+- Her migration idempotenttir (IF NOT EXISTS, eksik kolon kontrolü): schema_version
+  tablosu olmayan mevcut veritabanlarında hepsi baştan güvenle çalışır
+- PostgreSQL'de aynı anda açılan süreçler her migration'da transaction seviyesindeki
+  advisory lock ile sıraya girer (transaction pooler ile de güvenli)
+
+Yeni şema değişikliği: fonksiyonu yazıp MIGRATIONS'ın SONUNA yeni numarayla ekleyin.
+Uygulanmış migration'ları değiştirmeyin (mevcut veritabanlarında tekrar çalışmazlar).
+
+Kullanım:
+    python migrations.py            # bekleyen migration'ları uygula
+    python migrations.py --status   # mevcut versiyon ve bekleyen migration'lar
+"""
+
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database import USE_SUPABASE, get_direct_db
+from sql_helper import adapt_query
+
+
+SCHEMA_VERSION_TABLE = '''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+# pg_advisory_xact_lock anahtarı (aynı anda tek süreç migration çalıştırır)
+MIGRATION_LOCK_ID = 810_025
+
+
+def _create_tables(conn):
+    """Temel tablolar"""
+    c = conn.cursor()
+    if USE_SUPABASE:
+        _create_tables_postgres(c)
+    else:
+        _create_tables_sqlite(c)
+
+
+def _create_tables_postgres(c):
+    """PostgreSQL tabloları"""
+    # Öğrenciler tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            id SERIAL PRIMARY KEY,
+            username VARCHAR(255) UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            full_name VARCHAR(255) NOT NULL,
+            email VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_admin BOOLEAN DEFAULT FALSE
+        )
+    ''')
+
+    # Çalışma kayıtları tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS study_sessions (
+            id SERIAL PRIMARY KEY,
+            student_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            subject VARCHAR(255) NOT NULL,
+            hours REAL NOT NULL,
+            efficiency INTEGER NOT NULL,
+            notes TEXT,
+            difficulties TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Sınav sonuçları tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS exam_results (
+            id SERIAL PRIMARY KEY,
+            student_id INTEGER NOT NULL,
+            exam_name VARCHAR(255) NOT NULL,
+            score REAL NOT NULL,
+            max_score REAL DEFAULT 100,
+            exam_date DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Ders programları tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schedules (
+            id SERIAL PRIMARY KEY,
+            student_id INTEGER NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Ders programı öğeleri tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schedule_items (
+            id SERIAL PRIMARY KEY,
+            schedule_id INTEGER NOT NULL,
+            day_of_week INTEGER NOT NULL CHECK (day_of_week >= 0 AND day_of_week <= 6),
+            start_time TIME NOT NULL,
+            end_time TIME NOT NULL,
+            subject VARCHAR(255) NOT NULL,
+            location VARCHAR(255),
+            instructor VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (schedule_id) REFERENCES schedules (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Ders programı tamamlama durumları tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schedule_completions (
+            id SERIAL PRIMARY KEY,
+            schedule_item_id INTEGER NOT NULL,
+            completion_date DATE NOT NULL,
+            is_completed BOOLEAN DEFAULT FALSE,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (schedule_item_id) REFERENCES schedule_items (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Öğrenci günlük özet tablosu (study_sessions'tan artımlı güncellenir)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS student_daily_stats (
+            student_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            total_hours REAL NOT NULL DEFAULT 0,
+            session_count INTEGER NOT NULL DEFAULT 0,
+            efficiency_sum INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (student_id, date),
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )
+    ''')
+
+
+def _create_tables_sqlite(c):
+    """SQLite tabloları"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            email TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_admin INTEGER DEFAULT 0
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS study_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            subject TEXT NOT NULL,
+            hours REAL NOT NULL,
+            efficiency INTEGER NOT NULL,
+            notes TEXT,
+            difficulties TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS exam_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            exam_name TEXT NOT NULL,
+            score REAL NOT NULL,
+            max_score REAL DEFAULT 100,
+            exam_date DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Ders programları tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Ders programı öğeleri tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schedule_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            schedule_id INTEGER NOT NULL,
+            day_of_week INTEGER NOT NULL CHECK (day_of_week >= 0 AND day_of_week <= 6),
+            start_time TIME NOT NULL,
+            end_time TIME NOT NULL,
+            subject TEXT NOT NULL,
+            location TEXT,
+            instructor TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (schedule_id) REFERENCES schedules (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Ders programı tamamlama durumları tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schedule_completions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            schedule_item_id INTEGER NOT NULL,
+            completion_date DATE NOT NULL,
+            is_completed INTEGER DEFAULT 0,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (schedule_item_id) REFERENCES schedule_items (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Öğrenci günlük özet tablosu (study_sessions'tan artımlı güncellenir)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS student_daily_stats (
+            student_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            total_hours REAL NOT NULL DEFAULT 0,
+            session_count INTEGER NOT NULL DEFAULT 0,
+            efficiency_sum INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (student_id, date),
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )
+    ''')
+
+
+# SQLite'ta ON DELETE CASCADE olması gereken tablolar
+SQLITE_CASCADE_TABLES = ('study_sessions', 'exam_results', 'schedules', 'schedule_items', 'schedule_completions')
+
+
+def _ensure_sqlite_cascades(conn):
+    """
+    Eski SQLite şemalarındaki foreign key'leri ON DELETE CASCADE ile yeniden kur
+    
+    SQLite foreign key tanımını değiştirmeye izin vermediği için tablo yeni tanımla
+    oluşturulup veriler kopyalanır (veri silinmez, id'ler korunur). PostgreSQL'de işlem yapmaz.
+    """
+    import re
+    
+    if USE_SUPABASE:
+        return
+    
+    c = conn.cursor()
+    tables = []
+    for table in SQLITE_CASCADE_TABLES:
+        c.execute(f'PRAGMA foreign_key_list({table})')
+        if any(row['on_delete'].upper() != 'CASCADE' for row in c.fetchall()):
+            tables.append(table)
+    if not tables:
+        return
+    
+    # foreign_keys transaction içinde değiştirilemez
+    conn.commit()
+    conn.execute('PRAGMA foreign_keys=OFF')
+    try:
+        for table in tables:
+            c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            table_sql = c.fetchone()['sql']
+            c.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                      (table,))
+            index_sqls = [row['sql'] for row in c.fetchall()]
+            
+            new_sql = re.sub(r'(REFERENCES\s+\w+\s*\(\s*\w+\s*\))(?!\s*ON\s+DELETE)',
+                             r'\1 ON DELETE CASCADE', table_sql, flags=re.IGNORECASE)
+            new_sql = re.sub(r'^\s*CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?"?\w+"?',
+                             f'CREATE TABLE {table}_new', new_sql, flags=re.IGNORECASE)
+            
+            c.execute(new_sql)
+            c.execute(f'INSERT INTO {table}_new SELECT * FROM {table}')
+            c.execute(f'DROP TABLE {table}')
+            c.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+            for index_sql in index_sqls:
+                c.execute(index_sql)
+        
+        c.execute('PRAGMA foreign_key_check')
+        orphans = len(c.fetchall())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute('PRAGMA foreign_keys=ON')
+    
+    print(f"✅ SQLite foreign key'lerine ON DELETE CASCADE eklendi: {', '.join(tables)}")
+    if orphans:
+        print(f"⚠️  Silinmiş kayıtlara bağlı {orphans} yetim satır var (silinmedi)")
+
+
+def _backfill_daily_stats(conn):
+    """student_daily_stats boşsa ve çalışma kaydı varsa tabloyu doldur (sadece ilk kurulumda)"""
+    c = conn.cursor()
+    c.execute('SELECT 1 FROM student_daily_stats LIMIT 1')
+    if c.fetchone():
+        return
+    c.execute('SELECT 1 FROM study_sessions LIMIT 1')
+    if not c.fetchone():
+        return
+    
+    from rollups import rebuild_daily_stats
+    count = rebuild_daily_stats(conn)
+    print(f"✅ Günlük özet tablosu dolduruldu ({count} satır)")
+
+
+# İndex'ler sıcak sorguların şekline göre: öğrenciye ait tablolar student_id ile filtrelenip
+# tarih / created_at ile sıralanır. (ad, tablo, kolonlar) - iki veritabanında da aynı
+# Kontrol: python check_indexes.py (kayıtlı sorguların planında tam tablo taraması olmamalı)
+# Yeni index eklemek için listeyi değiştirmek yetmez: yeni bir migration ekleyin
+TABLE_INDEXES = (
+    # Dashboard son kayıtlar, istatistik ders toplamları, geçmiş sayfalama (bkz. student_history.py)
+    ('idx_study_sessions_student_history', 'study_sessions', 'student_id, date DESC, created_at DESC, id DESC'),
+    ('idx_study_sessions_date', 'study_sessions', 'date'),
+    # Dashboard sınavları, hedef hesaplama, geçmiş sayfalama (PostgreSQL'de tarihsizler sonda)
+    ('idx_exam_results_student_history', 'exam_results',
+     'student_id, exam_date DESC' + (' NULLS LAST' if USE_SUPABASE else '') + ', created_at DESC, id DESC'),
+    # Tüm öğrencilerin sınavlarını tarih aralığıyla dışa aktarma (bkz. exports.py)
+    ('idx_exam_results_date', 'exam_results', 'exam_date'),
+    # Öğrencinin en son programı (ORDER BY created_at DESC LIMIT 1)
+    ('idx_schedules_student_created', 'schedules', 'student_id, created_at DESC'),
+    ('idx_schedule_items_schedule_id', 'schedule_items', 'schedule_id'),
+    ('idx_schedule_completions_date', 'schedule_completions', 'completion_date'),
+)
+
+
+# Bileşik index'lerin ön eki olduğu için artık gereksiz olan eski index'ler (her yazmada bakım maliyeti)
+REDUNDANT_INDEXES = (
+    'idx_study_sessions_student_id',     # -> idx_study_sessions_student_history
+    'idx_exam_results_student_id',       # -> idx_exam_results_student_history
+    'idx_schedules_student_id',          # -> idx_schedules_student_created
+    'idx_schedule_completions_item_id',  # -> idx_schedule_completions_item_date (unique)
+)
+
+
+def _ensure_indexes(conn):
+    """TABLE_INDEXES'i oluştur, gereksiz kalan eski index'leri kaldır"""
+    c = conn.cursor()
+    for name, table, columns in TABLE_INDEXES:
+        c.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})')
+    for name in REDUNDANT_INDEXES:
+        c.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def _ensure_completion_unique_index(conn):
+    """
+    Bir öğe için gün başına tek tamamlama kaydı (schedule_item_id, completion_date)
+    Index yoksa önce eski çift kayıtlardan en yenisi bırakılır, sonra unique index kurulur.
+    Tamamlama yazmaları bu index'e ON CONFLICT ile upsert yapar (bkz. queries.COMPLETION_UPSERT).
+    """
+    c = conn.cursor()
+    if USE_SUPABASE:
+        c.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'idx_schedule_completions_item_date'")
+    else:
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_schedule_completions_item_date'")
+    if c.fetchone():
+        return
+    
+    c.execute('''
+        DELETE FROM schedule_completions
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM schedule_completions
+            GROUP BY schedule_item_id, completion_date
+        )
+    ''')
+    removed = c.rowcount
+    c.execute('CREATE UNIQUE INDEX idx_schedule_completions_item_date ON schedule_completions(schedule_item_id, completion_date)')
+    print(f"✅ Tamamlama kayıtları için unique index oluşturuldu ({max(removed, 0)} çift kayıt silindi)")
+
+
+# students tablosundaki denormalize toplam sayaçlar
+STUDENT_COUNTER_COLUMNS = {
+    'total_sessions': 'INTEGER DEFAULT 0',
+    'total_hours': 'REAL DEFAULT 0',
+    'efficiency_sum': 'INTEGER DEFAULT 0',
+    'study_days': 'INTEGER DEFAULT 0',
+}
+
+
+# students tablosundaki streak kolonları (eski veritabanlarında eksik olabilir)
+STUDENT_STREAK_COLUMNS = {
+    'current_streak': 'INTEGER DEFAULT 0',
+    'longest_streak': 'INTEGER DEFAULT 0',
+    'last_study_date': 'DATE',
+}
+
+
+# HTTP önbellekleme için öğrenci veri sürümü (bkz. http_cache.py)
+STUDENT_VERSION_COLUMNS = {
+    'data_version': 'INTEGER DEFAULT 0',
+    'data_updated_at': 'TIMESTAMP',
+}
+
+
+def _add_missing_student_columns(conn, columns):
+    """students tablosunda olmayan kolonları ekle, eklenenleri döndür"""
+    c = conn.cursor()
+    
+    if USE_SUPABASE:
+        c.execute("SELECT column_name FROM information_schema.columns WHERE table_name = 'students'")
+        existing = {row[0] for row in c.fetchall()}
+    else:
+        c.execute("PRAGMA table_info(students)")
+        existing = {row[1] for row in c.fetchall()}
+    
+    missing = [name for name in columns if name not in existing]
+    for name in missing:
+        c.execute(f'ALTER TABLE students ADD COLUMN {name} {columns[name]}')
+    return missing
+
+
+def _ensure_student_counters(conn):
+    """Sayaç kolonlarını ekle (yoksa), yeni eklendiyse mevcut veriden doldur"""
+    if not _add_missing_student_columns(conn, STUDENT_COUNTER_COLUMNS):
+        return
+    
+    from rollups import reconcile_student_totals
+    fixed = reconcile_student_totals(conn, fix=True)
+    print(f"✅ Öğrenci sayaç kolonları eklendi ({len(fixed)} öğrenci dolduruldu)")
+
+
+def _ensure_student_streak_columns(conn):
+    """
+    Streak kolonları (eski add_streak_columns.py / migrate_sqlite.py)
+    Yeni eklendiyse çalışma günlerinden hesaplanır: artımlı güncelleme (apply_study_date)
+    saklanan değere güvendiği için boş bırakılırsa geriye dönük kayıtlar streak'i bozar.
+    """
+    if not _add_missing_student_columns(conn, STUDENT_STREAK_COLUMNS):
+        return
+    
+    from db_utils import get_cursor
+    from streaks import recompute_streaks
+    changed = recompute_streaks(get_cursor(conn))
+    print(f"✅ Öğrenci streak kolonları eklendi ({len(changed)} öğrenci dolduruldu)")
+
+
+def _ensure_student_version_columns(conn):
+    """HTTP önbellekleme için veri sürümü kolonları"""
+    if _add_missing_student_columns(conn, STUDENT_VERSION_COLUMNS):
+        print("✅ Öğrenci veri sürümü kolonları eklendi")
+
+
+def _create_default_admin(conn):
+    """Varsayılan admin kullanıcısı (yoksa)"""
+    from werkzeug.security import generate_password_hash
+    
+    c = conn.cursor()
+    c.execute(adapt_query('SELECT id FROM students WHERE username = ?'), ('admin',))
+    if c.fetchone():
+        return
+    c.execute(adapt_query('''
+        INSERT INTO students (username, password, full_name, email, is_admin)
+        VALUES (?, ?, ?, ?, ?)
+    '''), ('admin', generate_password_hash('admin123'), 'Admin Kullanıcı', 'admin@example.com',
+          True if USE_SUPABASE else 1))
+    print("✅ Varsayılan admin kullanıcısı oluşturuldu (username: admin, password: admin123)")
+
+
+# (versiyon, ad, fonksiyon) - sadece sona ekleyin
+MIGRATIONS = (
+    (1, 'create_tables', _create_tables),
+    (2, 'sqlite_cascades', _ensure_sqlite_cascades),
+    (3, 'completion_unique_index', _ensure_completion_unique_index),
+    (4, 'indexes', _ensure_indexes),
+    (5, 'daily_stats_backfill', _backfill_daily_stats),
+    (6, 'student_version_columns', _ensure_student_version_columns),
+    # Streak hesaplaması günlük özete (5) ve data_version'a (6) dayanır
+    (7, 'student_streak_columns', _ensure_student_streak_columns),
+    (8, 'student_counters', _ensure_student_counters),
+    (9, 'default_admin', _create_default_admin),
+    # TABLE_INDEXES'e sonradan eklenen index'ler (idempotent, mevcutlar atlanır)
+    (10, 'exam_results_date_index', _ensure_indexes),
+)
+
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    """Uygulanmış en yüksek migration versiyonu (schema_version tablosu yoksa 0)"""
+    if USE_SUPABASE:
+        from psycopg2 import ProgrammingError as MissingTable
+    else:
+        from sqlite3 import OperationalError as MissingTable
+    
+    c = conn.cursor()
+    try:
+        c.execute('SELECT MAX(version) FROM schema_version')
+    except MissingTable:
+        conn.rollback()
+        return 0
+    return c.fetchone()[0] or 0
+
+
+def _lock(c):
+    """
+    Migration kilidini al (PostgreSQL). Transaction seviyesindedir: commit / rollback ile
+    bırakılır, transaction modundaki pooler'da (port 6543) oturum değişse de asılı kalmaz.
+    """
+    if USE_SUPABASE:
+        c.execute('SELECT pg_advisory_xact_lock(%s)', (MIGRATION_LOCK_ID,))
+
+
+def migrate(conn):
+    """
+    Bekleyen migration'ları sırayla uygula (her biri kilitli, ayrı bir transaction)
+    
+    Returns:
+        list: Uygulanan versiyonlar
+    """
+    c = conn.cursor()
+    _lock(c)
+    c.execute(SCHEMA_VERSION_TABLE)
+    conn.commit()
+    
+    applied = []
+    for number, name, migration in MIGRATIONS:
+        try:
+            _lock(c)
+            # Kilit beklenirken başka bir süreç uygulamış olabilir
+            c.execute('SELECT MAX(version) FROM schema_version')
+            if (c.fetchone()[0] or 0) >= number:
+                conn.rollback()
+                continue
+            
+            migration(conn)
+            c.execute(adapt_query('INSERT INTO schema_version (version, name) VALUES (?, ?)'), (number, name))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            print(f"❌ Migration {number} ({name}) uygulanamadı")
+            raise
+        print(f"✅ Migration {number}: {name}")
+        applied.append(number)
+    return applied
+
+
+def main(argv):
+    with get_direct_db() as conn:
+        version = current_version(conn)
+        pending = [(number, name) for number, name, _ in MIGRATIONS if number > version]
+        print(f"📋 Şema versiyonu: {version} (son: {LATEST_VERSION})")
+        
+        if '--status' in argv:
+            for number, name in pending:
+                print(f"⏳ {number}: {name}")
+            return 0
+        
+        if not pending:
+            print("✅ Şema güncel")
+            return 0
+        migrate(conn)
+    print("✅ Tüm migration'lar uygulandı")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,205 @@
+"""
+Sık çalışan (istek başına) sorgular
+Import sırasında aktif veritabanı için bir kez adapte edilip sql_helper kayıt
+defterine eklenir; route'lar hazır SQL metnini doğrudan kullanır.
+"""
+
+from database import USE_SUPABASE
+from sql_helper import adapt_query, register_query
+
+# Çalışma kayıtları
+STUDY_INSERT = register_query('study.insert', '''
+    INSERT INTO study_sessions (student_id, date, subject, hours, efficiency, notes, difficulties)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+''')
+
+STUDY_SELECT_FOR_WRITE = register_query('study.select_for_write', '''
+    SELECT student_id, date, hours, efficiency FROM study_sessions WHERE id = ?
+''')
+
+# Öğrencinin veri sürümüyle birlikte (ETag için, bkz. http_cache.py)
+STUDY_SELECT = register_query('study.select', '''
+    SELECT ss.*, s.data_version, s.data_updated_at
+    FROM study_sessions ss
+    LEFT JOIN students s ON s.id = ss.student_id
+    WHERE ss.id = ?
+''')
+
+STUDY_UPDATE = register_query('study.update', '''
+    UPDATE study_sessions
+    SET date = ?, subject = ?, hours = ?, efficiency = ?, notes = ?, difficulties = ?
+    WHERE id = ? AND student_id = ?
+''')
+
+STUDY_DELETE = register_query('study.delete', '''
+    DELETE FROM study_sessions WHERE id = ? AND student_id = ?
+''')
+
+# Sınav sonuçları
+EXAM_INSERT = register_query('exam.insert', '''
+    INSERT INTO exam_results (student_id, exam_name, score, max_score, exam_date)
+    VALUES (?, ?, ?, ?, ?)
+''')
+
+EXAM_SELECT_OWNER = register_query('exam.select_owner', '''
+    SELECT student_id FROM exam_results WHERE id = ?
+''')
+
+EXAM_DELETE = register_query('exam.delete', '''
+    DELETE FROM exam_results WHERE id = ? AND student_id = ?
+''')
+
+# İstatistik API - tek sorguda dönem grupları (saat + verimlilik) ve ders toplamları
+# Parametreler: student_id, from, to (gruplar için), student_id, from, to (dersler için)
+if USE_SUPABASE:
+    STATS_BUCKET_EXPRESSIONS = {
+        'day': "to_char(date, 'YYYY-MM-DD')",
+        'week': "to_char(date_trunc('week', date), 'YYYY-MM-DD')",
+        'month': "to_char(date_trunc('month', date), 'YYYY-MM-DD')",
+    }
+else:
+    STATS_BUCKET_EXPRESSIONS = {
+        'day': "date",
+        'week': "date(date, 'weekday 0', '-6 days')",   # haftanın pazartesi günü
+        'month': "date(date, 'start of month')",
+    }
+
+STATS_BY_BUCKET = {
+    bucket: register_query(f'stats.{bucket}', f'''
+        SELECT 'bucket' AS kind, {expression} AS label,
+               SUM(total_hours) AS hours,
+               SUM(efficiency_sum) * 1.0 / SUM(session_count) AS efficiency
+        FROM student_daily_stats
+        WHERE student_id = ? AND date >= ? AND date <= ?
+        GROUP BY {expression}
+        UNION ALL
+        SELECT kind, label, hours, efficiency FROM (
+            SELECT 'subject' AS kind, subject AS label, SUM(hours) AS hours, CAST(NULL AS REAL) AS efficiency
+            FROM study_sessions
+            WHERE student_id = ? AND date >= ? AND date <= ?
+            GROUP BY subject
+            ORDER BY SUM(hours) DESC
+            LIMIT 10
+        ) subjects
+    ''')
+    for bucket, expression in STATS_BUCKET_EXPRESSIONS.items()
+}
+
+EXAM_SCORES = register_query('exam.scores', '''
+    SELECT score, max_score FROM exam_results
+    WHERE student_id = ?
+    ORDER BY exam_date DESC, created_at DESC
+''')
+
+# Ders programları
+SCHEDULE_LIST = register_query('schedule.list', '''
+    SELECT * FROM schedules
+    WHERE student_id = ?
+    ORDER BY created_at DESC
+''')
+
+# Öğrencinin aktif (en son oluşturulan) programı
+SCHEDULE_LATEST = register_query('schedule.latest', '''
+    SELECT * FROM schedules WHERE student_id = ? ORDER BY created_at DESC LIMIT 1
+''')
+
+# Programın öğeleri (gün ve saat sırasıyla)
+SCHEDULE_ITEMS = register_query('schedule.items', '''
+    SELECT * FROM schedule_items
+    WHERE schedule_id = ?
+    ORDER BY day_of_week, start_time
+''')
+
+# Programın öğelerinin tarih aralığındaki tamamlamaları
+# Parametreler: schedule_id, başlangıç, bitiş
+SCHEDULE_COMPLETIONS_RANGE = register_query('schedule.completions_range', '''
+    SELECT sc.* FROM schedule_completions sc
+    JOIN schedule_items si ON si.id = sc.schedule_item_id
+    WHERE si.schedule_id = ? AND sc.completion_date >= ? AND sc.completion_date <= ?
+    ORDER BY sc.schedule_item_id, sc.completion_date DESC
+''')
+
+# Ders programı tamamlama - tek ifadede sahiplik kontrolü + upsert
+# (schedule_item_id, completion_date) unique index'i gerekir (bkz. migrations.py)
+# Parametreler: completion_date, is_completed, notes, item_id, student_id
+_COMPLETION_DATE_PARAM = 'CAST(? AS DATE)' if USE_SUPABASE else '?'
+
+COMPLETION_UPSERT = register_query('completion.upsert', f'''
+    INSERT INTO schedule_completions (schedule_item_id, completion_date, is_completed, notes)
+    SELECT si.id, {_COMPLETION_DATE_PARAM}, ?, ?
+    FROM schedule_items si
+    JOIN schedules s ON s.id = si.schedule_id
+    WHERE si.id = ? AND s.student_id = ?
+    ON CONFLICT (schedule_item_id, completion_date)
+    DO UPDATE SET is_completed = excluded.is_completed, notes = excluded.notes
+''')
+
+COMPLETION_ITEM_OWNER = register_query('completion.item_owner', '''
+    SELECT s.student_id
+    FROM schedule_items si
+    JOIN schedules s ON si.schedule_id = s.id
+    WHERE si.id = ?
+''')
+
+
+def completion_owned_items_query(count):
+    """
+    Toplu tamamlama: verilen öğelerden öğrenciye ait olanlar (IN listesi count elemanlı)
+    Parametreler: student_id, item_id...
+    """
+    placeholders = ', '.join('?' * count)
+    return adapt_query(f'''
+        SELECT si.id
+        FROM schedule_items si
+        JOIN schedules s ON si.schedule_id = s.id
+        WHERE s.student_id = ? AND si.id IN ({placeholders})
+    ''')
+
+# Admin öğrenci listesi: sıralama adı -> ORDER BY ifadesi (sadece bu ifadeler SQL'e girer)
+ADMIN_SORT_COLUMNS = {
+    'name': 'full_name',
+    'username': 'username',
+    'hours': 'COALESCE(total_hours, 0)',
+    'sessions': 'COALESCE(total_sessions, 0)',
+    'efficiency': 'COALESCE(efficiency_sum * 1.0 / NULLIF(total_sessions, 0), 0)',
+    'days': 'COALESCE(study_days, 0)',
+    'streak': 'COALESCE(current_streak, 0)',
+    'created': 'created_at',
+}
+
+def admin_student_list_queries(sort, order, search):
+    """
+    Admin öğrenci listesi sorguları: (toplam sayı, sayfa + sınav ortalamaları)
+    Parametreler: arama varsa desen x3; sayfa sorgusu için ek olarak limit, offset
+    """
+    conditions = ['is_admin = FALSE' if USE_SUPABASE else 'is_admin = 0']
+    if search:
+        conditions.append('(LOWER(full_name) LIKE ? OR LOWER(username) LIKE ? OR LOWER(email) LIKE ?)')
+    where_clause = ' AND '.join(conditions)
+    order_clause = f'{ADMIN_SORT_COLUMNS[sort]} {order.upper()}, id ASC'
+
+    count_query = adapt_query(f'SELECT COUNT(*) as total FROM students WHERE {where_clause}')
+    # Sınav ortalaması yalnızca sayfadaki öğrenciler için gruplanır
+    page_query = adapt_query(f'''
+        WITH page AS (
+            SELECT * FROM students
+            WHERE {where_clause}
+            ORDER BY {order_clause}
+            LIMIT ? OFFSET ?
+        )
+        SELECT page.*, ex.avg_percentage
+        FROM page
+        LEFT JOIN (
+            SELECT student_id, AVG(score * 100.0 / max_score) as avg_percentage
+            FROM exam_results
+            WHERE student_id IN (SELECT id FROM page)
+            GROUP BY student_id
+        ) ex ON ex.student_id = page.id
+        ORDER BY {order_clause}
+    ''')
+    return count_query, page_query
+
+# Giriş
+STUDENT_BY_USERNAME = register_query('student.by_username', '''
+    SELECT * FROM students WHERE username = ?
+''')
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Öğrenci günlük özet tablosu (student_daily_stats) ve students tablosundaki
+toplam sayaçlar (total_sessions, total_hours, efficiency_sum, study_days)
+Çalışma kayıtları yazılırken aynı transaction içinde artımlı olarak güncellenir,
+böylece okuma tarafı ham study_sessions satırlarını tekrar toplamak zorunda kalmaz.
+
+Kullanım:
+    python rollups.py rebuild [student_id]   # günlük özeti ham veriden yeniden oluştur
+    python rollups.py reconcile              # sayaçları ham veriyle karşılaştır
+    python rollups.py reconcile --fix        # farklı olan sayaçları düzelt
+"""
+
+import sys
+
+from database import get_db
+from db_utils import get_cursor
+from sql_helper import adapt_query, execute_query, register_query
+
+# Saat toplamlarında kayan nokta farkı toleransı
+HOURS_TOLERANCE = 1e-6
+
+DAILY_STATS_UPSERT = register_query('rollups.daily_upsert', '''
+    INSERT INTO student_daily_stats (student_id, date, total_hours, session_count, efficiency_sum)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (student_id, date) DO UPDATE SET
+        total_hours = student_daily_stats.total_hours + excluded.total_hours,
+        session_count = student_daily_stats.session_count + excluded.session_count,
+        efficiency_sum = student_daily_stats.efficiency_sum + excluded.efficiency_sum
+''')
+
+DAILY_STATS_DELETE_EMPTY = register_query('rollups.daily_delete_empty', '''
+    DELETE FROM student_daily_stats
+    WHERE student_id = ? AND date = ? AND session_count <= 0
+''')
+
+# study_days özet tablosundan sayılır (O(gün))
+STUDENT_COUNTERS_UPDATE = register_query('rollups.student_counters', '''
+    UPDATE students
+    SET total_sessions = COALESCE(total_sessions, 0) + ?,
+        total_hours = COALESCE(total_hours, 0) + ?,
+        efficiency_sum = COALESCE(efficiency_sum, 0) + ?,
+        study_days = (SELECT COUNT(*) FROM student_daily_stats WHERE student_id = ?)
+    WHERE id = ?
+''')
+
+
+def _apply_delta(c, student_id, study_date, hours, session_count, efficiency_sum):
+    """Günlük özet satırına farkı uygula (yoksa oluştur), boşalan günü sil"""
+    execute_query(c, DAILY_STATS_UPSERT, (student_id, study_date, hours, session_count, efficiency_sum))
+
+    if session_count < 0:
+        execute_query(c, DAILY_STATS_DELETE_EMPTY, (student_id, study_date))
+
+    # Öğrenci satırındaki toplam sayaçlar
+    execute_query(c, STUDENT_COUNTERS_UPDATE, (session_count, hours, efficiency_sum, student_id, student_id))
+
+
+def record_study_added(c, student_id, study_date, hours, efficiency):
+    """Yeni çalışma kaydını günlük özete ekle"""
+    _apply_delta(c, student_id, study_date, hours, 1, efficiency)
+
+
+def record_study_removed(c, student_id, study_date, hours, efficiency):
+    """Silinen çalışma kaydını günlük özetten düş"""
+    _apply_delta(c, student_id, study_date, -hours, -1, -efficiency)
+
+
+def record_study_updated(c, student_id, old_record, study_date, hours, efficiency):
+    """Güncellenen çalışma kaydı - eski değerleri düş, yenileri ekle"""
+    record_study_removed(c, student_id, old_record['date'], old_record['hours'], old_record['efficiency'])
+    record_study_added(c, student_id, study_date, hours, efficiency)
+
+
+def rebuild_daily_stats(conn, student_id=None):
+    """
+    Günlük özeti study_sessions tablosundan yeniden oluştur
+    student_id verilirse sadece o öğrenci, verilmezse tüm tablo
+    """
+    c = conn.cursor()
+
+    if student_id is None:
+        c.execute('DELETE FROM student_daily_stats')
+        # Silinmiş öğrencilere ait (yetim) kayıtlar özete alınmaz
+        c.execute('''
+            INSERT INTO student_daily_stats (student_id, date, total_hours, session_count, efficiency_sum)
+            SELECT student_id, date, SUM(hours), COUNT(*), SUM(efficiency)
+            FROM study_sessions
+            WHERE student_id IN (SELECT id FROM students)
+            GROUP BY student_id, date
+        ''')
+    else:
+        c.execute(adapt_query('DELETE FROM student_daily_stats WHERE student_id = ?'), (student_id,))
+        query = adapt_query('''
+            INSERT INTO student_daily_stats (student_id, date, total_hours, session_count, efficiency_sum)
+            SELECT student_id, date, SUM(hours), COUNT(*), SUM(efficiency)
+            FROM study_sessions
+            WHERE student_id = ?
+            GROUP BY student_id, date
+        ''')
+        c.execute(query, (student_id,))
+
+    return c.rowcount
+
+
+def reconcile_student_totals(conn, fix=False):
+    """
+    students tablosundaki toplam sayaçları study_sessions ile karşılaştır
+
+    Args:
+        fix: True ise farklı olan sayaçları doğru değerlerle güncelle
+
+    Returns:
+        list: Uyuşmayan öğrenciler [{'student_id', 'stored', 'expected'}]
+    """
+    c = get_cursor(conn)
+    c.execute('''
+        SELECT
+            s.id,
+            s.total_sessions,
+            s.total_hours,
+            s.efficiency_sum,
+            s.study_days,
+            COALESCE(agg.total_sessions, 0) as expected_sessions,
+            COALESCE(agg.total_hours, 0) as expected_hours,
+            COALESCE(agg.efficiency_sum, 0) as expected_efficiency_sum,
+            COALESCE(agg.study_days, 0) as expected_study_days
+        FROM students s
+        LEFT JOIN (
+            SELECT
+                student_id,
+                COUNT(*) as total_sessions,
+                SUM(hours) as total_hours,
+                SUM(efficiency) as efficiency_sum,
+                COUNT(DISTINCT date) as study_days
+            FROM study_sessions
+            GROUP BY student_id
+        ) agg ON agg.student_id = s.id
+    ''')
+
+    mismatches = []
+    for row in c.fetchall():
+        stored = (row['total_sessions'] or 0, row['total_hours'] or 0,
+                  row['efficiency_sum'] or 0, row['study_days'] or 0)
+        expected = (row['expected_sessions'], float(row['expected_hours']),
+                    row['expected_efficiency_sum'], row['expected_study_days'])
+
+        if (stored[0] != expected[0] or abs(stored[1] - expected[1]) > HOURS_TOLERANCE
+                or stored[2] != expected[2] or stored[3] != expected[3]):
+            mismatches.append({'student_id': row['id'], 'stored': stored, 'expected': expected})
+
+    if fix and mismatches:
+        query = adapt_query('''
+            UPDATE students
+            SET total_sessions = ?, total_hours = ?, efficiency_sum = ?, study_days = ?
+            WHERE id = ?
+        ''')
+        c.executemany(query, [m['expected'] + (m['student_id'],) for m in mismatches])
+
+    return mismatches
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if command == 'rebuild':
+        target = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+        print("=" * 60)
+        print("📊 Günlük özet tablosu yeniden oluşturuluyor...")
+        print("=" * 60)
+
+        with get_db() as conn:
+            count = rebuild_daily_stats(conn, target)
+
+        print(f"✅ {count} günlük özet satırı yazıldı.")
+
+    elif command == 'reconcile':
+        fix = '--fix' in sys.argv
+
+        print("=" * 60)
+        print("🔍 Öğrenci toplam sayaçları kontrol ediliyor...")
+        print("=" * 60)
+
+        with get_db() as conn:
+            mismatches = reconcile_student_totals(conn, fix=fix)
+
+        for m in mismatches:
+            print(f"⚠️  Öğrenci {m['student_id']}: kayıtlı={m['stored']} beklenen={m['expected']}")
+
+        if not mismatches:
+            print("✅ Tüm sayaçlar tutarlı.")
+        elif fix:
+            print(f"✅ {len(mismatches)} öğrencinin sayaçları düzeltildi.")
+        else:
+            print(f"❌ {len(mismatches)} öğrencide tutarsızlık var. Düzeltmek için: python rollups.py reconcile --fix")
+            sys.exit(1)
+
+    else:
+        print("Kullanım: python rollups.py rebuild [student_id] | reconcile [--fix]")
+        sys.exit(1)
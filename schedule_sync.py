@@ -0,0 +1,134 @@
+"""
+Ders programı öğelerini fark bazlı güncelleme
+
+Programı kaydederken tüm öğeleri silip yeniden eklemek yerine gelen liste mevcut
+öğelerle eşleştirilir ve sadece gereken INSERT / UPDATE / DELETE'ler yapılır:
+- Gelen öğede bu programa ait bir id varsa o öğeyle eşleşir
+- id yoksa (gün, başlangıç, bitiş, ders) aynı olan eşleşmemiş bir öğeyle eşleşir
+- Eşleşen öğe değişmişse UPDATE, değişmemişse dokunulmaz (id ve tamamlama geçmişi korunur)
+- Eşleşmeyen gelen öğeler eklenir, eşleşmeyen mevcut öğeler silinir
+
+Yazmalar çağıranın transaction'ı içinde yapılır; commit route'a aittir.
+"""
+
+from db_utils import insert_many, execute_many
+from sql_helper import adapt_query, execute_query, register_query
+
+# Karşılaştırılan / yazılan öğe alanları
+SCHEDULE_ITEM_FIELDS = ('day_of_week', 'start_time', 'end_time', 'subject', 'location', 'instructor')
+
+_SELECT_ITEMS = register_query('schedule.sync_items', '''
+    SELECT id, day_of_week, start_time, end_time, subject, location, instructor
+    FROM schedule_items
+    WHERE schedule_id = ?
+''')
+
+_UPDATE_ITEM = register_query('schedule.sync_update', '''
+    UPDATE schedule_items
+    SET day_of_week = ?, start_time = ?, end_time = ?, subject = ?, location = ?, instructor = ?
+    WHERE id = ? AND schedule_id = ?
+''')
+
+
+
+def delete_items_query(count):
+    """Programdan count adet öğeyi silen sorgu (parametreler: schedule_id, id...)"""
+    placeholders = ', '.join('?' * count)
+    return adapt_query(f'DELETE FROM schedule_items WHERE schedule_id = ? AND id IN ({placeholders})')
+
+
+def _time_value(value):
+    """Saat değerini karşılaştırma için HH:MM (saniye varsa HH:MM:SS) metnine çevir"""
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        # PostgreSQL TIME kolonu datetime.time döner
+        value = value.strftime('%H:%M:%S')
+    value = value.strip()
+    if len(value) == 8 and value.endswith(':00'):
+        value = value[:5]
+    return value
+
+
+def normalize_item(item):
+    """Öğeyi (istekten veya veritabanından) karşılaştırılabilir tuple'a çevir"""
+    return (
+        int(item.get('day_of_week') or 0),
+        _time_value(item.get('start_time')),
+        _time_value(item.get('end_time')),
+        item.get('subject') or '',
+        item.get('location') or '',
+        item.get('instructor') or '',
+    )
+
+
+def _item_id(item):
+    """Gelen öğenin id'si (yoksa veya geçersizse None)"""
+    try:
+        return int(item['id']) if item.get('id') is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def sync_schedule_items(c, schedule_id, items):
+    """
+    Programın öğelerini gelen listeye göre güncelle (minimum yazma)
+
+    Args:
+        c: Cursor (çağıranın transaction'ı)
+        schedule_id: Program id'si
+        items: İstekteki öğe listesi (id içerebilir)
+
+    Returns:
+        dict: inserted, updated, deleted, unchanged sayıları
+
+    Raises:
+        ValueError: Geçersiz day_of_week
+    """
+    incoming = [(_item_id(item), normalize_item(item)) for item in items]
+
+    execute_query(c, _SELECT_ITEMS, (schedule_id,))
+    existing = {row['id']: normalize_item(dict(row)) for row in c.fetchall()}
+
+    matches = {}        # mevcut id -> gelen değerler
+    unmatched = []      # eşleşmeyen gelen değerler
+
+    # 1. id ile eşleştir
+    for item_id, values in incoming:
+        if item_id in existing and item_id not in matches:
+            matches[item_id] = values
+        else:
+            unmatched.append(values)
+
+    # 2. id'siz (veya başka programdan id'li) öğeleri doğal anahtarla eşleştir
+    free = {}
+    for item_id, values in existing.items():
+        if item_id not in matches:
+            free.setdefault(values[:4], []).append(item_id)
+    to_insert = []
+    for values in unmatched:
+        candidates = free.get(values[:4])
+        if candidates:
+            matches[candidates.pop(0)] = values
+        else:
+            to_insert.append(values)
+
+    to_update = [
+        values + (item_id, schedule_id)
+        for item_id, values in matches.items()
+        if values != existing[item_id]
+    ]
+    to_delete = [item_id for item_id in existing if item_id not in matches]
+
+    if to_delete:
+        c.execute(delete_items_query(len(to_delete)), (schedule_id, *to_delete))
+    execute_many(c, _UPDATE_ITEM, to_update)
+    insert_many(c, 'schedule_items', ('schedule_id',) + SCHEDULE_ITEM_FIELDS,
+                [(schedule_id,) + values for values in to_insert])
+
+    return {
+        'inserted': len(to_insert),
+        'updated': len(to_update),
+        'deleted': len(to_delete),
+        'unchanged': len(matches) - len(to_update),
+    }
@@ -1,11 +1,37 @@
 """
 SQL Helper - SQLite ve PostgreSQL uyumluluğu için
+
+Sorgular aktif veritabanına göre bir kez adapte edilir:
+- adapt_query() sonucu önbelleğe alınır (aynı sorgu metni tekrar işlenmez)
+- Sık çalışan sorgular register_query() ile import sırasında isimlendirilip kaydedilir
+- Tarih pencereleri SQL'e gömülmez, days_ago() ile parametre olarak geçilir
+  (sorgu metni sabit kalır, PostgreSQL planı yeniden kullanabilir)
+- DB_PREPARE_STATEMENTS açıksa kayıtlı sorgular bağlantı başına PREPARE edilir ve
+  execute_query() bunları EXECUTE ile çalıştırır
 """
 
+import re
+from collections import namedtuple
+from datetime import timedelta
+from functools import lru_cache
+
 from database import USE_SUPABASE, get_placeholder
+from local_time import local_today
+
+# İsimlendirilmiş sorgular: ad -> aktif veritabanı için adapte edilmiş SQL
+_QUERIES = {}
+# Adapte edilmiş SQL -> ad (execute_query için ters eşleme)
+_NAMES_BY_SQL = {}
+# Ad -> PreparedStatement
+_PREPARED = {}
+
+PreparedStatement = namedtuple('PreparedStatement', 'statement prepare_sql execute_sql')
 
+_PARAM_RE = re.compile(r'%(?:\((\w+)\))?s')
+
+@lru_cache(maxsize=1024)
 def adapt_query(query):
-    """SQL sorgusunu veritabanı tipine göre adapte et"""
+    """SQL sorgusunu veritabanı tipine göre adapte et (sonuç önbelleğe alınır)"""
     if USE_SUPABASE:
         # PostgreSQL için
         # ? -> %s
@@ -16,17 +42,74 @@ def adapt_query(query):
         query = query.replace("date('now')", "CURRENT_DATE")
     return query
 
-def get_date_function(days=0):
-    """Tarih fonksiyonunu döndür"""
-    if USE_SUPABASE:
-        if days == 0:
-            return "CURRENT_DATE"
-        return f"CURRENT_DATE - INTERVAL '{days} days'"
-    else:
-        if days == 0:
-            return "date('now')"
-        return f"date('now', '-{days} days')"
+def register_query(name, query):
+    """
+    Sorguyu isimle kaydet ve adapte edilmiş halini döndür
+    Modül seviyesinde çağrılır: STUDY_INSERT = register_query('study.insert', '...')
+    """
+    adapted = adapt_query(query)
+    existing = _QUERIES.get(name)
+    if existing is not None and existing != adapted:
+        raise ValueError(f"'{name}' adında farklı bir sorgu zaten kayıtlı")
+    _QUERIES[name] = adapted
+    _NAMES_BY_SQL[adapted] = name
+    return adapted
 
+def get_query(name):
+    """Kayıtlı sorguyu adıyla döndür"""
+    try:
+        return _QUERIES[name]
+    except KeyError:
+        raise KeyError(f"Kayıtlı sorgu bulunamadı: {name}") from None
 
+def registered_queries():
+    """Tüm kayıtlı sorgular: {ad: sql}"""
+    return dict(_QUERIES)
 
+def prepared_statement(name):
+    """
+    Kayıtlı sorgunun PREPARE / EXECUTE metinleri (PostgreSQL)
+    %s parametreleri sırayla, %(ad)s parametreleri ilk geçtikleri sırayla $1, $2... olur
+    """
+    prepared = _PREPARED.get(name)
+    if prepared is not None:
+        return prepared
+
+    query = get_query(name)
+    statement = 'q_' + re.sub(r'\W', '_', name)
+    positions = {}
+    execute_params = []
+
+    def to_positional(match):
+        param = match.group(1)
+        if param is None:
+            execute_params.append('%s')
+            return f'${len(execute_params)}'
+        if param not in positions:
+            execute_params.append(f'%({param})s')
+            positions[param] = len(execute_params)
+        return f'${positions[param]}'
+
+    prepare_sql = f"PREPARE {statement} AS {_PARAM_RE.sub(to_positional, query).replace('%%', '%')}"
+    execute_sql = f"EXECUTE {statement}"
+    if execute_params:
+        execute_sql += f" ({', '.join(execute_params)})"
+
+    prepared = _PREPARED[name] = PreparedStatement(statement, prepare_sql, execute_sql)
+    return prepared
+
+def execute_query(c, query, params=()):
+    """
+    Sorguyu çalıştır - bağlantıda hazırlanmışsa EXECUTE ile, değilse normal şekilde
+    query, register_query() ile kaydedilmiş bir sorgu olmalıdır (değilse doğrudan çalışır)
+    """
+    name = _NAMES_BY_SQL.get(query)
+    if name is not None and name in getattr(c.connection, 'prepared', ()):
+        c.execute(_PREPARED[name].execute_sql, params)
+    else:
+        c.execute(query, params)
+    return c
 
+def days_ago(days):
+    """Bugünden (STREAK_TIMEZONE) days gün önceki tarih (ISO formatında, sorgu parametresi olarak)"""
+    return (local_today() - timedelta(days=days)).isoformat()
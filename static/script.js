@@ -43,6 +43,16 @@ function updateEfficiencyValue(value) {
     }
 }
 
+// Ders programı kaydının değişiklik özeti (eklenen / güncellenen / silinen öğe sayıları)
+function formatScheduleChanges(changes) {
+    if (!changes) return '';
+    const parts = [];
+    if (changes.inserted) parts.push(`${changes.inserted} ders eklendi`);
+    if (changes.updated) parts.push(`${changes.updated} ders güncellendi`);
+    if (changes.deleted) parts.push(`${changes.deleted} ders silindi`);
+    return parts.length ? `\n\n${parts.join(', ')}` : '\n\nDerslerde değişiklik yok';
+}
+
 // Smooth scroll
 document.querySelectorAll('a[href^="#"]').forEach(anchor => {
     anchor.addEventListener('click', function (e) {
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Streak (üst üste çalışma günü) hesaplamaları
+
+Çalışma kaydı eklenirken streak geçişi aynı transaction içinde tek bir koşullu
+UPDATE ile uygulanır:
+- İlk çalışma                       -> 1
+- Son çalışma günüyle aynı gün      -> değişmez (same_day)
+- Son çalışma gününden önceki tarih -> değişmez (geçmişe dönük kayıt)
+- Son çalışma gününün ertesi günü   -> +1
+- Arada boş gün varsa               -> 1 (broken)
+
+Kayıt tarihi değiştirme, silme ve admin düzenlemeleri artımlı hesabı bozabildiği için
+streak'ler student_daily_stats'taki çalışma günlerinden toplu olarak yeniden hesaplanabilir
+(window function ile gaps-and-islands, tek UPDATE).
+
+Son çalışma günü dünden eski olan streak'ler her gece gün dönümünde (STREAK_TIMEZONE
+saat diliminde) tek bir UPDATE ile sıfırlanır; böylece current_streak değeri okuyan
+her yerde (dashboard, leaderboard) olduğu gibi kullanılabilir.
+
+Kullanım:
+    python streaks.py recompute [student_id]   # streak'leri çalışma günlerinden yeniden hesapla
+    python streaks.py expire                   # süresi dolmuş streak'leri sıfırla
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from database import get_db, USE_SUPABASE
+from local_time import LOCAL_TIMEZONE, STREAK_TIMEZONE, local_now, local_today
+from sql_helper import execute_query, register_query
+
+# Gece yarısından sonra sıfırlamanın çalışacağı gecikme (saniye)
+STREAK_EXPIRY_DELAY_SECONDS = int(os.environ.get('STREAK_EXPIRY_DELAY_SECONDS', 60))
+
+_expiry_scheduler_started = False
+# Bu süreçte sıfırlamanın en son çalıştığı gün (ensure_daily_sweep)
+_last_sweep_date = None
+_sweep_lock = threading.Lock()
+
+
+# PostgreSQL: eski değerler kilitli alt sorgudan, yeni değerler UPDATE'ten - tek round trip
+_PG_APPLY_STUDY_DATE = register_query('streak.apply_pg', '''
+    UPDATE students s
+    SET current_streak = t.new_streak,
+        longest_streak = GREATEST(COALESCE(s.longest_streak, 0), t.new_streak),
+        last_study_date = GREATEST(s.last_study_date, %(study_date)s::date)
+    FROM (
+        SELECT
+            id,
+            COALESCE(current_streak, 0) AS old_streak,
+            last_study_date AS old_last_study_date,
+            CASE
+                WHEN last_study_date IS NULL THEN 1
+                WHEN %(study_date)s::date <= last_study_date THEN COALESCE(current_streak, 0)
+                WHEN %(study_date)s::date = last_study_date + 1 THEN COALESCE(current_streak, 0) + 1
+                ELSE 1
+            END AS new_streak
+        FROM students
+        WHERE id = %(student_id)s
+        FOR UPDATE
+    ) t
+    WHERE s.id = t.id
+    RETURNING t.old_streak, t.old_last_study_date, s.current_streak AS new_streak
+''')
+
+# SQLite: RETURNING sadece güncellenen tablonun yeni değerlerini verebilir, eski değerler
+# aynı transaction'da önceden okunur (INSERT sonrası yazma kilidi zaten bu bağlantıda)
+_SQLITE_SELECT_STREAK = '''
+    SELECT COALESCE(current_streak, 0) AS old_streak, last_study_date AS old_last_study_date
+    FROM students
+    WHERE id = ?
+'''
+
+_SQLITE_APPLY_STUDY_DATE = '''
+    UPDATE students
+    SET current_streak = t.new_streak,
+        longest_streak = MAX(COALESCE(students.longest_streak, 0), t.new_streak),
+        last_study_date = CASE
+            WHEN students.last_study_date IS NULL OR :study_date > students.last_study_date
+            THEN :study_date
+            ELSE students.last_study_date
+        END
+    FROM (
+        SELECT
+            id,
+            CASE
+                WHEN last_study_date IS NULL THEN 1
+                WHEN :study_date <= last_study_date THEN COALESCE(current_streak, 0)
+                WHEN :study_date = date(last_study_date, '+1 day') THEN COALESCE(current_streak, 0) + 1
+                ELSE 1
+            END AS new_streak
+        FROM students
+        WHERE id = :student_id
+    ) t
+    WHERE students.id = t.id
+    RETURNING current_streak AS new_streak
+'''
+
+if not USE_SUPABASE:
+    # PostgreSQL sözdizimi değil (MAX(a, b), :isim) - PREPARE denenmesin diye sadece SQLite'ta kaydedilir
+    _SQLITE_SELECT_STREAK = register_query('streak.sqlite_select', _SQLITE_SELECT_STREAK)
+    _SQLITE_APPLY_STUDY_DATE = register_query('streak.apply_sqlite', _SQLITE_APPLY_STUDY_DATE)
+
+
+def parse_study_date(value):
+    """Tarihi date nesnesine çevir ('YYYY-MM-DD', date veya datetime)"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _streak_result(old_streak, old_last_study_date, new_streak, study_date):
+    """Flash mesajlarının kullandığı streak sonucu"""
+    if old_last_study_date is not None and not isinstance(old_last_study_date, date):
+        old_last_study_date = parse_study_date(old_last_study_date)
+
+    return {
+        'streak_increased': new_streak > old_streak,
+        'same_day': old_last_study_date == study_date,
+        'new_streak': new_streak,
+        'old_streak': old_streak,
+        # Sadece tarih boşluğuna bakılır: gece sıfırlaması streak'i önceden 0'a çekmiş olabilir
+        'broken': (old_last_study_date is not None
+                   and (study_date - old_last_study_date).days > 1),
+        'backdated': old_last_study_date is not None and study_date < old_last_study_date
+    }
+
+
+def apply_study_date(c, student_id, study_date):
+    """
+    Yeni çalışma kaydının tarihine göre streak'i güncelle
+    Çalışma kaydını ekleyen transaction içinde, günlük özet güncellendikten
+    (rollups.record_study_added) sonra ve commit'ten önce çağrılmalı
+
+    Son çalışma gününden eski tarihli kayıt aradaki bir boşluğu doldurmuş olabilir;
+    artımlı hesap sadece son güne baktığı için bu durumda öğrencinin streak'i
+    çalışma günlerinden yeniden hesaplanır.
+
+    Returns:
+        dict: {'streak_increased', 'same_day', 'new_streak', 'old_streak', 'broken', 'backdated'}
+              öğrenci bulunamazsa None
+    """
+    study_date = parse_study_date(study_date)
+
+    if USE_SUPABASE:
+        execute_query(c, _PG_APPLY_STUDY_DATE, {'student_id': student_id, 'study_date': study_date.isoformat()})
+        row = c.fetchone()
+        if not row:
+            return None
+        result = _streak_result(row['old_streak'], row['old_last_study_date'], row['new_streak'], study_date)
+    else:
+        execute_query(c, _SQLITE_SELECT_STREAK, (student_id,))
+        old = c.fetchone()
+        if not old:
+            return None
+        execute_query(c, _SQLITE_APPLY_STUDY_DATE, {'student_id': student_id, 'study_date': study_date.isoformat()})
+        row = c.fetchone()
+        result = _streak_result(old['old_streak'], old['old_last_study_date'], row['new_streak'], study_date)
+
+    if result['backdated']:
+        for _, current_streak in recompute_streaks(c, student_id):
+            result['new_streak'] = current_streak
+            result['streak_increased'] = current_streak > result['old_streak']
+    return result
+
+
+# Toplu yeniden hesaplama: ardışık günler aynı "ada"ya düşer (tarih - sıra numarası sabit kalır)
+if USE_SUPABASE:
+    _ISLAND_KEY = "date - CAST(ROW_NUMBER() OVER (PARTITION BY student_id ORDER BY date) AS INTEGER)"
+    _YESTERDAY_PARAM = "CAST(? AS DATE)"
+    _DIFFERS = "IS DISTINCT FROM"
+else:
+    _ISLAND_KEY = "julianday(date) - ROW_NUMBER() OVER (PARTITION BY student_id ORDER BY date)"
+    _YESTERDAY_PARAM = "?"
+    _DIFFERS = "IS NOT"
+
+
+def _recompute_query(single_student):
+    """Streak yeniden hesaplama sorgusu (tek öğrenci veya tüm tablo)"""
+    daily_filter = "WHERE student_id = ?" if single_student else ""
+    student_filter = "WHERE st.id = ?" if single_student else ""
+    return f'''
+        WITH islands AS (
+            SELECT student_id, date, {_ISLAND_KEY} AS island
+            FROM student_daily_stats
+            {daily_filter}
+        ),
+        runs AS (
+            SELECT
+                student_id,
+                COUNT(*) AS run_length,
+                MAX(date) AS run_end,
+                ROW_NUMBER() OVER (PARTITION BY student_id ORDER BY MAX(date) DESC) AS recency
+            FROM islands
+            GROUP BY student_id, island
+        ),
+        computed AS (
+            SELECT
+                student_id,
+                MAX(CASE WHEN recency = 1 AND run_end >= {_YESTERDAY_PARAM} THEN run_length ELSE 0 END) AS current_streak,
+                MAX(run_length) AS longest_streak,
+                MAX(run_end) AS last_study_date
+            FROM runs
+            GROUP BY student_id
+        )
+        UPDATE students AS s
+        SET current_streak = x.new_current,
+            longest_streak = x.new_longest,
+            last_study_date = x.new_last,
+            data_version = COALESCE(s.data_version, 0) + 1
+        FROM (
+            SELECT
+                st.id AS student_id,
+                COALESCE(computed.current_streak, 0) AS new_current,
+                COALESCE(computed.longest_streak, 0) AS new_longest,
+                computed.last_study_date AS new_last
+            FROM students st
+            LEFT JOIN computed ON computed.student_id = st.id
+            {student_filter}
+        ) x
+        WHERE s.id = x.student_id
+          AND (s.current_streak {_DIFFERS} x.new_current
+               OR s.longest_streak {_DIFFERS} x.new_longest
+               OR s.last_study_date {_DIFFERS} x.new_last)
+        RETURNING id, current_streak
+    '''
+
+
+_RECOMPUTE_ALL = register_query('streak.recompute_all', _recompute_query(False))
+_RECOMPUTE_STUDENT = register_query('streak.recompute_student', _recompute_query(True))
+
+
+def recompute_streaks(c, student_id=None, today=None):
+    """
+    current/longest streak ve last_study_date'i çalışma günlerinden yeniden hesapla
+    Sadece değişen öğrenci satırları güncellenir. Son çalışma günü dünden eskiyse
+    current_streak 0 olur.
+
+    Returns:
+        list: Değişen öğrenciler [(student_id, current_streak), ...]
+    """
+    yesterday = ((today or local_today()) - timedelta(days=1)).isoformat()
+    if student_id is None:
+        execute_query(c, _RECOMPUTE_ALL, (yesterday,))
+    else:
+        execute_query(c, _RECOMPUTE_STUDENT, (student_id, yesterday, student_id))
+    return [(row['id'], row['current_streak']) for row in c.fetchall()]
+
+
+_EXPIRE_STREAKS = register_query('streak.expire', '''
+    UPDATE students
+    SET current_streak = 0, data_version = COALESCE(data_version, 0) + 1
+    WHERE current_streak > 0
+      AND (last_study_date IS NULL OR last_study_date < ?)
+    RETURNING id
+''')
+
+
+def expire_streaks(c, today=None):
+    """
+    Son çalışma günü dünden eski olan streak'leri sıfırla (tek UPDATE)
+
+    Returns:
+        list: Sıfırlanan öğrenci id'leri
+    """
+    yesterday = ((today or local_today()) - timedelta(days=1)).isoformat()
+    execute_query(c, _EXPIRE_STREAKS, (yesterday,))
+    return [row['id'] for row in c.fetchall()]
+
+
+def streak_status(current_streak, last_study_date, today=None):
+    """
+    Saklanan streak değerinden dashboard durumu (süresi dolanlar gece sıfırlanır)
+
+    Returns:
+        str: 'active' (bugün çalışıldı), 'at_risk' (bugün henüz çalışılmadı),
+             'broken' (streak sıfırlanmış) veya None (hiç çalışma yok)
+    """
+    if not last_study_date:
+        return None
+    if not current_streak:
+        return 'broken'
+    if parse_study_date(last_study_date) < (today or local_today()):
+        return 'at_risk'
+    return 'active'
+
+
+def run_expiry_sweep():
+    """Süresi dolmuş streak'leri sıfırla ve bu süreçteki önbelleği / leaderboard'ları bilgilendir"""
+    global _last_sweep_date
+    from db_utils import get_cursor
+    from leaderboard import mark_dirty
+    from leaderboard_engine import record_streak
+    from student_cache import invalidate_student
+
+    with get_db() as conn:
+        expired = expire_streaks(get_cursor(conn))
+        conn.commit()
+    _last_sweep_date = local_today()
+
+    if expired:
+        mark_dirty()
+        for student_id in expired:
+            invalidate_student(student_id)
+            record_streak(student_id, 0)
+    return expired
+
+
+def ensure_daily_sweep():
+    """
+    Bu süreçte bugün sıfırlama çalışmadıysa çalıştır ve zamanlayıcıyı başlat
+    Her istekten önce çağrılır: post_fork olmadan (--config gunicorn_config.py
+    verilmeden) başlatılan worker'larda da günün ilk isteği sıfırlamayı yapar
+    """
+    global _last_sweep_date
+    today = local_today()
+    if _last_sweep_date == today or not _sweep_lock.acquire(blocking=False):
+        return
+    try:
+        if _last_sweep_date != today:
+            # Hata durumunda her istekte tekrar denenmez; gece zamanlayıcısı tekrar çalıştırır
+            _last_sweep_date = today
+            expired = run_expiry_sweep()
+            print(f"🔥 Streak sıfırlama: {len(expired)} öğrenci")
+    except Exception as e:
+        print(f"⚠️  Streak sıfırlama hatası: {e}")
+    finally:
+        _sweep_lock.release()
+    start_expiry_scheduler()
+
+
+def _seconds_until_next_sweep():
+    now = local_now()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=LOCAL_TIMEZONE)
+    return (next_midnight - now).total_seconds() + STREAK_EXPIRY_DELAY_SECONDS
+
+
+def _expiry_loop():
+    """Her gün dönümünde sıfırlamayı çalıştıran döngü"""
+    while True:
+        time.sleep(_seconds_until_next_sweep())
+        try:
+            expired = run_expiry_sweep()
+            print(f"🔥 Streak sıfırlama: {len(expired)} öğrenci")
+        except Exception as e:
+            print(f"⚠️  Streak sıfırlama hatası: {e}")
+
+
+def start_expiry_scheduler():
+    """
+    Gece sıfırlamasını yapan daemon thread'i başlat
+    Gunicorn'da fork sonrası (post_fork) her worker için çağrılmalı - sıfırlama
+    idempotent olduğu için birden fazla worker'ın çalıştırması sorun değildir
+    """
+    global _expiry_scheduler_started
+    if _expiry_scheduler_started:
+        return
+    _expiry_scheduler_started = True
+
+    thread = threading.Thread(target=_expiry_loop, name='streak-expiry', daemon=True)
+    thread.start()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in ('recompute', 'expire'):
+        print("Kullanım: python streaks.py recompute [student_id] | expire")
+        sys.exit(1)
+
+    from db_utils import get_cursor
+
+    print("=" * 60)
+    print("🔥 Streak " + ("yeniden hesaplama" if sys.argv[1] == 'recompute' else "sıfırlama"))
+    print(f"🕛 Bugün ({STREAK_TIMEZONE}): {local_today()}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    with get_db() as conn:
+        if sys.argv[1] == 'recompute':
+            student_id = int(sys.argv[2]) if len(sys.argv) > 2 else None
+            changed = recompute_streaks(get_cursor(conn), student_id)
+        else:
+            changed = expire_streaks(get_cursor(conn))
+        conn.commit()
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {len(changed)} öğrencinin streak'i güncellendi ({elapsed:.2f} sn)")
@@ -0,0 +1,215 @@
+"""
+Öğrenci bazlı okuma önbelleği (read-through, yazmada geçersiz kılma)
+
+Dashboard verileri, istatistik JSON'u ve ders programı yanıtları öğrenci id'si ve
+öğrencinin veri sürümü (students.data_version, bkz. http_cache.py) ile anahtarlanır:
+- Okuma: get_or_load(student_id, version, name, loader) - önbellekte yoksa loader() çalışır
+- Yazma: route'lar commit'ten sonra invalidate_student(student_id) çağırır, bu süreçteki
+  girdiler hemen silinir. Diğer worker'lar eski girdiyi sürüm değiştiği için zaten okumaz.
+- Girdiler STUDENT_CACHE_TTL_SECONDS sonra düşer, en fazla STUDENT_CACHE_MAX_ENTRIES
+  girdi tutulur (en uzun süredir kullanılmayan silinir)
+
+Varsayılan backend süreç içi MemoryBackend'dir. STUDENT_CACHE_REDIS_URL verilirse tüm
+worker'ların paylaştığı RedisBackend kullanılır (redis paketi gerekir); yerelde ve testte
+MemoryBackend onun yerine geçer. Başka bir backend aynı arayüzle (get / set /
+delete_student / stats) set_backend() ile takılabilir; değerler pickle edilebilir
+olmalıdır. Önbellekten dönen değerler değiştirilmemelidir.
+"""
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+STUDENT_CACHE_ENABLED = os.environ.get('STUDENT_CACHE_ENABLED', 'True').lower() == 'true'
+STUDENT_CACHE_MAX_ENTRIES = int(os.environ.get('STUDENT_CACHE_MAX_ENTRIES', 2048))
+STUDENT_CACHE_TTL_SECONDS = float(os.environ.get('STUDENT_CACHE_TTL_SECONDS', 300))
+# Paylaşımlı önbellek (ör. redis://localhost:6379/0) - boşsa süreç içi önbellek
+STUDENT_CACHE_REDIS_URL = os.environ.get('STUDENT_CACHE_REDIS_URL', '')
+
+# Önbellekte olmayan değer (None da önbelleğe alınabilir)
+MISSING = object()
+
+
+class MemoryBackend:
+    """Süreç içi LRU + TTL önbellek (thread-safe)"""
+
+    def __init__(self, max_entries=STUDENT_CACHE_MAX_ENTRIES, ttl=STUDENT_CACHE_TTL_SECONDS):
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()    # (student_id, version, name) -> (expires_at, value)
+        self._keys_by_student = {}       # student_id -> {key, ...}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                metrics.cache_expirations.inc()
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._keys_by_student.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                metrics.cache_evictions.inc()
+
+    def delete_student(self, student_id):
+        with self._lock:
+            for key in self._keys_by_student.pop(student_id, ()):
+                self._entries.pop(key, None)
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        keys = self._keys_by_student.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_student[key[0]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'students': len(self._keys_by_student),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl
+            }
+
+
+class RedisBackend:
+    """
+    Worker'ların paylaştığı Redis önbelleği
+    Girdiler Redis TTL'i ile düşer; kapasite Redis'in maxmemory ayarına bırakılır (tahliyeler
+    cache_evictions'a yansımaz). Redis'e ulaşılamazsa önbellek atlanır, veri veritabanından okunur.
+    """
+
+    def __init__(self, client, ttl=STUDENT_CACHE_TTL_SECONDS, prefix='student_cache'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("STUDENT_CACHE_REDIS_URL için redis paketi gerekli! pip install redis")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, key):
+        student_id, version, name = key
+        return f'{self.prefix}:{student_id}:{version}:{name}'
+
+    def _student_key(self, student_id):
+        # Öğrencinin girdi anahtarları (delete_student için)
+        return f'{self.prefix}:keys:{student_id}'
+
+    def get(self, key):
+        try:
+            data = self.client.get(self._key(key))
+        except Exception as e:
+            print(f"⚠️  Önbellek okuma hatası: {e}")
+            return MISSING
+        if data is None:
+            return MISSING
+        return pickle.loads(data)
+
+    def set(self, key, value):
+        ttl = max(int(self.ttl), 1)
+        student_key = self._student_key(key[0])
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(self._key(key), pickle.dumps(value), ex=ttl)
+            pipe.sadd(student_key, self._key(key))
+            pipe.expire(student_key, ttl)
+            pipe.execute()
+        except Exception as e:
+            print(f"⚠️  Önbellek yazma hatası: {e}")
+
+    def delete_student(self, student_id):
+        student_key = self._student_key(student_id)
+        try:
+            keys = self.client.smembers(student_key)
+            self.client.delete(student_key, *keys)
+        except Exception as e:
+            # Diğer worker'lar eski girdiyi data_version değiştiği için zaten okumaz
+            print(f"⚠️  Önbellek silme hatası: {e}")
+
+    def stats(self):
+        return {
+            'backend': 'redis',
+            'prefix': self.prefix,
+            'ttl_seconds': self.ttl
+        }
+
+
+def _create_backend():
+    if not STUDENT_CACHE_ENABLED:
+        return None
+    if STUDENT_CACHE_REDIS_URL:
+        return RedisBackend.from_url(STUDENT_CACHE_REDIS_URL)
+    return MemoryBackend()
+
+
+_backend = _create_backend()
+
+
+def get_backend():
+    """Aktif backend (önbellek kapalıysa None)"""
+    return _backend
+
+
+def set_backend(backend):
+    """Backend'i değiştir (ör. paylaşımlı önbellek); None önbelleği kapatır"""
+    global _backend
+    _backend = backend
+
+
+def get_or_load(student_id, version, name, loader):
+    """
+    Önbellekteki değeri döndür, yoksa loader() ile yükleyip önbelleğe al
+
+    Args:
+        student_id: Verinin sahibi
+        version: get_data_version() satırı - None ise (öğrenci yok) önbellek kullanılmaz
+        name: Yanıtı tanımlayan ad (ör. 'dashboard:2024-05-01', 'schedule:3')
+        loader: Veriyi veritabanından yükleyen fonksiyon
+    """
+    backend = _backend
+    if backend is None or version is None:
+        return loader()
+
+    key = (student_id, version['data_version'] or 0, name)
+    value = backend.get(key)
+    if value is not MISSING:
+        metrics.cache_hits.inc()
+        return value
+
+    metrics.cache_misses.inc()
+    value = loader()
+    backend.set(key, value)
+    return value
+
+
+def invalidate_student(student_id):
+    """Öğrencinin önbellek girdilerini sil (yazma commit edildikten sonra)"""
+    backend = _backend
+    if backend is None:
+        return
+    backend.delete_student(student_id)
+    metrics.cache_invalidations.inc()
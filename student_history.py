@@ -0,0 +1,136 @@
+"""
+Öğrenci geçmişi (çalışma kayıtları ve sınav sonuçları) için keyset sayfalama
+
+Sayfalar (tarih, created_at, id) sırasına göre azalan şekilde okunur; sonraki sayfa
+OFFSET yerine son satırın anahtarından devam eder (WHERE (date, created_at, id) < ...),
+böylece geçmiş uzadıkça sayfa süresi artmaz. Sıra (student_id, tarih, created_at, id)
+index'leriyle karşılanır (bkz. migrations.TABLE_INDEXES).
+
+Sınav tarihi boş olabilir: tarihsiz sınavlar her iki veritabanında da en sona gelir.
+Cursor istemciye opak bir metin olarak verilir (encode_cursor / decode_cursor).
+"""
+
+import base64
+import json
+
+from database import USE_SUPABASE
+from sql_helper import execute_query, register_query
+
+# Sayfa başına kayıt sayısı
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
+# PostgreSQL'de NULL'lar DESC sıralamada başa gelir, SQLite'ta sona
+_NULLS_LAST = ' NULLS LAST' if USE_SUPABASE else ''
+
+_SESSIONS_FIRST = register_query('history.sessions_first', '''
+    SELECT * FROM study_sessions
+    WHERE student_id = ?
+    ORDER BY date DESC, created_at DESC, id DESC
+    LIMIT ?
+''')
+
+_SESSIONS_AFTER = register_query('history.sessions_after', '''
+    SELECT * FROM study_sessions
+    WHERE student_id = ? AND (date, created_at, id) < (?, ?, ?)
+    ORDER BY date DESC, created_at DESC, id DESC
+    LIMIT ?
+''')
+
+_EXAMS_FIRST = register_query('history.exams_first', f'''
+    SELECT * FROM exam_results
+    WHERE student_id = ?
+    ORDER BY exam_date DESC{_NULLS_LAST}, created_at DESC, id DESC
+    LIMIT ?
+''')
+
+# Tarihli bir sınavdan sonra: daha eski tarihliler ve tüm tarihsizler
+_EXAMS_AFTER = register_query('history.exams_after', f'''
+    SELECT * FROM exam_results
+    WHERE student_id = ?
+      AND ((exam_date, created_at, id) < (?, ?, ?) OR exam_date IS NULL)
+    ORDER BY exam_date DESC{_NULLS_LAST}, created_at DESC, id DESC
+    LIMIT ?
+''')
+
+# Tarihsiz bir sınavdan sonra: sadece kalan tarihsizler
+_EXAMS_AFTER_UNDATED = register_query('history.exams_after_undated', '''
+    SELECT * FROM exam_results
+    WHERE student_id = ? AND exam_date IS NULL AND (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+''')
+
+
+def _key_value(value):
+    """Anahtar değerini cursor'a yazılabilir hale getir (PostgreSQL date/datetime döner)"""
+    if value is None or isinstance(value, (str, int)):
+        return value
+    return value.isoformat()
+
+
+def encode_cursor(row, date_column):
+    """Satırın (tarih, created_at, id) anahtarından opak cursor"""
+    key = [_key_value(row[date_column]), _key_value(row['created_at']), row['id']]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Cursor'dan (tarih, created_at, id)
+
+    Raises:
+        ValueError: Geçersiz cursor
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        date_value, created_at, row_id = key
+    except (ValueError, TypeError):
+        raise ValueError('Geçersiz cursor') from None
+    # Değerler doğrudan sorgu parametresi olur: sadece metin/None tarih ve int id kabul edilir
+    if not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise ValueError('Geçersiz cursor')
+    if not all(value is None or isinstance(value, str) for value in (date_value, created_at)):
+        raise ValueError('Geçersiz cursor')
+    return date_value, created_at, row_id
+
+
+def _page(rows, limit, date_column):
+    """limit + 1 satırdan (sayfa, sonraki cursor)"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1], date_column) if has_more else None
+    return rows, next_cursor
+
+
+def load_sessions_page(c, student_id, cursor=None, limit=HISTORY_PAGE_SIZE):
+    """
+    Çalışma kayıtlarının bir sayfası (en yeni önce)
+
+    Returns:
+        tuple: (satırlar, sonraki sayfanın cursor'ı veya None)
+    """
+    if cursor is None:
+        execute_query(c, _SESSIONS_FIRST, (student_id, limit + 1))
+    else:
+        date_value, created_at, row_id = decode_cursor(cursor)
+        execute_query(c, _SESSIONS_AFTER, (student_id, date_value, created_at, row_id, limit + 1))
+    return _page(c.fetchall(), limit, 'date')
+
+
+def load_exams_page(c, student_id, cursor=None, limit=HISTORY_PAGE_SIZE):
+    """
+    Sınav sonuçlarının bir sayfası (en yeni önce, tarihsizler sonda)
+
+    Returns:
+        tuple: (satırlar, sonraki sayfanın cursor'ı veya None)
+    """
+    if cursor is None:
+        execute_query(c, _EXAMS_FIRST, (student_id, limit + 1))
+    else:
+        date_value, created_at, row_id = decode_cursor(cursor)
+        if date_value is None:
+            execute_query(c, _EXAMS_AFTER_UNDATED, (student_id, created_at, row_id, limit + 1))
+        else:
+            execute_query(c, _EXAMS_AFTER, (student_id, date_value, created_at, row_id, limit + 1))
+    return _page(c.fetchall(), limit, 'exam_date')
@@ -3,12 +3,14 @@
 Öğrencilerin günlük çalışma verilerini, sınav sonuçlarını ve gelişimlerini takip eder
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash, Response, stream_with_context
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta, date
 import os
 import json
+import hmac
+import time
 from functools import wraps
 from dotenv import load_dotenv
 
@@ -16,9 +18,37 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Veritabanı modülünü import et
-from database import get_db, init_db, get_placeholder, USE_SUPABASE
-from sql_helper import adapt_query, get_date_function
-from db_utils import get_cursor
+from database import get_db, get_db_pool, init_db, get_placeholder, USE_SUPABASE
+import metrics
+from sql_helper import adapt_query, execute_query
+from queries import (
+    STUDY_INSERT, STUDY_SELECT_FOR_WRITE, STUDY_SELECT, STUDY_UPDATE, STUDY_DELETE,
+    EXAM_INSERT, EXAM_SELECT_OWNER, EXAM_DELETE, EXAM_SCORES,
+    STATS_BY_BUCKET,
+    SCHEDULE_LIST, SCHEDULE_LATEST, SCHEDULE_ITEMS, SCHEDULE_COMPLETIONS_RANGE,
+    COMPLETION_UPSERT, COMPLETION_ITEM_OWNER, completion_owned_items_query,
+    STUDENT_BY_USERNAME,
+    ADMIN_SORT_COLUMNS, admin_student_list_queries,
+)
+from db_utils import get_cursor, execute_many
+from schedule_sync import sync_schedule_items
+from dashboard_data import load_dashboard_data
+from student_history import HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE, load_sessions_page, load_exams_page
+from exports import EXPORT_FORMATS, parse_export_args, stream_export, export_filename
+from rollups import record_study_added, record_study_updated, record_study_removed
+from streaks import apply_study_date, recompute_streaks, streak_status, start_expiry_scheduler, ensure_daily_sweep
+from local_time import local_today
+from http_cache import bump_data_version, get_data_version, cache_validators, not_modified_response, with_validators
+from student_cache import get_or_load as get_cached, invalidate_student as invalidate_student_cache, get_backend as get_cache_backend
+from leaderboard import get_snapshot as get_leaderboard_snapshot, mark_dirty as mark_leaderboard_dirty
+from leaderboard_engine import (
+    METRICS as LEADERBOARD_METRICS,
+    get_engine as get_leaderboard_engine,
+    record_study_delta as record_leaderboard_delta,
+    record_streak as record_leaderboard_streak,
+    record_student_added as record_leaderboard_student_added,
+    record_student_removed as record_leaderboard_student_removed,
+)
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'ogrenci-takip-sistemi-secret-key-2024')
@@ -51,123 +81,13 @@ def get_google_oauth():
             pass
     return _google_oauth
 
-def update_streak(student_id, study_date):
-    """
-    Öğrencinin streak'ini güncelle
-    Streak: Üst üste çalışma günü sayısı
-
-    Returns:
-        dict: {
-            'streak_increased': bool,
-            'same_day': bool,
-            'new_streak': int,
-            'old_streak': int,
-            'broken': bool
-        }
-    """
-    try:
-        with get_db() as conn:
-            c = get_cursor(conn)
-
-            # Öğrencinin mevcut streak bilgilerini al
-            query = adapt_query('''
-                SELECT current_streak, longest_streak, last_study_date
-                FROM students
-                WHERE id = ?
-            ''')
-            c.execute(query, (student_id,))
-            student = c.fetchone()
-
-            if not student:
-                return {'streak_increased': False, 'same_day': False, 'new_streak': 0, 'old_streak': 0, 'broken': False}
-
-            # Kolonlar yoksa (eski veritabanı) varsayılan değerler kullan
-            current_streak = student.get('current_streak', 0) if isinstance(student, dict) else (student[0] if len(student) > 0 else 0)
-            longest_streak = student.get('longest_streak', 0) if isinstance(student, dict) else (student[1] if len(student) > 1 else 0)
-            last_study_date = student.get('last_study_date', None) if isinstance(student, dict) else (student[2] if len(student) > 2 else None)
-
-            old_streak = current_streak  # Eski streak'i sakla
-
-            # Tarihi parse et
-            if isinstance(study_date, str):
-                study_date_obj = datetime.strptime(study_date, '%Y-%m-%d').date()
-            else:
-                study_date_obj = study_date if isinstance(study_date, date) else study_date.date()
-
-            today = date.today()
-            yesterday = today - timedelta(days=1)
-
-            # Streak hesapla
-            new_streak = 1  # Varsayılan: yeni streak başlat
-            same_day = False
-            streak_broken = False
-
-            if last_study_date:
-                if isinstance(last_study_date, str):
-                    last_date = datetime.strptime(last_study_date, '%Y-%m-%d').date()
-                else:
-                    last_date = last_study_date if isinstance(last_study_date, date) else last_study_date.date()
-
-                # Eğer bugün veya dün çalıştıysa streak devam eder
-                if study_date_obj == today or study_date_obj == yesterday:
-                    if last_date == yesterday or last_date == today:
-                        # Streak devam ediyor
-                        new_streak = current_streak + 1
-                    elif last_date == today and study_date_obj == today:
-                        # Bugün zaten çalışma kaydı var, streak artmaz
-                        new_streak = current_streak
-                        same_day = True
-                    else:
-                        # Streak kırıldı, yeni streak başlat
-                        new_streak = 1
-                        streak_broken = True
-                else:
-                    # Geçmiş tarih, streak hesaplama
-                    days_diff = (study_date_obj - last_date).days
-                    if days_diff == 1:
-                        # Üst üste çalışma
-                        new_streak = current_streak + 1
-                    else:
-                        # Streak kırıldı
-                        new_streak = 1
-                        streak_broken = True
-
-            # En uzun streak'i güncelle
-            if new_streak > longest_streak:
-                longest_streak = new_streak
-
-            # Veritabanını güncelle
-            # Önce kolonların var olup olmadığını kontrol et
-            try:
-                query = adapt_query('''
-                    UPDATE students
-                    SET current_streak = ?,
-                        longest_streak = ?,
-                        last_study_date = ?
-                    WHERE id = ?
-                ''')
-                c.execute(query, (new_streak, longest_streak, study_date_obj, student_id))
-                conn.commit()
-            except Exception as e:
-                # Kolonlar yoksa, önce ekle (migration)
-                if 'column' in str(e).lower() or 'does not exist' in str(e).lower():
-                    print(f"⚠️  Streak kolonları bulunamadı. Migration script'ini çalıştırın: python add_streak_columns.py")
-                else:
-                    raise
-
-            return {
-                'streak_increased': new_streak > old_streak,
-                'same_day': same_day,
-                'new_streak': new_streak,
-                'old_streak': old_streak,
-                'broken': streak_broken
-            }
-
-    except Exception as e:
-        print(f"⚠️  Streak güncelleme hatası: {e}")
-        import traceback
-        traceback.print_exc()
-        return {'streak_increased': False, 'same_day': False, 'new_streak': 0, 'old_streak': 0, 'broken': False}
+def notify_study_change(student_id, hours_delta, sessions_delta, streak_changes=()):
+    """Çalışma kaydı commit edildikten sonra önbelleği ve leaderboard'ları bilgilendir"""
+    invalidate_student_cache(student_id)
+    mark_leaderboard_dirty()
+    record_leaderboard_delta(student_id, hours_delta, sessions_delta)
+    for changed_id, streak in streak_changes:
+        record_leaderboard_streak(changed_id, streak)
 
 # Veritabanını başlat (Gunicorn için)
 # Gunicorn ile çalışırken if __name__ == '__main__' çalışmaz
@@ -243,6 +163,21 @@ def handle_exception(e):
     print("=" * 60)
     return "Internal Server Error", 500
 
+# Metrikler için route etiketi (bağlantı tutma süreleri endpoint bazında toplanır)
+@app.before_request
+def set_metrics_route():
+    metrics.set_route(request.endpoint)
+
+# Gün dönümünden sonraki ilk istekte süresi dolmuş streak'leri sıfırla
+# (gunicorn_config.post_fork çalışmadığında da dashboard / leaderboard güncel kalır)
+@app.before_request
+def run_daily_streak_sweep():
+    ensure_daily_sweep()
+
+@app.teardown_request
+def clear_metrics_route(error=None):
+    metrics.clear_route()
+
 def login_required(f):
     """Giriş yapmış kullanıcı kontrolü"""
     @wraps(f)
@@ -286,8 +221,7 @@ def login():
         
         with get_db() as conn:
             c = get_cursor(conn)
-            query = adapt_query('SELECT * FROM students WHERE username = ?')
-            c.execute(query, (username,))
+            execute_query(c, STUDENT_BY_USERNAME, (username,))
             user = c.fetchone()
         
         if user and check_password_hash(user['password'], password):
@@ -333,6 +267,14 @@ def register():
             ''')
             c.execute(query, (username, hashed_password, full_name, email))
             conn.commit()
+            
+            # Yeni öğrenciyi sıralamaya ekle
+            query = adapt_query('SELECT id FROM students WHERE username = ?')
+            c.execute(query, (username,))
+            new_user = c.fetchone()
+        
+        if new_user:
+            record_leaderboard_student_added(new_user['id'])
         
         flash('Kayıt başarılı! Giriş yapabilirsiniz.', 'success')
         return redirect(url_for('login'))
@@ -447,6 +389,7 @@ def google_callback():
                 query = adapt_query('SELECT * FROM students WHERE username = ?')
                 c.execute(query, (username,))
                 new_user = c.fetchone()
+                record_leaderboard_student_added(new_user['id'])
                 
                 session['user_id'] = new_user['id']
                 session['username'] = new_user['username']
@@ -469,114 +412,29 @@ def dashboard():
     student_id = session['user_id']
     
     with get_db() as conn:
-        c = get_cursor(conn)
-        
-        # Son 30 günün çalışma verileri
-        date_func = get_date_function(30)
-        query = adapt_query(f'''
-            SELECT date, SUM(hours) as total_hours, AVG(efficiency) as avg_efficiency
-            FROM study_sessions
-            WHERE student_id = ? AND date >= {date_func}
-            GROUP BY date
-            ORDER BY date DESC
-        ''')
-        c.execute(query, (student_id,))
-        daily_stats = c.fetchall()
-        
-        # Toplam istatistikler
-        query = adapt_query('''
-            SELECT 
-                COUNT(*) as total_sessions,
-                SUM(hours) as total_hours,
-                AVG(efficiency) as avg_efficiency,
-                COUNT(DISTINCT date) as study_days
-            FROM study_sessions
-            WHERE student_id = ?
-        ''')
-        c.execute(query, (student_id,))
-        stats = c.fetchone()
-        
-        # Son çalışma kayıtları
-        query = adapt_query('''
-            SELECT * FROM study_sessions
-            WHERE student_id = ?
-            ORDER BY date DESC, created_at DESC
-            LIMIT 10
-        ''')
-        c.execute(query, (student_id,))
-        recent_sessions = c.fetchall()
-        
-        # Sınav sonuçları
-        query = adapt_query('''
-            SELECT * FROM exam_results
-            WHERE student_id = ?
-            ORDER BY exam_date DESC, created_at DESC
-        ''')
-        c.execute(query, (student_id,))
-        exams = c.fetchall()
-        
-        # Ortalama hesapla
-        query = adapt_query('''
-            SELECT AVG(score * 100.0 / max_score) as avg_percentage
-            FROM exam_results
-            WHERE student_id = ?
-        ''')
-        c.execute(query, (student_id,))
-        avg_result = c.fetchone()
-        
-        # Streak bilgilerini al
-        query = adapt_query('''
-            SELECT current_streak, longest_streak, last_study_date
-            FROM students
-            WHERE id = ?
-        ''')
-        c.execute(query, (student_id,))
-        streak_data = c.fetchone()
-        
-        # Streak değerlerini parse et
-        current_streak = 0
-        longest_streak = 0
-        last_study_date = None
-
-        if streak_data:
-            if isinstance(streak_data, dict):
-                current_streak = streak_data.get('current_streak', 0) or 0
-                longest_streak = streak_data.get('longest_streak', 0) or 0
-                last_study_date = streak_data.get('last_study_date')
-            else:
-                current_streak = streak_data[0] if len(streak_data) > 0 and streak_data[0] else 0
-                longest_streak = streak_data[1] if len(streak_data) > 1 and streak_data[1] else 0
-                last_study_date = streak_data[2] if len(streak_data) > 2 else None
-
-        # Streak kırılma kontrolü (sadece bir kez göster)
-        if not session.get('streak_warning_shown'):
-            if last_study_date and current_streak > 0:
-                from datetime import date, timedelta
-                if isinstance(last_study_date, str):
-                    last_date = datetime.strptime(last_study_date, '%Y-%m-%d').date()
-                else:
-                    last_date = last_study_date if isinstance(last_study_date, date) else last_study_date.date()
-
-                today = date.today()
-                yesterday = today - timedelta(days=1)
-
-                # Eğer son çalışma bugün veya dün değilse, streak tehlikede
-                if last_date < yesterday:
-                    days_since = (today - last_date).days
-                    flash(f'⚠️ Son çalışmanın {days_since} gün önce. Streak\'in sıfırlanmak üzere! Bugün çalış ve serini koru! 🔥', 'warning')
-                    session['streak_warning_shown'] = True
-            elif current_streak == 0 and last_study_date:
-                # Streak zaten kırılmış
-                if not session.get('streak_broken_shown'):
-                    flash('Streak\'in kırıldı ama vazgeçme! Yeni bir seri başlat! 💪', 'info')
-                    session['streak_broken_shown'] = True
+        # Tüm dashboard verileri tek round trip'te (veri sürümü değişmediyse önbellekten)
+        data = get_cached(student_id, get_data_version(get_cursor(conn), student_id),
+                          f'dashboard:{local_today().isoformat()}',
+                          lambda: load_dashboard_data(conn, student_id))
+
+        current_streak = data.current_streak
+        longest_streak = data.longest_streak
+
+    # Süresi dolan streak'ler gece sıfırlandığı için saklanan değer doğrudan kullanılır
+    status = streak_status(current_streak, data.last_study_date)
+    if status == 'at_risk' and not session.get('streak_warning_shown'):
+        flash(f'⚠️ Bugün henüz çalışmadın. {current_streak} günlük streak\'ini korumak için bugün çalış! 🔥', 'warning')
+        session['streak_warning_shown'] = True
+    elif status == 'broken' and not session.get('streak_broken_shown'):
+        flash('Streak\'in kırıldı ama vazgeçme! Yeni bir seri başlat! 💪', 'info')
+        session['streak_broken_shown'] = True
 
     return render_template('dashboard.html',
-                         daily_stats=daily_stats,
-                         stats=stats,
-                         recent_sessions=recent_sessions,
-                         exams=exams,
-                         avg_percentage=avg_result['avg_percentage'] if avg_result['avg_percentage'] else 0,
+                         daily_stats=data.daily_stats,
+                         stats=data.stats,
+                         recent_sessions=data.recent_sessions,
+                         exams=data.exams,
+                         avg_percentage=data.avg_percentage,
                          current_streak=current_streak,
                          longest_streak=longest_streak)
 
@@ -585,72 +443,26 @@ def dashboard():
 def leaderboard():
     """Yarışma/Leaderboard sayfası"""
     try:
-        with get_db() as conn:
-            c = get_cursor(conn)
-            
-            # Admin kontrolü için uyumlu sorgu
-            if USE_SUPABASE:
-                admin_condition = "is_admin = FALSE"
-            else:
-                admin_condition = "is_admin = 0"
-            
-            # Streak leaderboard (current_streak'e göre)
-            # Kolonlar yoksa hata vermemesi için COALESCE kullan
-            query = adapt_query(f'''
-                SELECT 
-                    id, 
-                    username, 
-                    full_name, 
-                    COALESCE(current_streak, 0) as current_streak, 
-                    COALESCE(longest_streak, 0) as longest_streak
-                FROM students
-                WHERE {admin_condition}
-                ORDER BY COALESCE(current_streak, 0) DESC, COALESCE(longest_streak, 0) DESC
-                LIMIT 50
-            ''')
-            c.execute(query)
-            streak_leaderboard = c.fetchall()
-            
-            # Toplam saat leaderboard
-            query = adapt_query(f'''
-                SELECT 
-                    s.id,
-                    s.username,
-                    s.full_name,
-                    COALESCE(SUM(ss.hours), 0) as total_hours,
-                    COUNT(DISTINCT ss.date) as study_days
-                FROM students s
-                LEFT JOIN study_sessions ss ON s.id = ss.student_id
-                WHERE s.{admin_condition}
-                GROUP BY s.id, s.username, s.full_name
-                ORDER BY total_hours DESC
-                LIMIT 50
-            ''')
-            c.execute(query)
-            hours_leaderboard = c.fetchall()
-            
-            # Çalışma sayısı leaderboard
-            query = adapt_query(f'''
-                SELECT 
-                    s.id,
-                    s.username,
-                    s.full_name,
-                    COUNT(ss.id) as total_sessions,
-                    COALESCE(AVG(ss.efficiency), 0) as avg_efficiency
-                FROM students s
-                LEFT JOIN study_sessions ss ON s.id = ss.student_id
-                WHERE s.{admin_condition}
-                GROUP BY s.id, s.username, s.full_name
-                ORDER BY total_sessions DESC
-                LIMIT 50
-            ''')
-            c.execute(query)
-            sessions_leaderboard = c.fetchall()
+        # Hazır snapshot'tan oku (periyodik / yazma sonrası yenilenir)
+        snapshot = get_leaderboard_snapshot()
+        streak_leaderboard = snapshot['streak']
+        hours_leaderboard = snapshot['hours']
+        sessions_leaderboard = snapshot['sessions']
+        
+        # Kullanıcının kendi sırası (ilk 50'de olmasa bile)
+        my_ranks = {}
+        if not session.get('is_admin'):
+            try:
+                my_ranks = get_leaderboard_engine().ranks_for(session['user_id'])
+            except Exception as rank_error:
+                print(f"⚠️  Sıralama hesaplanamadı: {rank_error}")
         
         return render_template('leaderboard.html',
                              streak_leaderboard=streak_leaderboard or [],
                              hours_leaderboard=hours_leaderboard or [],
-                             sessions_leaderboard=sessions_leaderboard or [])
+                             sessions_leaderboard=sessions_leaderboard or [],
+                             generated_at=snapshot['generated_at'],
+                             my_ranks=my_ranks)
     
     except Exception as e:
         import traceback
@@ -696,15 +508,16 @@ def add_study():
             student_id = session.get('user_id')
             with get_db() as conn:
                 c = get_cursor(conn)
-                query = adapt_query('''
-                    INSERT INTO study_sessions (student_id, date, subject, hours, efficiency, notes, difficulties)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''')
-                c.execute(query, (student_id, date, subject, hours, efficiency, notes, difficulties))
+                execute_query(c, STUDY_INSERT, (student_id, date, subject, hours, efficiency, notes, difficulties))
+                record_study_added(c, student_id, date, hours, efficiency)
+                # Streak aynı transaction içinde güncellenir
+                streak_result = apply_study_date(c, student_id, date) or {}
+                bump_data_version(c, student_id)
                 conn.commit()
 
-            # Streak'i güncelle ve sonuca göre mesaj göster
-            streak_result = update_streak(student_id, date)
+            notify_study_change(student_id, hours, 1)
+            if streak_result:
+                record_leaderboard_streak(student_id, streak_result['new_streak'])
 
             # Başarı mesajı
             flash('Çalışma kaydı başarıyla eklendi!', 'success')
@@ -712,10 +525,10 @@ def add_study():
             # Streak durumuna göre ek mesajlar
             if streak_result.get('same_day'):
                 flash(f'Bugün için zaten çalışma kaydın var. Streak {streak_result.get("new_streak")} günde sabit kaldı.', 'info')
-            elif streak_result.get('streak_increased'):
-                flash(f'🔥 Harika! Streak\'in {streak_result.get("new_streak")} güne çıktı!', 'success')
             elif streak_result.get('broken'):
                 flash(f'Streak kırıldı. Yeni başlangıç: {streak_result.get("new_streak")} gün. Vazgeçme! 💪', 'warning')
+            elif streak_result.get('streak_increased'):
+                flash(f'🔥 Harika! Streak\'in {streak_result.get("new_streak")} güne çıktı!', 'success')
 
             return redirect(url_for('dashboard'))
             
@@ -744,12 +557,10 @@ def add_exam():
         
         with get_db() as conn:
             c = get_cursor(conn)
-            query = adapt_query('''
-                INSERT INTO exam_results (student_id, exam_name, score, max_score, exam_date)
-                VALUES (?, ?, ?, ?, ?)
-            ''')
-            c.execute(query, (session['user_id'], exam_name, score, max_score, exam_date))
+            execute_query(c, EXAM_INSERT, (session['user_id'], exam_name, score, max_score, exam_date))
+            bump_data_version(c, session['user_id'])
             conn.commit()
+            invalidate_student_cache(session['user_id'])
         
         flash('Sınav sonucu başarıyla eklendi!', 'success')
         return redirect(url_for('dashboard'))
@@ -770,12 +581,7 @@ def calculate_grade():
         c = get_cursor(conn)
         
         # Mevcut sınav sonuçlarını al
-        query = adapt_query('''
-            SELECT score, max_score FROM exam_results
-            WHERE student_id = ?
-            ORDER BY exam_date DESC, created_at DESC
-        ''')
-        c.execute(query, (session['user_id'],))
+        execute_query(c, EXAM_SCORES, (session['user_id'],))
         exams = c.fetchall()
         
         if not exams:
@@ -821,57 +627,111 @@ def calculate_grade():
         'message': f'Hedef ortalamaya ulaşmak için kalan {remaining_exams} sınavdan ortalama {needed_avg_per_exam:.2f} almanız gerekiyor.'
     })
 
+# /api/stats varsayılan dönem ve dönem tipine göre en uzun aralık (gün)
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = {'day': 366, 'week': 1830, 'month': 3660}
+
+def parse_stats_range():
+    """
+    from, to ve bucket parametrelerini oku
+    
+    Returns:
+        tuple: (from_date, to_date, bucket, subjects_from, subjects_to)
+        Ders toplamları from/to verilmezse eskisi gibi tüm zamanları kapsar
+    
+    Raises:
+        ValueError: Geçersiz tarih, dönem tipi veya çok uzun aralık
+    """
+    bucket = request.args.get('bucket', 'day')
+    if bucket not in STATS_MAX_DAYS:
+        raise ValueError('bucket day, week veya month olmalı')
+    
+    from_arg = request.args.get('from')
+    to_arg = request.args.get('to')
+    try:
+        to_date = datetime.strptime(to_arg, '%Y-%m-%d').date() if to_arg else local_today()
+        from_date = (datetime.strptime(from_arg, '%Y-%m-%d').date() if from_arg
+                     else to_date - timedelta(days=STATS_DEFAULT_DAYS - 1))
+    except ValueError:
+        raise ValueError('Tarihler YYYY-AA-GG formatında olmalı') from None
+    
+    if from_date > to_date:
+        raise ValueError('from tarihi to tarihinden sonra olamaz')
+    if (to_date - from_date).days + 1 > STATS_MAX_DAYS[bucket]:
+        raise ValueError(f'{bucket} için en fazla {STATS_MAX_DAYS[bucket]} günlük aralık seçilebilir')
+    
+    subjects_from = from_date.isoformat() if from_arg else '0001-01-01'
+    subjects_to = to_date.isoformat() if to_arg else '9999-12-31'
+    return from_date.isoformat(), to_date.isoformat(), bucket, subjects_from, subjects_to
+
 @app.route('/api/stats')
 @login_required
 def api_stats():
-    """İstatistik API - grafikler için"""
+    """
+    İstatistik API - grafikler için
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD&bucket=day|week|month (varsayılan: son 30 gün, günlük)
+    Dönem grupları SQL'de hesaplanır, tarih etiketi dönemin ilk günüdür
+    """
     student_id = session['user_id']
     
+    try:
+        from_date, to_date, bucket, subjects_from, subjects_to = parse_stats_range()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
     with get_db() as conn:
         c = get_cursor(conn)
-        
-        # Son 30 günün günlük saatleri
-        date_func = get_date_function(30)
-        query = adapt_query(f'''
-            SELECT date, SUM(hours) as total_hours
-            FROM study_sessions
-            WHERE student_id = ? AND date >= {date_func}
-            GROUP BY date
-            ORDER BY date ASC
-        ''')
-        c.execute(query, (student_id,))
-        daily_hours = c.fetchall()
-        
-        # Ders bazında toplam saatler
-        query = adapt_query('''
-            SELECT subject, SUM(hours) as total_hours
-            FROM study_sessions
-            WHERE student_id = ?
-            GROUP BY subject
-            ORDER BY total_hours DESC
-            LIMIT 10
-        ''')
-        c.execute(query, (student_id,))
-        subject_hours = c.fetchall()
-        
-        # Verimlilik trendi (günlük ortalama - son 30 gün)
-        query = adapt_query(f'''
-            SELECT 
-                date,
-                AVG(efficiency) as avg_efficiency
-            FROM study_sessions
-            WHERE student_id = ? AND date >= {date_func}
-            GROUP BY date
-            ORDER BY date ASC
-        ''')
-        c.execute(query, (student_id,))
-        efficiency_trend = c.fetchall()
+        # Veri değişmediyse (aynı sürüm ve aralık) sorgusuz 304
+        version = get_data_version(c, student_id)
+        etag, last_modified = cache_validators(student_id, version,
+                                               from_date, to_date, bucket, subjects_from, subjects_to)
+        cached = not_modified_response(etag, last_modified)
+        if cached:
+            return cached
+        
+        payload = get_cached(student_id, version,
+                             f'stats:{from_date}:{to_date}:{bucket}:{subjects_from}:{subjects_to}',
+                             lambda: load_stats(c, student_id, from_date, to_date, bucket, subjects_from, subjects_to))
     
-    return jsonify({
-        'daily_hours': [{'date': row['date'], 'hours': float(row['total_hours']) if row['total_hours'] else 0} for row in daily_hours],
-        'subject_hours': [{'subject': row['subject'], 'hours': float(row['total_hours']) if row['total_hours'] else 0} for row in subject_hours],
-        'efficiency_trend': [{'date': row['date'], 'efficiency': float(row['avg_efficiency']) if row['avg_efficiency'] else 0} for row in efficiency_trend]
-    })
+    return with_validators(jsonify(payload), etag, last_modified)
+
+def load_stats(c, student_id, from_date, to_date, bucket, subjects_from, subjects_to):
+    """/api/stats yanıtını tek sorguyla oluştur"""
+    execute_query(c, STATS_BY_BUCKET[bucket],
+                  (student_id, from_date, to_date, student_id, subjects_from, subjects_to))
+    rows = c.fetchall()
+    
+    buckets = sorted((row for row in rows if row['kind'] == 'bucket'), key=lambda row: row['label'])
+    subjects = sorted((row for row in rows if row['kind'] == 'subject'), key=lambda row: -(row['hours'] or 0))
+    
+    return {
+        'from': from_date,
+        'to': to_date,
+        'bucket': bucket,
+        'daily_hours': [{'date': row['label'], 'hours': float(row['hours']) if row['hours'] else 0} for row in buckets],
+        'subject_hours': [{'subject': row['label'], 'hours': float(row['hours']) if row['hours'] else 0} for row in subjects],
+        'efficiency_trend': [{'date': row['label'], 'efficiency': float(row['efficiency']) if row['efficiency'] else 0} for row in buckets]
+    }
+
+def export_response(filters):
+    """Dışa aktarımı parça parça gönder (bağlantı indirme bitene kadar tutulur)"""
+    response = Response(stream_with_context(stream_export(filters)), mimetype=EXPORT_FORMATS[filters['format']])
+    response.headers['Content-Disposition'] = f'attachment; filename={export_filename(filters)}'
+    return response
+
+@app.route('/export')
+@login_required
+def export():
+    """
+    Öğrencinin kendi kayıtlarını dışa aktar
+    ?kind=sessions|exams&format=csv|ndjson&from=YYYY-MM-DD&to=YYYY-MM-DD&subject=...
+    """
+    try:
+        filters = parse_export_args(request.args, student_id=session['user_id'])
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return export_response(filters)
 
 @app.route('/update-study/<int:session_id>', methods=['POST'])
 @login_required
@@ -904,8 +764,7 @@ def update_study(session_id):
             c = get_cursor(conn)
             
             # Önce kaydın bu öğrenciye ait olduğunu kontrol et
-            query = adapt_query('SELECT student_id FROM study_sessions WHERE id = ?')
-            c.execute(query, (session_id,))
+            execute_query(c, STUDY_SELECT_FOR_WRITE, (session_id,))
             study_record = c.fetchone()
             
             if not study_record:
@@ -915,15 +774,20 @@ def update_study(session_id):
                 return jsonify({'success': False, 'error': 'Bu kaydı güncelleme yetkiniz yok'}), 403
             
             # Kaydı güncelle
-            query = adapt_query('''
-                UPDATE study_sessions 
-                SET date = ?, subject = ?, hours = ?, efficiency = ?, notes = ?, difficulties = ?
-                WHERE id = ? AND student_id = ?
-            ''')
-            c.execute(query, (date, subject, hours, efficiency, notes, difficulties, session_id, session.get('user_id')))
+            execute_query(c, STUDY_UPDATE, (date, subject, hours, efficiency, notes, difficulties, session_id, session.get('user_id')))
+            updated = c.rowcount
+            streak_changes = []
+            if updated > 0:
+                record_study_updated(c, study_record['student_id'], study_record, date, hours, efficiency)
+                # Tarih değiştiyse streak artımlı hesaplanamaz - çalışma günlerinden yeniden hesapla
+                if str(study_record['date']) != date:
+                    streak_changes = recompute_streaks(c, study_record['student_id'])
+                bump_data_version(c, study_record['student_id'])
             conn.commit()
+            if updated > 0:
+                notify_study_change(study_record['student_id'], hours - study_record['hours'], 0, streak_changes)
             
-            if c.rowcount > 0:
+            if updated > 0:
                 return jsonify({'success': True, 'message': 'Çalışma kaydı başarıyla güncellendi!'})
             else:
                 return jsonify({'success': False, 'error': 'Kayıt güncellenemedi!'}), 500
@@ -943,8 +807,7 @@ def get_study(session_id):
             c = get_cursor(conn)
             
             # Önce kaydın bu öğrenciye ait olduğunu kontrol et
-            query = adapt_query('SELECT * FROM study_sessions WHERE id = ?')
-            c.execute(query, (session_id,))
+            execute_query(c, STUDY_SELECT, (session_id,))
             study_record = c.fetchone()
             
             if not study_record:
@@ -953,8 +816,13 @@ def get_study(session_id):
             if study_record['student_id'] != session.get('user_id'):
                 return jsonify({'success': False, 'error': 'Bu kaydı görüntüleme yetkiniz yok'}), 403
             
+            etag, last_modified = cache_validators(study_record['student_id'], study_record, session_id)
+            cached = not_modified_response(etag, last_modified)
+            if cached:
+                return cached
+            
             # Veriyi döndür
-            return jsonify({
+            return with_validators(jsonify({
                 'success': True,
                 'data': {
                     'id': study_record['id'],
@@ -965,7 +833,7 @@ def get_study(session_id):
                     'notes': study_record['notes'] or '',
                     'difficulties': study_record['difficulties'] or ''
                 }
-            })
+            }), etag, last_modified)
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -979,8 +847,7 @@ def delete_study(session_id):
             c = get_cursor(conn)
             
             # Önce kaydın bu öğrenciye ait olduğunu kontrol et
-            query = adapt_query('SELECT student_id FROM study_sessions WHERE id = ?')
-            c.execute(query, (session_id,))
+            execute_query(c, STUDY_SELECT_FOR_WRITE, (session_id,))
             study_record = c.fetchone()
             
             if not study_record:
@@ -990,9 +857,17 @@ def delete_study(session_id):
                 return jsonify({'success': False, 'error': 'Bu kaydı silme yetkiniz yok'}), 403
             
             # Kaydı sil
-            query = adapt_query('DELETE FROM study_sessions WHERE id = ? AND student_id = ?')
-            c.execute(query, (session_id, session.get('user_id')))
+            execute_query(c, STUDY_DELETE, (session_id, session.get('user_id')))
+            deleted = c.rowcount
+            streak_changes = []
+            if deleted > 0:
+                record_study_removed(c, study_record['student_id'], study_record['date'],
+                                     study_record['hours'], study_record['efficiency'])
+                streak_changes = recompute_streaks(c, study_record['student_id'])
+                bump_data_version(c, study_record['student_id'])
             conn.commit()
+            if deleted > 0:
+                notify_study_change(study_record['student_id'], -study_record['hours'], -1, streak_changes)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -1007,8 +882,7 @@ def delete_exam(exam_id):
             c = get_cursor(conn)
             
             # Önce kaydın bu öğrenciye ait olduğunu kontrol et
-            query = adapt_query('SELECT student_id FROM exam_results WHERE id = ?')
-            c.execute(query, (exam_id,))
+            execute_query(c, EXAM_SELECT_OWNER, (exam_id,))
             exam_record = c.fetchone()
             
             if not exam_record:
@@ -1018,59 +892,77 @@ def delete_exam(exam_id):
                 return jsonify({'success': False, 'error': 'Bu kaydı silme yetkiniz yok'}), 403
             
             # Kaydı sil
-            query = adapt_query('DELETE FROM exam_results WHERE id = ? AND student_id = ?')
-            c.execute(query, (exam_id, session.get('user_id')))
+            execute_query(c, EXAM_DELETE, (exam_id, session.get('user_id')))
+            if c.rowcount > 0:
+                bump_data_version(c, session.get('user_id'))
             conn.commit()
+            invalidate_student_cache(session.get('user_id'))
         
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Admin listesi sayfa boyutu (sıralama seçenekleri: queries.ADMIN_SORT_COLUMNS)
+ADMIN_PER_PAGE_DEFAULT = 24
+ADMIN_PER_PAGE_MAX = 100
+
 @app.route('/admin')
 @admin_required
 def admin_dashboard():
-    """Admin paneli - tüm öğrencilerin verilerini gör"""
+    """Admin paneli - öğrenci listesi (sayfalı, sıralanabilir, aranabilir)"""
+    search = request.args.get('q', '').strip()
+    sort = request.args.get('sort', 'name')
+    if sort not in ADMIN_SORT_COLUMNS:
+        sort = 'name'
+    order = 'asc' if request.args.get('order', 'asc') == 'asc' else 'desc'
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
+    per_page = min(max(request.args.get('per_page', ADMIN_PER_PAGE_DEFAULT, type=int) or ADMIN_PER_PAGE_DEFAULT, 1), ADMIN_PER_PAGE_MAX)
+    
+    params = []
+    if search:
+        pattern = f'%{search.lower()}%'
+        params.extend([pattern, pattern, pattern])
+    count_query, page_query = admin_student_list_queries(sort, order, search)
+    
     with get_db() as conn:
         c = get_cursor(conn)
         
-        # Tüm öğrenciler
-        if USE_SUPABASE:
-            query = 'SELECT * FROM students WHERE is_admin = FALSE ORDER BY full_name'
-        else:
-            query = 'SELECT * FROM students WHERE is_admin = 0 ORDER BY full_name'
-        c.execute(query)
+        # Toplam öğrenci sayısı (sayfalama için)
+        c.execute(count_query, params)
+        total = c.fetchone()['total']
+        
+        # Sadece bu sayfadaki öğrenciler + sınav ortalamaları tek sorguda
+        c.execute(page_query, params + [per_page, (page - 1) * per_page])
         students = c.fetchall()
+    
+    student_stats = []
+    for student in students:
+        # Toplamlar students satırındaki sayaçlardan
+        total_sessions = student['total_sessions'] or 0
+        stats = {
+            'total_sessions': total_sessions,
+            'total_hours': student['total_hours'] or 0,
+            'avg_efficiency': (student['efficiency_sum'] or 0) / total_sessions if total_sessions else 0,
+            'study_days': student['study_days'] or 0
+        }
         
-        # Her öğrenci için istatistikler
-        student_stats = []
-        for student in students:
-            query = adapt_query('''
-                SELECT 
-                    COUNT(*) as total_sessions,
-                    SUM(hours) as total_hours,
-                    AVG(efficiency) as avg_efficiency,
-                    COUNT(DISTINCT date) as study_days
-                FROM study_sessions
-                WHERE student_id = ?
-            ''')
-            c.execute(query, (student['id'],))
-            stats = c.fetchone()
-            
-            query = adapt_query('''
-                SELECT AVG(score * 100.0 / max_score) as avg_percentage
-                FROM exam_results
-                WHERE student_id = ?
-            ''')
-            c.execute(query, (student['id'],))
-            exam_avg = c.fetchone()
-            
-            student_stats.append({
-                'student': student,
-                'stats': stats,
-                'exam_avg': exam_avg['avg_percentage'] if exam_avg and exam_avg['avg_percentage'] else 0
-            })
+        student_stats.append({
+            'student': student,
+            'stats': stats,
+            'exam_avg': student['avg_percentage'] or 0
+        })
+    
+    pagination = {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': max((total + per_page - 1) // per_page, 1),
+        'sort': sort,
+        'order': order,
+        'q': search
+    }
     
-    return render_template('admin_dashboard.html', student_stats=student_stats)
+    return render_template('admin_dashboard.html', student_stats=student_stats, pagination=pagination)
 
 @app.route('/admin/student/<int:student_id>')
 @admin_required
@@ -1087,25 +979,66 @@ def admin_student_detail(student_id):
             flash('Öğrenci bulunamadı!', 'error')
             return redirect(url_for('admin_dashboard'))
         
-        # Çalışma kayıtları
-        query = adapt_query('''
-            SELECT * FROM study_sessions
-            WHERE student_id = ?
-            ORDER BY date DESC, created_at DESC
-        ''')
-        c.execute(query, (student_id,))
-        sessions = c.fetchall()
-        
-        # Sınav sonuçları
-        query = adapt_query('''
-            SELECT * FROM exam_results
-            WHERE student_id = ?
-            ORDER BY exam_date DESC, created_at DESC
-        ''')
-        c.execute(query, (student_id,))
-        exams = c.fetchall()
+        # İlk sayfalar - devamı /admin/student/<id>/history ile yüklenir
+        sessions, sessions_cursor = load_sessions_page(c, student_id)
+        exams, exams_cursor = load_exams_page(c, student_id)
+    
+    return render_template('admin_student_detail.html', student=student,
+                           sessions=sessions, sessions_cursor=sessions_cursor,
+                           exams=exams, exams_cursor=exams_cursor)
+
+def _history_value(value):
+    """Tarih değerlerini JSON için metne çevir (PostgreSQL date/datetime döner)"""
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+@app.route('/admin/student/<int:student_id>/history')
+@admin_required
+def admin_student_history(student_id):
+    """
+    Admin - öğrenci geçmişinin sonraki sayfası (sonsuz kaydırma için)
+    ?kind=sessions|exams&cursor=...&limit=50
+    """
+    kind = request.args.get('kind', 'sessions')
+    if kind not in ('sessions', 'exams'):
+        return jsonify({'success': False, 'error': 'kind sessions veya exams olmalı'}), 400
+    
+    try:
+        limit = min(max(int(request.args.get('limit', HISTORY_PAGE_SIZE)), 1), HISTORY_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = HISTORY_PAGE_SIZE
+    
+    try:
+        with get_db() as conn:
+            c = get_cursor(conn)
+            load_page = load_sessions_page if kind == 'sessions' else load_exams_page
+            rows, next_cursor = load_page(c, student_id, request.args.get('cursor') or None, limit)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    if kind == 'sessions':
+        columns = ('id', 'date', 'subject', 'hours', 'efficiency', 'notes', 'difficulties')
+    else:
+        columns = ('id', 'exam_name', 'score', 'max_score', 'exam_date')
+    
+    return jsonify({
+        'success': True,
+        'items': [{column: _history_value(row[column]) for column in columns} for row in rows],
+        'next_cursor': next_cursor
+    })
+
+@app.route('/admin/export')
+@admin_required
+def admin_export():
+    """
+    Admin - tüm öğrencilerin (veya student_id ile tek öğrencinin) kayıtlarını dışa aktar
+    ?kind=sessions|exams&format=csv|ndjson&student_id=...&from=...&to=...&subject=...
+    """
+    try:
+        filters = parse_export_args(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     
-    return render_template('admin_student_detail.html', student=student, sessions=sessions, exams=exams)
+    return export_response(filters)
 
 @app.route('/admin/study/<int:session_id>/update', methods=['POST'])
 @admin_required
@@ -1138,9 +1071,9 @@ def admin_update_study(session_id):
             c = get_cursor(conn)
             
             # Kaydın var olduğunu kontrol et
-            query = adapt_query('SELECT id FROM study_sessions WHERE id = ?')
-            c.execute(query, (session_id,))
-            if not c.fetchone():
+            execute_query(c, STUDY_SELECT_FOR_WRITE, (session_id,))
+            study_record = c.fetchone()
+            if not study_record:
                 return jsonify({'success': False, 'error': 'Kayıt bulunamadı'}), 404
             
             # Kaydı güncelle
@@ -1150,9 +1083,19 @@ def admin_update_study(session_id):
                 WHERE id = ?
             ''')
             c.execute(query, (date, subject, hours, efficiency, notes, difficulties, session_id))
+            updated = c.rowcount
+            streak_changes = []
+            if updated > 0:
+                record_study_updated(c, study_record['student_id'], study_record, date, hours, efficiency)
+                # Tarih değiştiyse streak artımlı hesaplanamaz - çalışma günlerinden yeniden hesapla
+                if str(study_record['date']) != date:
+                    streak_changes = recompute_streaks(c, study_record['student_id'])
+                bump_data_version(c, study_record['student_id'])
             conn.commit()
+            if updated > 0:
+                notify_study_change(study_record['student_id'], hours - study_record['hours'], 0, streak_changes)
             
-            if c.rowcount > 0:
+            if updated > 0:
                 return jsonify({'success': True, 'message': 'Çalışma kaydı başarıyla güncellendi!'})
             else:
                 return jsonify({'success': False, 'error': 'Kayıt güncellenemedi!'}), 500
@@ -1171,8 +1114,7 @@ def admin_get_study(session_id):
         with get_db() as conn:
             c = get_cursor(conn)
             
-            query = adapt_query('SELECT * FROM study_sessions WHERE id = ?')
-            c.execute(query, (session_id,))
+            execute_query(c, STUDY_SELECT, (session_id,))
             study_record = c.fetchone()
             
             if not study_record:
@@ -1235,10 +1177,14 @@ def admin_add_study(student_id):
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''')
             c.execute(query, (student_id, date, subject, hours, efficiency, notes, difficulties))
+            record_study_added(c, student_id, date, hours, efficiency)
+            streak_result = apply_study_date(c, student_id, date)
+            bump_data_version(c, student_id)
             conn.commit()
 
-            # Streak'i güncelle
-            update_streak(student_id, date)
+            notify_study_change(student_id, hours, 1)
+            if streak_result:
+                record_leaderboard_streak(student_id, streak_result['new_streak'])
 
             return jsonify({'success': True, 'message': 'Çalışma kaydı başarıyla eklendi!'})
         
@@ -1273,9 +1219,10 @@ def admin_update_exam(exam_id):
             c = get_cursor(conn)
             
             # Kaydın var olduğunu kontrol et
-            query = adapt_query('SELECT id FROM exam_results WHERE id = ?')
+            query = adapt_query('SELECT student_id FROM exam_results WHERE id = ?')
             c.execute(query, (exam_id,))
-            if not c.fetchone():
+            exam_record = c.fetchone()
+            if not exam_record:
                 return jsonify({'success': False, 'error': 'Kayıt bulunamadı'}), 404
             
             # Kaydı güncelle
@@ -1285,9 +1232,14 @@ def admin_update_exam(exam_id):
                 WHERE id = ?
             ''')
             c.execute(query, (exam_name, score, max_score, exam_date if exam_date else None, exam_id))
+            updated = c.rowcount
+            if updated > 0:
+                bump_data_version(c, exam_record['student_id'])
             conn.commit()
+            if updated > 0:
+                invalidate_student_cache(exam_record['student_id'])
             
-            if c.rowcount > 0:
+            if updated > 0:
                 return jsonify({'success': True, 'message': 'Sınav sonucu başarıyla güncellendi!'})
             else:
                 return jsonify({'success': False, 'error': 'Kayıt güncellenemedi!'}), 500
@@ -1362,7 +1314,9 @@ def admin_add_exam(student_id):
                 VALUES (?, ?, ?, ?, ?)
             ''')
             c.execute(query, (student_id, exam_name, score, max_score, exam_date if exam_date else None))
+            bump_data_version(c, student_id)
             conn.commit()
+            invalidate_student_cache(student_id)
             
             return jsonify({'success': True, 'message': 'Sınav sonucu başarıyla eklendi!'})
         
@@ -1408,6 +1362,9 @@ def delete_student(student_id):
             
             # Silinen kayıt sayısını kontrol et
             if c.rowcount > 0:
+                invalidate_student_cache(student_id)
+                mark_leaderboard_dirty()
+                record_leaderboard_student_removed(student_id)
                 flash(f'Öğrenci ({student["username"]}) başarıyla silindi!', 'success')
                 return jsonify({'success': True, 'message': 'Öğrenci başarıyla silindi!'})
             else:
@@ -1421,22 +1378,51 @@ def delete_student(student_id):
 
 # DERS PROGRAMI ROUTE'LARI
 
+# Ders programı sayfalarında gösterilen tamamlama geçmişi (hafta)
+SCHEDULE_COMPLETION_WEEKS = int(os.environ.get('SCHEDULE_COMPLETION_WEEKS', 4))
+SCHEDULE_COMPLETION_WEEKS_MAX = 52
+
+def get_completion_weeks():
+    """?weeks= parametresinden tamamlama penceresini al (1-52 hafta)"""
+    weeks = request.args.get('weeks', SCHEDULE_COMPLETION_WEEKS, type=int) or SCHEDULE_COMPLETION_WEEKS
+    return min(max(weeks, 1), SCHEDULE_COMPLETION_WEEKS_MAX)
+
+def load_schedule_completions(c, schedule_id, schedule_items, weeks):
+    """
+    Programın tüm öğeleri için tamamlama kayıtlarını tek sorguda al
+    
+    Returns:
+        dict: {schedule_item_id: [completion, ...]} (tarihe göre azalan)
+    """
+    today_date = local_today()
+    start_date = today_date - timedelta(weeks=weeks)
+    
+    execute_query(c, SCHEDULE_COMPLETIONS_RANGE, (schedule_id, str(start_date), str(today_date)))
+    
+    completions = {item['id']: [] for item in schedule_items}
+    for comp in c.fetchall():
+        comp_dict = dict(comp)
+        # SQLite için boolean dönüşümü
+        if not USE_SUPABASE:
+            comp_dict['is_completed'] = bool(comp_dict['is_completed'])
+        # Şablonlar tarihi 'YYYY-MM-DD' metniyle karşılaştırır
+        comp_dict['completion_date'] = str(comp_dict['completion_date'])
+        completions.setdefault(comp_dict['schedule_item_id'], []).append(comp_dict)
+    
+    return completions
+
 @app.route('/schedule')
 @login_required
 def schedule():
     """Öğrenci ders programı sayfası"""
     student_id = session['user_id']
+    weeks = get_completion_weeks()
     
     with get_db() as conn:
         c = get_cursor(conn)
         
         # Öğrencinin ders programlarını al
-        query = adapt_query('''
-            SELECT * FROM schedules
-            WHERE student_id = ?
-            ORDER BY created_at DESC
-        ''')
-        c.execute(query, (student_id,))
+        execute_query(c, SCHEDULE_LIST, (student_id,))
         schedules = c.fetchall()
         
         # Aktif program varsa onu al
@@ -1448,44 +1434,22 @@ def schedule():
             active_schedule = schedules[0]  # En son oluşturulan program
             
             # Program öğelerini al
-            query = adapt_query('''
-                SELECT * FROM schedule_items
-                WHERE schedule_id = ?
-                ORDER BY day_of_week, start_time
-            ''')
-            c.execute(query, (active_schedule['id'],))
+            execute_query(c, SCHEDULE_ITEMS, (active_schedule['id'],))
             schedule_items = c.fetchall()
             
-            # Tamamlama durumlarını al (bugün ve geçmiş)
-            from datetime import date
-            today_date = date.today()
-            
-            for item in schedule_items:
-                query = adapt_query('''
-                    SELECT * FROM schedule_completions
-                    WHERE schedule_item_id = ? AND completion_date <= ?
-                    ORDER BY completion_date DESC
-                ''')
-                c.execute(query, (item['id'], today_date))
-                item_completions = c.fetchall()
-                # SQLite için boolean dönüşümü
-                processed_completions = []
-                for comp in item_completions:
-                    comp_dict = dict(comp)
-                    if not USE_SUPABASE:
-                        comp_dict['is_completed'] = bool(comp_dict['is_completed'])
-                    processed_completions.append(comp_dict)
-                completions[item['id']] = processed_completions
-    
-    from datetime import date
-    today = str(date.today())
+            # Tamamlama durumlarını al (tüm öğeler için tek sorgu, son N hafta)
+            completions = load_schedule_completions(c, active_schedule['id'], schedule_items, weeks)
+    
+    today_date = local_today()
     
     return render_template('schedule.html', 
                          schedules=schedules,
                          active_schedule=active_schedule,
                          schedule_items=schedule_items,
                          completions=completions,
-                         today=today)
+                         completion_weeks=weeks,
+                         today=str(today_date),
+                         today_weekday=today_date.weekday())
 
 @app.route('/schedule/create', methods=['GET', 'POST'])
 @login_required
@@ -1506,39 +1470,21 @@ def create_schedule():
             with get_db() as conn:
                 c = get_cursor(conn)
                 
-                # Program oluştur
+                # Program oluştur (öğelerle aynı transaction'da)
                 query = adapt_query('''
                     INSERT INTO schedules (student_id, name, description)
                     VALUES (?, ?, ?)
+                    RETURNING id
                 ''')
                 c.execute(query, (student_id, name, description))
-                conn.commit()
-                
-                # Yeni oluşturulan program ID'sini al
-                if USE_SUPABASE:
-                    c.execute('SELECT LASTVAL()')
-                else:
-                    c.execute('SELECT last_insert_rowid()')
-                schedule_id = c.fetchone()[0]
+                schedule_id = c.fetchone()['id']
                 
-                # Program öğelerini ekle
-                for item in items:
-                    query = adapt_query('''
-                        INSERT INTO schedule_items 
-                        (schedule_id, day_of_week, start_time, end_time, subject, location, instructor)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''')
-                    c.execute(query, (
-                        schedule_id,
-                        int(item.get('day_of_week', 0)),
-                        item.get('start_time', ''),
-                        item.get('end_time', ''),
-                        item.get('subject', ''),
-                        item.get('location', ''),
-                        item.get('instructor', '')
-                    ))
+                # Program öğelerini tek seferde ekle
+                sync_schedule_items(c, schedule_id, items)
                 
+                bump_data_version(c, student_id)
                 conn.commit()
+                invalidate_student_cache(student_id)
             
             return jsonify({'success': True, 'schedule_id': schedule_id})
         except Exception as e:
@@ -1583,36 +1529,56 @@ def update_schedule(schedule_id):
             ''')
             c.execute(query, (name, description, schedule_id))
             
-            # Eski öğeleri sil
-            query = adapt_query('DELETE FROM schedule_items WHERE schedule_id = ?')
-            c.execute(query, (schedule_id,))
-            
-            # Yeni öğeleri ekle
-            for item in items:
-                query = adapt_query('''
-                    INSERT INTO schedule_items 
-                    (schedule_id, day_of_week, start_time, end_time, subject, location, instructor)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''')
-                c.execute(query, (
-                    schedule_id,
-                    int(item.get('day_of_week', 0)),
-                    item.get('start_time', ''),
-                    item.get('end_time', ''),
-                    item.get('subject', ''),
-                    item.get('location', ''),
-                    item.get('instructor', '')
-                ))
+            # Öğeleri fark bazlı güncelle (değişmeyenlerin id'si ve tamamlama geçmişi korunur)
+            changes = sync_schedule_items(c, schedule_id, items)
             
+            bump_data_version(c, student_id)
             conn.commit()
+            invalidate_student_cache(student_id)
         
-        return jsonify({'success': True})
+        return jsonify({'success': True, 'changes': changes})
     except Exception as e:
         import traceback
         print(f"HATA: {str(e)}")
         print(traceback.format_exc())
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def load_active_schedule(c, student_id):
+    """Öğrencinin aktif programı ve öğeleri (admin düzenleme ekranı için)"""
+    # Öğrencinin aktif programını bul
+    execute_query(c, SCHEDULE_LATEST, (student_id,))
+    schedule = c.fetchone()
+    
+    if not schedule:
+        return {'success': True, 'schedule': None, 'items': []}
+    
+    # Program öğelerini al
+    execute_query(c, SCHEDULE_ITEMS, (schedule['id'],))
+    items = c.fetchall()
+    
+    # Items'ı dict formatına çevir
+    items_list = []
+    for item in items:
+        items_list.append({
+            'id': item['id'],
+            'day_of_week': item['day_of_week'],
+            'start_time': item['start_time'],
+            'end_time': item['end_time'],
+            'subject': item['subject'],
+            'location': item['location'] or '',
+            'instructor': item['instructor'] or ''
+        })
+    
+    return {
+        'success': True,
+        'schedule': {
+            'id': schedule['id'],
+            'name': schedule['name'],
+            'description': schedule['description'] or ''
+        },
+        'items': items_list
+    }
+
 @app.route('/admin/schedule/<int:student_id>/data')
 @admin_required
 def admin_get_schedule_data(student_id):
@@ -1621,40 +1587,17 @@ def admin_get_schedule_data(student_id):
         with get_db() as conn:
             c = get_cursor(conn)
             
-            # Öğrencinin aktif programını bul
-            query = adapt_query('SELECT * FROM schedules WHERE student_id = ? ORDER BY created_at DESC LIMIT 1')
-            c.execute(query, (student_id,))
-            schedule = c.fetchone()
-            
-            if not schedule:
-                return jsonify({'success': True, 'schedule': None, 'items': []})
-            
-            # Program öğelerini al
-            query = adapt_query('SELECT * FROM schedule_items WHERE schedule_id = ? ORDER BY day_of_week, start_time')
-            c.execute(query, (schedule['id'],))
-            items = c.fetchall()
-            
-            # Items'ı dict formatına çevir
-            items_list = []
-            for item in items:
-                items_list.append({
-                    'day_of_week': item['day_of_week'],
-                    'start_time': item['start_time'],
-                    'end_time': item['end_time'],
-                    'subject': item['subject'],
-                    'location': item['location'] or '',
-                    'instructor': item['instructor'] or ''
-                })
+            # Öğrencinin verisi değişmediyse sorgusuz 304
+            version = get_data_version(c, student_id)
+            etag, last_modified = cache_validators(student_id, version)
+            cached = not_modified_response(etag, last_modified)
+            if cached:
+                return cached
             
-            return jsonify({
-                'success': True,
-                'schedule': {
-                    'id': schedule['id'],
-                    'name': schedule['name'],
-                    'description': schedule['description'] or ''
-                },
-                'items': items_list
-            })
+            payload = get_cached(student_id, version, 'schedule:active',
+                                 lambda: load_active_schedule(c, student_id))
+        
+        return with_validators(jsonify(payload), etag, last_modified)
     
     except Exception as e:
         import traceback
@@ -1662,6 +1605,24 @@ def admin_get_schedule_data(student_id):
         print(traceback.format_exc())
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def load_schedule(c, schedule):
+    """Program ve öğeleri (öğrencinin düzenleme ekranı için)"""
+    # Program öğeleri
+    execute_query(c, SCHEDULE_ITEMS, (schedule['id'],))
+    items = c.fetchall()
+    
+    # SQLite için boolean dönüşümü
+    items_list = []
+    for item in items:
+        item_dict = dict(item)
+        items_list.append(item_dict)
+    
+    return {
+        'success': True,
+        'schedule': dict(schedule),
+        'items': items_list
+    }
+
 @app.route('/schedule/<int:schedule_id>/data')
 @login_required
 def get_schedule_data(schedule_id):
@@ -1683,26 +1644,16 @@ def get_schedule_data(schedule_id):
             if schedule['student_id'] != student_id:
                 return jsonify({'success': False, 'error': 'Bu programı görüntüleme yetkiniz yok!'}), 403
             
-            # Program öğeleri
-            query = adapt_query('''
-                SELECT * FROM schedule_items
-                WHERE schedule_id = ?
-                ORDER BY day_of_week, start_time
-            ''')
-            c.execute(query, (schedule_id,))
-            items = c.fetchall()
+            version = get_data_version(c, student_id)
+            etag, last_modified = cache_validators(student_id, version, schedule_id)
+            cached = not_modified_response(etag, last_modified)
+            if cached:
+                return cached
             
-            # SQLite için boolean dönüşümü
-            items_list = []
-            for item in items:
-                item_dict = dict(item)
-                items_list.append(item_dict)
+            payload = get_cached(student_id, version, f'schedule:{schedule_id}',
+                                 lambda: load_schedule(c, schedule))
         
-        return jsonify({
-            'success': True,
-            'schedule': dict(schedule),
-            'items': items_list
-        })
+        return with_validators(jsonify(payload), etag, last_modified)
     except Exception as e:
         import traceback
         print(f"HATA: {str(e)}")
@@ -1733,24 +1684,44 @@ def delete_schedule(schedule_id):
             # Programı sil (CASCADE ile öğeler de silinir)
             query = adapt_query('DELETE FROM schedules WHERE id = ?')
             c.execute(query, (schedule_id,))
+            bump_data_version(c, student_id)
             conn.commit()
+            invalidate_student_cache(student_id)
         
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Toplu tamamlama isteğinde en fazla kayıt
+SCHEDULE_COMPLETIONS_MAX_BATCH = 500
+
+def parse_completion(data):
+    """
+    İstekteki tamamlama kaydını (completion_date, is_completed, notes) olarak al
+
+    Raises:
+        ValueError: Geçersiz tarih
+    """
+    # Gün sınırı streak'lerle aynı saat diliminde (STREAK_TIMEZONE)
+    completion_date = data.get('date') or local_today().isoformat()
+    try:
+        completion_date = datetime.strptime(completion_date, '%Y-%m-%d').date().isoformat()
+    except (TypeError, ValueError):
+        raise ValueError('Tarih YYYY-AA-GG formatında olmalı') from None
+    
+    is_completed = bool(data.get('is_completed', True))
+    # SQLite için boolean dönüşümü
+    completed_value = is_completed if USE_SUPABASE else int(is_completed)
+    return completion_date, completed_value, data.get('notes', '') or ''
+
 @app.route('/schedule/item/<int:item_id>/complete', methods=['POST'])
 @login_required
 def complete_schedule_item(item_id):
-    """Ders programı öğesini tamamla"""
-    data = request.get_json()
-    completion_date = data.get('date', '')
-    is_completed = data.get('is_completed', True)
-    notes = data.get('notes', '')
-    
-    if not completion_date:
-        from datetime import date
-        completion_date = str(date.today())
+    """Ders programı öğesini tamamla (aynı gün için tek kayıt, varsa güncellenir)"""
+    try:
+        completion_date, completed_value, notes = parse_completion(request.get_json() or {})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     
     student_id = session['user_id']
     
@@ -1758,58 +1729,19 @@ def complete_schedule_item(item_id):
         with get_db() as conn:
             c = get_cursor(conn)
             
-            # Öğenin öğrenciye ait olduğunu kontrol et
-            query = adapt_query('''
-                SELECT s.student_id 
-                FROM schedule_items si
-                JOIN schedules s ON si.schedule_id = s.id
-                WHERE si.id = ?
-            ''')
-            c.execute(query, (item_id,))
-            result = c.fetchone()
-            
-            if not result:
-                return jsonify({'success': False, 'error': 'Ders bulunamadı!'}), 404
+            # Sahiplik kontrolü ve upsert tek ifadede
+            execute_query(c, COMPLETION_UPSERT, (completion_date, completed_value, notes, item_id, student_id))
             
-            if result['student_id'] != student_id:
+            if c.rowcount == 0:
+                # Yazılmadıysa öğe yok ya da başka öğrencinin
+                execute_query(c, COMPLETION_ITEM_OWNER, (item_id,))
+                if not c.fetchone():
+                    return jsonify({'success': False, 'error': 'Ders bulunamadı!'}), 404
                 return jsonify({'success': False, 'error': 'Bu dersi işaretleme yetkiniz yok!'}), 403
             
-            # Tamamlama durumunu kontrol et (aynı tarih için)
-            query = adapt_query('''
-                SELECT id FROM schedule_completions
-                WHERE schedule_item_id = ? AND completion_date = ?
-            ''')
-            c.execute(query, (item_id, completion_date))
-            existing = c.fetchone()
-            
-            if existing:
-                # Güncelle
-                if USE_SUPABASE:
-                    completed_value = is_completed
-                else:
-                    completed_value = 1 if is_completed else 0
-                
-                query = adapt_query('''
-                    UPDATE schedule_completions
-                    SET is_completed = ?, notes = ?
-                    WHERE id = ?
-                ''')
-                c.execute(query, (completed_value, notes, existing['id']))
-            else:
-                # Yeni kayıt oluştur
-                if USE_SUPABASE:
-                    completed_value = is_completed
-                else:
-                    completed_value = 1 if is_completed else 0
-                
-                query = adapt_query('''
-                    INSERT INTO schedule_completions 
-                    (schedule_item_id, completion_date, is_completed, notes)
-                    VALUES (?, ?, ?, ?)
-                ''')
-                c.execute(query, (item_id, completion_date, completed_value, notes))
-            
+            bump_data_version(c, student_id)
             conn.commit()
+            invalidate_student_cache(student_id)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -1818,6 +1750,64 @@ def complete_schedule_item(item_id):
         print(traceback.format_exc())
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/schedule/completions', methods=['POST'])
+@login_required
+def complete_schedule_items():
+    """
+    Birden çok öğe/tarih için tamamlama durumunu tek istekte kaydet (haftalık liste)
+    Gövde: {"completions": [{"item_id": 1, "date": "2024-05-01", "is_completed": true, "notes": ""}, ...]}
+    Öğelerden biri bile öğrenciye ait değilse hiçbiri yazılmaz.
+    """
+    data = request.get_json() or {}
+    entries = data.get('completions')
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'success': False, 'error': 'completions listesi gerekli'}), 400
+    if len(entries) > SCHEDULE_COMPLETIONS_MAX_BATCH:
+        return jsonify({'success': False, 'error': f'Tek istekte en fazla {SCHEDULE_COMPLETIONS_MAX_BATCH} kayıt gönderilebilir'}), 400
+    
+    # Aynı öğe ve tarih birden çok kez geldiyse sonuncusu geçerli
+    completions = {}
+    try:
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise ValueError('Geçersiz kayıt')
+            try:
+                item_id = int(entry.get('item_id'))
+            except (TypeError, ValueError):
+                raise ValueError('item_id sayı olmalı') from None
+            completion_date, completed_value, notes = parse_completion(entry)
+            completions[(item_id, completion_date)] = (completed_value, notes)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    student_id = session['user_id']
+    item_ids = sorted({item_id for item_id, _ in completions})
+    
+    try:
+        with get_db() as conn:
+            c = get_cursor(conn)
+            
+            c.execute(completion_owned_items_query(len(item_ids)), (student_id, *item_ids))
+            owned = {row['id'] for row in c.fetchall()}
+            if len(owned) != len(item_ids):
+                return jsonify({'success': False, 'error': 'Bu dersleri işaretleme yetkiniz yok!'}), 403
+            
+            execute_many(c, COMPLETION_UPSERT, [
+                (completion_date, completed_value, notes, item_id, student_id)
+                for (item_id, completion_date), (completed_value, notes) in completions.items()
+            ])
+            
+            bump_data_version(c, student_id)
+            conn.commit()
+            invalidate_student_cache(student_id)
+        
+        return jsonify({'success': True, 'saved': len(completions)})
+    except Exception as e:
+        import traceback
+        print(f"HATA: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/admin/schedule/<int:student_id>/update', methods=['POST'])
 @admin_required
 def admin_update_schedule(student_id):
@@ -1842,8 +1832,7 @@ def admin_update_schedule(student_id):
                 return jsonify({'success': False, 'error': 'Öğrenci bulunamadı'}), 404
             
             # Öğrencinin aktif programını bul
-            query = adapt_query('SELECT id FROM schedules WHERE student_id = ? ORDER BY created_at DESC LIMIT 1')
-            c.execute(query, (student_id,))
+            execute_query(c, SCHEDULE_LATEST, (student_id,))
             schedule = c.fetchone()
             
             schedule_id = None
@@ -1856,50 +1845,24 @@ def admin_update_schedule(student_id):
                     WHERE id = ?
                 ''')
                 c.execute(query, (name, description, schedule_id))
-                
-                # Eski öğeleri sil
-                query = adapt_query('DELETE FROM schedule_items WHERE schedule_id = ?')
-                c.execute(query, (schedule_id,))
             else:
-                # Yeni program oluştur
+                # Yeni program oluştur (öğelerle aynı transaction'da)
                 query = adapt_query('''
                     INSERT INTO schedules (student_id, name, description)
                     VALUES (?, ?, ?)
+                    RETURNING id
                 ''')
                 c.execute(query, (student_id, name, description))
-                
-                # Yeni oluşturulan program ID'sini al
-                if USE_SUPABASE:
-                    from psycopg2.extras import RealDictCursor
-                    c2 = conn.cursor(cursor_factory=RealDictCursor)
-                    c2.execute('SELECT LASTVAL() as lastval')
-                    result = c2.fetchone()
-                    schedule_id = result['lastval']
-                    c2.close()
-                else:
-                    c.execute('SELECT last_insert_rowid()')
-                    schedule_id = c.fetchone()[0]
-            
-            # Yeni öğeleri ekle
-            for item in items:
-                query = adapt_query('''
-                    INSERT INTO schedule_items 
-                    (schedule_id, day_of_week, start_time, end_time, subject, location, instructor)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''')
-                c.execute(query, (
-                    schedule_id,
-                    int(item.get('day_of_week', 0)),
-                    item.get('start_time', ''),
-                    item.get('end_time', ''),
-                    item.get('subject', ''),
-                    item.get('location', ''),
-                    item.get('instructor', '')
-                ))
+                schedule_id = c.fetchone()['id']
+            
+            # Öğeleri fark bazlı güncelle (değişmeyenlerin id'si ve tamamlama geçmişi korunur)
+            changes = sync_schedule_items(c, schedule_id, items)
             
+            bump_data_version(c, student_id)
             conn.commit()
+            invalidate_student_cache(student_id)
         
-        return jsonify({'success': True, 'message': 'Ders programı başarıyla güncellendi!'})
+        return jsonify({'success': True, 'message': 'Ders programı başarıyla güncellendi!', 'changes': changes})
     except Exception as e:
         import traceback
         print(f"HATA: {str(e)}")
@@ -1910,6 +1873,7 @@ def admin_update_schedule(student_id):
 @admin_required
 def admin_view_schedule(student_id):
     """Admin - öğrenci ders programını görüntüle"""
+    weeks = get_completion_weeks()
     with get_db() as conn:
         c = get_cursor(conn)
         
@@ -1923,12 +1887,7 @@ def admin_view_schedule(student_id):
             return redirect(url_for('admin_dashboard'))
         
         # Öğrencinin ders programlarını al
-        query = adapt_query('''
-            SELECT * FROM schedules
-            WHERE student_id = ?
-            ORDER BY created_at DESC
-        ''')
-        c.execute(query, (student_id,))
+        execute_query(c, SCHEDULE_LIST, (student_id,))
         schedules = c.fetchall()
         
         # Aktif program varsa onu al
@@ -1940,37 +1899,13 @@ def admin_view_schedule(student_id):
             active_schedule = schedules[0]  # En son oluşturulan program
             
             # Program öğelerini al
-            query = adapt_query('''
-                SELECT * FROM schedule_items
-                WHERE schedule_id = ?
-                ORDER BY day_of_week, start_time
-            ''')
-            c.execute(query, (active_schedule['id'],))
+            execute_query(c, SCHEDULE_ITEMS, (active_schedule['id'],))
             schedule_items = c.fetchall()
             
-            # Tamamlama durumlarını al
-            from datetime import date
-            today_date = date.today()
-            
-            for item in schedule_items:
-                query = adapt_query('''
-                    SELECT * FROM schedule_completions
-                    WHERE schedule_item_id = ? AND completion_date <= ?
-                    ORDER BY completion_date DESC
-                ''')
-                c.execute(query, (item['id'], today_date))
-                item_completions = c.fetchall()
-                # SQLite için boolean dönüşümü
-                processed_completions = []
-                for comp in item_completions:
-                    comp_dict = dict(comp)
-                    if not USE_SUPABASE:
-                        comp_dict['is_completed'] = bool(comp_dict['is_completed'])
-                    processed_completions.append(comp_dict)
-                completions[item['id']] = processed_completions
-    
-    from datetime import date
-    today = str(date.today())
+            # Tamamlama durumlarını al (tüm öğeler için tek sorgu, son N hafta)
+            completions = load_schedule_completions(c, active_schedule['id'], schedule_items, weeks)
+    
+    today = str(local_today())
     
     return render_template('admin_schedule.html',
                          student=student,
@@ -1978,8 +1913,50 @@ def admin_view_schedule(student_id):
                          active_schedule=active_schedule,
                          schedule_items=schedule_items,
                          completions=completions,
+                         completion_weeks=weeks,
                          today=today)
 
+def internal_authorized():
+    """Admin oturumu veya X-Metrics-Token başlığı (METRICS_TOKEN) kontrolü"""
+    token = os.environ.get('METRICS_TOKEN', '')
+    header = request.headers.get('X-Metrics-Token', '')
+    return bool(session.get('is_admin') or (token and hmac.compare_digest(header, token)))
+
+@app.route('/internal/metrics')
+def internal_metrics():
+    """
+    Connection pool ve öğrenci önbelleği metrikleri (JSON)
+    Admin oturumu veya X-Metrics-Token başlığı (METRICS_TOKEN) ile erişilir
+    """
+    if not internal_authorized():
+        return jsonify({'success': False, 'error': 'Yetkisiz erişim'}), 403
+    
+    data = metrics.snapshot(get_db_pool(), get_cache_backend())
+    data['backend'] = 'postgresql' if USE_SUPABASE else 'sqlite'
+    return jsonify(data)
+
+@app.route('/internal/leaderboard/check')
+def internal_leaderboard_check():
+    """
+    Bu worker'ın bellekteki sıralamasını veritabanıyla karşılaştır (JSON)
+    Her istek tek worker'ı kontrol eder; yanıttaki pid hangisi olduğunu gösterir
+    """
+    if not internal_authorized():
+        return jsonify({'success': False, 'error': 'Yetkisiz erişim'}), 403
+    
+    engine = get_leaderboard_engine()
+    with get_db() as conn:
+        mismatches = engine.check_consistency(conn)
+    
+    return jsonify({
+        'success': not mismatches,
+        'pid': os.getpid(),
+        'built_seconds_ago': round(time.monotonic() - engine.built_at, 1),
+        'sizes': engine.sizes(),
+        'top': {metric: engine.top(metric, 3) for metric in LEADERBOARD_METRICS},
+        'mismatches': mismatches,
+    })
+
 if __name__ == '__main__':
     try:
         # Veritabanını başlat
@@ -2000,6 +1977,7 @@ if __name__ == '__main__':
             print("📁 Veritabanı: SQLite (Local)")
         print("=" * 60)
         
+        start_expiry_scheduler()
         app.run(debug=debug, host='0.0.0.0', port=port)
     except Exception as e:
         print(f"❌ Uygulama başlatılırken hata: {e}")